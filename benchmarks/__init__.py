@@ -0,0 +1 @@
+"""Benchmarks for flake8-plus."""
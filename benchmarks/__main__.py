@@ -0,0 +1,258 @@
+"""
+Run the flake8-plus benchmarks.
+
+The benchmarks time each visitor on its own, `Plugin.run` end to end and a complete
+flake8 run on a set of synthetic corpora (see the `corpus` module). For the flake8 run,
+the time spent in the plugin is reported as well, along with the plugin's overhead
+relative to the rest of the run. The timings are compared to a JSON baseline from a
+previous run, and the run fails if any timing has regressed by more than the threshold.
+Timings depend on the machine, so baselines should only be compared on the machine that
+saved them. They also depend on the scale and the number of repeats, so baselines saved
+with other values are refused.
+
+Usage: python -m benchmarks [--save-baseline] [--scale 0.1] ...
+"""
+import argparse
+import ast
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+from unittest import mock
+
+from flake8_plus import Plugin
+from flake8_plus.checker import load_visitors
+from flake8_plus.config import Config
+
+from .corpus import CORPORA
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Run the benchmarks.
+
+    Args:
+        argv (Optional[list[str]]): The command line arguments. Defaults to
+            `sys.argv[1:]`.
+
+    Returns:
+        int: The exit code, which is 1 if a regression was found, 2 if the baseline
+        was saved with another scale or number of repeats, and 0 otherwise.
+    """
+    args = _parse_args(argv)
+    baseline = _load(args.baseline)
+    mismatches = _mismatches(baseline, args)
+    if mismatches and not args.save_baseline:
+        print(
+            f"Baseline {args.baseline} was saved with {', '.join(mismatches)}. Run "
+            "with the same options, or save a new baseline.",
+            file=sys.stderr,
+        )
+        return 2
+    corpora = {name: CORPORA[name](args.scale) for name in args.corpus}
+    timings: dict[str, float] = {}
+    for name, source_code in corpora.items():
+        timings.update(_time_corpus(name, source_code, args.repeat))
+    if not args.no_flake8:
+        timings.update(_time_flake8(corpora, args.flake8_repeat))
+
+    if mismatches:
+        baseline = {}
+    regressions = _report(
+        timings, baseline.get("timings", {}), args.threshold, args.min_delta
+    )
+    if args.output:
+        _save(args.output, timings, args)
+    if args.save_baseline:
+        _save(args.baseline, timings, args)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    return 1 if regressions else 0
+
+
+def _parse_args(argv: Optional[list[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument(
+        "--corpus",
+        action="append",
+        choices=list(CORPORA),
+        help="Corpus to benchmark. May be repeated. (Default: all)",
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="Factor to scale the size of each corpus by. (Default: %(default)s)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Number of times to repeat each timing. (Default: %(default)s)",
+    )
+    parser.add_argument(
+        "--flake8-repeat",
+        type=int,
+        default=1,
+        help="Number of times to repeat each flake8 run. (Default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-flake8", action="store_true", help="Skip timing complete flake8 runs."
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=DEFAULT_BASELINE,
+        help="JSON file with baseline timings. (Default: %(default)s)",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Save the timings as the new baseline instead of comparing.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Relative slowdown compared to the baseline that fails the run. "
+        "(Default: %(default)s)",
+    )
+    parser.add_argument(
+        "--min-delta",
+        type=float,
+        default=0.002,
+        help="Slowdowns of fewer seconds than this are considered noise and never "
+        "fail the run. (Default: %(default)s)",
+    )
+    parser.add_argument("--output", type=Path, help="Also write the timings here.")
+    args = parser.parse_args(argv)
+    args.corpus = args.corpus or list(CORPORA)
+    return args
+
+
+def _best_of(repeat: int, func: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _time_corpus(name: str, source_code: str, repeat: int) -> dict[str, float]:
+    tree = ast.parse(source_code)
+    lines = source_code.splitlines(keepends=True)
+    config = Config()
+    timings = {}
+    for visitor_cls in load_visitors():
+        timings[f"{name}/{visitor_cls.__name__}"] = _best_of(
+            repeat, lambda cls=visitor_cls: cls(lines, config).visit(tree)
+        )
+    with mock.patch.object(Plugin, "config", config, create=True):
+        timings[f"{name}/Plugin.run"] = _best_of(
+            repeat, lambda: list(Plugin(tree, lines).run())
+        )
+    return timings
+
+
+def _time_flake8(corpora: dict[str, str], repeat: int) -> dict[str, float]:
+    # pylint: disable=import-outside-toplevel
+    from flake8.main.application import Application
+
+    # The time spent in the plugin is measured directly, since the difference between
+    # two complete flake8 runs is dominated by noise.
+    original_run = Plugin.run
+    plugin_seconds = [0.0]
+
+    def timed_run(self: Plugin) -> Iterator[tuple[int, int, str, type]]:
+        start = time.perf_counter()
+        results = list(original_run(self))
+        plugin_seconds[0] += time.perf_counter() - start
+        return iter(results)
+
+    with tempfile.TemporaryDirectory() as folder:
+        paths = []
+        for name, source_code in corpora.items():
+            path = Path(folder) / f"{name}.py"
+            path.write_text(source_code, encoding="utf-8")
+            paths.append(str(path))
+        argv = ["--isolated", "--jobs=1", "--exit-zero", f"--output-file={os.devnull}"]
+        best_total = best_plugin = float("inf")
+        with mock.patch.object(Plugin, "run", timed_run):
+            for _ in range(repeat):
+                plugin_seconds[0] = 0.0
+                start = time.perf_counter()
+                Application().run(argv + paths)
+                best_total = min(best_total, time.perf_counter() - start)
+                best_plugin = min(best_plugin, plugin_seconds[0])
+    return {
+        "flake8/total": best_total,
+        "flake8/plugin": best_plugin,
+    }
+
+
+def _report(
+    timings: dict[str, float],
+    baseline: dict[str, float],
+    threshold: float,
+    min_delta: float,
+) -> list[str]:
+    regressions = []
+    width = max(len(key) for key in timings)
+    print(f"{'benchmark':<{width}}  {'seconds':>9}  {'baseline':>9}  {'change':>7}")
+    for key, seconds in timings.items():
+        line = f"{key:<{width}}  {seconds:9.4f}"
+        if baseline.get(key):
+            change = seconds / baseline[key] - 1
+            line += f"  {baseline[key]:9.4f}  {change:+7.1%}"
+            if change > threshold and seconds - baseline[key] > min_delta:
+                regressions.append(key)
+                line += "  REGRESSION"
+        print(line)
+    if "flake8/total" in timings:
+        plugin = timings["flake8/plugin"]
+        overhead = plugin / (timings["flake8/total"] - plugin)
+        print(
+            f"\nPlugin overhead relative to flake8 without the plugin: {overhead:.1%}"
+        )
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {threshold:.0%}:")
+        for key in regressions:
+            print(f"  {key}")
+    return regressions
+
+
+def _load(path: Path) -> dict[str, Any]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _mismatches(baseline: dict[str, Any], args: argparse.Namespace) -> list[str]:
+    # Timings only compare at the same corpus sizes and with the same best-of count.
+    if not baseline:
+        return []
+    return [
+        f"--{name} {baseline.get(name)} instead of {getattr(args, name)}"
+        for name in ["scale", "repeat"]
+        if baseline.get(name) != getattr(args, name)
+    ]
+
+
+def _save(path: Path, timings: dict[str, float], args: argparse.Namespace):
+    data = {
+        "python": sys.version.split()[0],
+        "scale": args.scale,
+        "repeat": args.repeat,
+        "timings": timings,
+    }
+    path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""Generators of synthetic source code stressing the rules of flake8-plus."""
+from typing import Callable
+
+MAX_NESTED_BLOCKS = 19
+
+
+def many_returns(scale: float = 1.0) -> str:
+    """
+    Generate a module with thousands of small functions, each with a few returns.
+
+    Args:
+        scale (float): Factor to scale the size of the module by.
+
+    Returns:
+        str: The source code.
+    """
+    parts = ['"""Many returns."""\nimport os\n\n']
+    for i in range(int(5_000 * scale)):
+        parts.append(
+            f"\ndef func_{i}(x):\n"
+            f"    if x > {i}:\n"
+            f"        return x\n"
+            f"    y = x + {i}\n"
+            f"    return y\n\n"
+        )
+    return "".join(parts)
+
+
+def deep_try_except(scale: float = 1.0) -> str:
+    """
+    Generate a module with many functions of deeply nested `try`/`except` blocks.
+
+    Args:
+        scale (float): Factor to scale the size of the module by.
+
+    Returns:
+        str: The source code.
+    """
+    parts = ['"""Deep try/except."""\nimport os\n\n']
+    depth = MAX_NESTED_BLOCKS - 1
+    for i in range(int(200 * scale)):
+        parts.append(f"\ndef func_{i}():\n")
+        for level in range(depth):
+            parts.append("    " * (level + 1) + "try:\n")
+        parts.append("    " * (depth + 1) + f"x = {i}\n")
+        for level in reversed(range(depth)):
+            indent = "    " * (level + 1)
+            parts.append(f"{indent}except ValueError:\n{indent}    return {level}\n")
+        parts.append("\n")
+    return "".join(parts)
+
+
+def literal_table(scale: float = 1.0) -> str:
+    """
+    Generate a module holding a giant table of literals.
+
+    Args:
+        scale (float): Factor to scale the size of the module by.
+
+    Returns:
+        str: The source code.
+    """
+    parts = ['"""Literal table."""\nimport os\n\nTABLE = [\n']
+    for i in range(int(50_000 * scale)):
+        parts.append(f"    ({i}, 'name_{i}', {i / 7:.3f}, {{'key': [{i}, None]}}),\n")
+    parts.append("]\n")
+    return "".join(parts)
+
+
+def large_file(scale: float = 1.0) -> str:
+    """
+    Generate a module of roughly 100,000 lines of mixed classes and functions.
+
+    Args:
+        scale (float): Factor to scale the size of the module by.
+
+    Returns:
+        str: The source code.
+    """
+    parts = ['"""Large file."""\nimport os\n\n']
+    for i in range(int(100_000 * scale) // 20):
+        parts.append(
+            f"\nclass Class{i}:\n"
+            f'    """Class {i}."""\n'
+            f"\n"
+            f"    def method(self, values):\n"
+            f"        total = 0\n"
+            f"        for value in values:\n"
+            f"            try:\n"
+            f"                total += int(value)\n"
+            f"            except ValueError:\n"
+            f"                continue\n"
+            f"        return total\n"
+            f"\n"
+            f"    def other(self):\n"
+            f"        data = {{'a': [1, 2, 3], 'b': ({i}, {i + 1})}}\n"
+            f"        return [k for k in data if k]\n"
+            f"\n"
+            f"\n"
+            f"def function_{i}(x):\n"
+            f"    return Class{i}().method([x])\n"
+            f"\n"
+        )
+    return "".join(parts)
+
+
+def blank_runs(scale: float = 1.0) -> str:
+    """
+    Generate a module with long runs of blank lines before returns and excepts.
+
+    Args:
+        scale (float): Factor to scale the size of the module by.
+
+    Returns:
+        str: The source code.
+    """
+    blanks = "\n" * 50
+    parts = ['"""Blank runs."""\n' + blanks + "import os\n\n"]
+    for i in range(int(1_000 * scale)):
+        parts.append(
+            f"\ndef func_{i}():\n"
+            f"    try:\n"
+            f"        x = {i}\n"
+            f"{blanks}"
+            f"    except ValueError:\n"
+            f"        x = 0\n"
+            f"{blanks}"
+            f"    return x\n\n"
+        )
+    return "".join(parts)
+
+
+def many_handlers(scale: float = 1.0) -> str:
+    """
+    Generate a module of functions with long chains of `except` clauses.
+
+    Args:
+        scale (float): Factor to scale the size of the module by.
+
+    Returns:
+        str: The source code.
+    """
+    parts = ['"""Many handlers."""\nimport os\n\n']
+    for i in range(int(50 * scale)):
+        parts.append(f"\ndef func_{i}(x):\n    try:\n        x = int(x)\n")
+        for j in range(100):
+            blank = "\n" * (j % 2)
+            parts.append(f"{blank}    except Error{j}:\n        return {j}\n")
+        parts.append("    return x\n\n")
+    return "".join(parts)
+
+
+CORPORA: dict[str, Callable[[float], str]] = {
+    "many_returns": many_returns,
+    "deep_try_except": deep_try_except,
+    "literal_table": literal_table,
+    "large_file": large_file,
+    "blank_runs": blank_runs,
+    "many_handlers": many_handlers,
+}
@@ -1,4 +1,25 @@
 """The flake8-plus package."""
-from .plugin import Plugin
+from typing import TYPE_CHECKING, Any
 
-__all__ = ["Plugin"]
+if TYPE_CHECKING:  # pragma: no cover
+    from .checker import Checker
+    from .plugin import Plugin
+
+__all__ = ["Checker", "Plugin"]
+
+
+def __getattr__(name: str) -> Any:
+    # The plugin is imported on first use, so importing a submodule, for instance
+    # to run the standalone runner, does not load the plugin.
+    # pylint: disable=import-outside-toplevel
+    if name == "Plugin":
+        from .plugin import Plugin
+
+        attribute: Any = Plugin
+    elif name == "Checker":
+        from .checker import Checker
+
+        attribute = Checker
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return attribute
@@ -0,0 +1,7 @@
+"""Entry point for running the standalone tools with `python -m flake8_plus`."""
+import sys
+
+from .cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+"""ResultCache class."""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Iterable, Optional, Sequence, Union
+
+from .config import Config
+from .version import VERSION
+
+Result = tuple[int, int, str]
+
+DATABASE_NAME = "results.sqlite3"
+EVICTION_INTERVAL = 100
+# The maximum number of keys looked up in a single query.
+BATCH_SIZE = 500
+
+
+class ResultCache:
+    """
+    Content-addressed on-disk cache of the problems found in a file.
+
+    Results are keyed by a hash of the physical lines, the configuration and the
+    plugin version, so a file that is byte-identical to a previously checked file
+    is never checked again. The cache is stored in an SQLite database which may be
+    shared by any number of processes, such as the workers of `flake8 --jobs`. Once
+    the number of entries exceeds the limit, the least recently used entries are
+    evicted. Eviction only runs every `EVICTION_INTERVAL` writes per process, so the
+    limit may be exceeded briefly.
+    """
+
+    def __init__(self, directory: Union[str, Path], max_entries: int):
+        """
+        Initialize a `ResultCache` instance.
+
+        Args:
+            directory (Union[str, Path]): The folder to store the cache in.
+            max_entries (int): The maximum number of results to keep.
+        """
+        self.path = Path(directory) / DATABASE_NAME
+        self.max_entries = max_entries
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._writes = 0
+
+    @staticmethod
+    def key(
+        lines: Iterable[str],
+        config: Config,
+        codes: Optional[Iterable[str]] = None,
+        context: Optional[str] = None,
+    ) -> str:
+        """
+        Compute the cache key for the specified lines and configuration.
+
+        Args:
+            lines (Iterable[str]): The physical lines.
+            config (Config): The plugin configuration.
+            codes (Optional[Iterable[str]]): The codes of the rules checked, if not
+                all of them.
+            context (Optional[str]): Anything else the results depend on, for lines
+                that are not a complete file (see `definitions.check_definitions`).
+
+        Returns:
+            str: The cache key.
+        """
+        return ResultCache.keys([(lines, context)], config, codes)[0]
+
+    @staticmethod
+    def keys(
+        items: Iterable[tuple[Iterable[str], Optional[str]]],
+        config: Config,
+        codes: Optional[Iterable[str]] = None,
+    ) -> list[str]:
+        """
+        Compute the cache keys for several parts of a file at once, like `key` does.
+
+        Args:
+            items (Iterable[tuple[Iterable[str], Optional[str]]]): The physical lines
+                and context of each part.
+            config (Config): The plugin configuration.
+            codes (Optional[Iterable[str]]): The codes of the rules checked, if not
+                all of them.
+
+        Returns:
+            list[str]: The cache keys.
+        """
+        prefix = hashlib.sha256()
+        prefix.update(VERSION.encode())
+        prefix.update(repr(sorted(vars(config).items())).encode())
+        if codes is not None:
+            prefix.update(repr(sorted(codes)).encode())
+        keys = []
+        for lines, context in items:
+            digest = prefix.copy()
+            if context is not None:
+                digest.update(b"\1")
+                digest.update(context.encode())
+            # Hashed in one go, as updating the digest per line dominates for short
+            # lines.
+            text = "".join(["\0" + line for line in lines])
+            digest.update(text.encode("utf-8", "surrogatepass"))
+            keys.append(digest.hexdigest())
+        return keys
+
+    def get(self, key: str) -> Optional[list[Result]]:
+        """
+        Get the results stored for the specified key.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Optional[list[Result]]: The results, or `None` if there are none.
+        """
+        connection = self._connect()
+        row = connection.execute(
+            "SELECT results FROM results WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        connection.execute(
+            "UPDATE results SET accessed = ? WHERE key = ?", (time.time_ns(), key)
+        )
+        return [tuple(result) for result in json.loads(row[0])]  # type: ignore
+
+    def get_many(self, keys: Sequence[str]) -> dict[str, list[Result]]:
+        """
+        Get the results stored for several keys at once.
+
+        Args:
+            keys (Sequence[str]): The cache keys.
+
+        Returns:
+            dict[str, list[Result]]: The results, by key, for the keys with results.
+        """
+        connection = self._connect()
+        found: dict[str, list[Result]] = {}
+        for start in range(0, len(keys), BATCH_SIZE):
+            batch = keys[start : start + BATCH_SIZE]
+            marks = ", ".join("?" * len(batch))
+            query = f"SELECT key, results FROM results WHERE key IN ({marks})"  # nosec
+            rows = connection.execute(query, batch)
+            for key, results in rows:
+                # Most parts have no problems, so decoding them is skipped.
+                found[key] = (
+                    [] if results == "[]" else [tuple(r) for r in json.loads(results)]
+                )  # type: ignore
+        if not found:
+            return found
+        with connection:
+            connection.execute("BEGIN")
+            connection.executemany(
+                "UPDATE results SET accessed = ? WHERE key = ?",
+                [(time.time_ns(), key) for key in found],
+            )
+        return found
+
+    def put_many(self, items: Iterable[tuple[str, Iterable[Result]]]) -> None:
+        """
+        Store results for several keys at once, in a single transaction.
+
+        Args:
+            items (Iterable[tuple[str, Iterable[Result]]]): The keys and their results.
+        """
+        connection = self._connect()
+        accessed = time.time_ns()
+        rows = [(key, json.dumps(list(results)), accessed) for key, results in items]
+        with connection:
+            connection.execute("BEGIN")
+            connection.executemany(
+                "INSERT OR REPLACE INTO results (key, results, accessed) "
+                "VALUES (?, ?, ?)",
+                rows,
+            )
+        before = self._writes
+        self._writes += len(rows)
+        if self._writes // EVICTION_INTERVAL != before // EVICTION_INTERVAL:
+            self.evict()
+
+    def put(self, key: str, results: Iterable[Result]) -> None:
+        """
+        Store results for the specified key.
+
+        Args:
+            key (str): The cache key.
+            results (Iterable[Result]): The results.
+        """
+        connection = self._connect()
+        connection.execute(
+            "INSERT OR REPLACE INTO results (key, results, accessed) VALUES (?, ?, ?)",
+            (key, json.dumps(list(results)), time.time_ns()),
+        )
+        self._writes += 1
+        if self._writes % EVICTION_INTERVAL == 0:
+            self.evict()
+
+    def evict(self) -> None:
+        """Evict the least recently used results exceeding the maximum."""
+        self._connect().execute(
+            "DELETE FROM results WHERE key IN ("
+            "SELECT key FROM results ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def __len__(self) -> int:
+        """Return the number of results stored."""
+        return self._connect().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections must not be shared with forked processes, so each process opens
+        # its own.
+        if self._connection is not None and self._pid == os.getpid():
+            return self._connection
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS results "
+            "(key TEXT PRIMARY KEY, results TEXT NOT NULL, accessed INTEGER NOT NULL)"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)"
+        )
+        self._connection = connection
+        self._pid = os.getpid()
+        return connection
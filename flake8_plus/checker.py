@@ -0,0 +1,336 @@
+"""Checking of source code, shared by the plugin and the standalone runner."""
+import ast
+import functools
+import importlib
+import io
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Sequence, Union
+
+from .config import Config
+from .line_index import Buffer, LineIndex
+from .prescan import prescan
+from .problem import Problem
+from .rules import compile_rules, parse_rules
+from .visitors.base_visitor import BaseVisitor
+from .visitors.fused_visitor import FusedVisitor
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .diff import LineRanges
+    from .statistics import FileStatistics
+
+# The visitor of each rule, by code. Visitor modules are only imported once a rule is
+# used, see `load_visitors`.
+RULES: dict[str, str] = {
+    "PLU001": "flake8_plus.visitors.plu001_visitor:PLU001Visitor",
+    "PLU002": "flake8_plus.visitors.plu002_visitor:PLU002Visitor",
+    "PLU003": "flake8_plus.visitors.plu003_visitor:PLU003Visitor",
+}
+
+
+def load_visitors(
+    codes: Optional[Iterable[str]] = None, rules: str = ""
+) -> list[type[BaseVisitor]]:
+    """
+    Import the visitors of the specified rules.
+
+    The configured rules are all checked by a single visitor, following the visitors
+    of the rules in `RULES`.
+
+    Args:
+        codes (Optional[Iterable[str]]): The codes of the rules. Defaults to all the
+            rules in `RULES` and all the configured rules.
+        rules (str): The configured rules, as given to the `blank-line-rules` option.
+
+    Returns:
+        list[type[BaseVisitor]]: The visitors, in code order.
+    """
+    configured = parse_rules(rules)
+    if codes is not None:
+        selected = set(codes)
+        builtin = sorted(selected.intersection(RULES))
+        configured = tuple(r for r in configured if r.problem.code in selected)
+    else:
+        builtin = sorted(RULES)
+    visitors = [_load_visitor(code) for code in builtin]
+    if configured:
+        visitors.append(compile_rules(configured))
+    return visitors
+
+
+def rule_codes(config: Config) -> frozenset[str]:
+    """
+    Return the codes of all the rules, including the configured rules.
+
+    Args:
+        config (Config): The plugin configuration.
+
+    Returns:
+        frozenset[str]: The codes.
+    """
+    configured = parse_rules(config.blank_line_rules)
+    return frozenset(RULES).union(rule.problem.code for rule in configured)
+
+
+@functools.cache
+def _load_visitor(code: str) -> type[BaseVisitor]:
+    module_name, class_name = RULES[code].split(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def check(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    lines: list[str],
+    config: Config,
+    tree: Optional[ast.AST] = None,
+    visitors: Optional[Sequence[type[BaseVisitor]]] = None,
+    statistics: Optional["FileStatistics"] = None,
+    changed: Optional["LineRanges"] = None,
+) -> list[Problem]:
+    """
+    Check source code using all the specified visitors in a single walk.
+
+    Args:
+        lines (list[str]): The physical lines.
+        config (Config): The plugin configuration.
+        tree (Optional[ast.AST]): The abstract syntax tree. Defaults to parsing the
+            lines.
+        visitors (Optional[Sequence[type[BaseVisitor]]]): The visitors to check with.
+            Defaults to the visitors of all the rules, including the configured rules.
+        statistics (Optional[FileStatistics]): Statistics to record the work of the
+            visitors in.
+        changed (Optional[LineRanges]): If specified, only toplevel statements
+            overlapping these lines are walked, and only problems on these lines, or
+            with blank lines before them on these lines, are reported.
+
+    Returns:
+        list[Problem]: The problems found, in line order.
+    """
+    return list(iter_check(lines, config, tree, visitors, statistics, changed))
+
+
+def iter_check(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    lines: list[str],
+    config: Config,
+    tree: Optional[ast.AST] = None,
+    visitors: Optional[Sequence[type[BaseVisitor]]] = None,
+    statistics: Optional["FileStatistics"] = None,
+    changed: Optional["LineRanges"] = None,
+) -> Iterator[Problem]:
+    """
+    Check source code like `check`, yielding problems as soon as they are found.
+
+    Problems are yielded in line order, toplevel statement by toplevel statement (see
+    `FusedVisitor.iter_problems`), so a consumer can stop early, for example once a
+    limit is reached, and the rest of the tree is not walked.
+
+    Args:
+        lines (list[str]): The physical lines.
+        config (Config): The plugin configuration.
+        tree (Optional[ast.AST]): The abstract syntax tree. Defaults to parsing the
+            lines.
+        visitors (Optional[Sequence[type[BaseVisitor]]]): The visitors to check with.
+            Defaults to the visitors of all the rules, including the configured rules.
+        statistics (Optional[FileStatistics]): Statistics to record the work of the
+            visitors in. They are recorded once the consumer stops.
+        changed (Optional[LineRanges]): If specified, only check and report problems
+            on these lines (see `check`).
+
+    Yields:
+        Iterator[Problem]: The problems found, in line order.
+    """
+    if tree is None:
+        tree = ast.parse("".join(lines))
+    return _check(tree, lines, config, visitors, statistics, changed)
+
+
+def check_buffer(
+    buffer: Buffer,
+    config: Config,
+    visitors: Optional[Sequence[type[BaseVisitor]]] = None,
+    statistics: Optional["FileStatistics"] = None,
+    changed: Optional["LineRanges"] = None,
+) -> list[Problem]:
+    """
+    Check source code in a buffer, such as a memory-mapped file.
+
+    No `str` lines are materialized: the line index is built from the bytes in the
+    buffer, and the buffer is parsed directly. Memory use is thus dominated by the
+    abstract syntax tree.
+
+    Args:
+        buffer (Buffer): The encoded source code.
+        config (Config): The plugin configuration.
+        visitors (Optional[Sequence[type[BaseVisitor]]]): The visitors to check with.
+            Defaults to the visitors of all the rules.
+        statistics (Optional[FileStatistics]): Statistics to record the work of the
+            visitors in.
+        changed (Optional[LineRanges]): If specified, only check and report problems
+            on these lines (see `check`).
+
+    Returns:
+        list[Problem]: The problems found, in line order.
+    """
+    return list(iter_check_buffer(buffer, config, visitors, statistics, changed))
+
+
+def iter_check_buffer(
+    buffer: Buffer,
+    config: Config,
+    visitors: Optional[Sequence[type[BaseVisitor]]] = None,
+    statistics: Optional["FileStatistics"] = None,
+    changed: Optional["LineRanges"] = None,
+) -> Iterator[Problem]:
+    """
+    Check source code in a buffer like `check_buffer`, yielding problems as found.
+
+    Args:
+        buffer (Buffer): The encoded source code.
+        config (Config): The plugin configuration.
+        visitors (Optional[Sequence[type[BaseVisitor]]]): The visitors to check with.
+            Defaults to the visitors of all the rules.
+        statistics (Optional[FileStatistics]): Statistics to record the work of the
+            visitors in.
+        changed (Optional[LineRanges]): If specified, only check and report problems
+            on these lines (see `check`).
+
+    Yields:
+        Iterator[Problem]: The problems found, in line order (see `iter_check`).
+    """
+    tree = ast.parse(buffer)
+    return _check(tree, buffer, config, visitors, statistics, changed)
+
+
+class Checker:
+    """
+    Checker holding its own configuration, reusable across files and threads.
+
+    Unlike the plugin, whose configuration is shared by the whole process, each
+    checker has its own configuration and visitors, so checkers with different
+    settings can be used side by side. A checker is never modified once created, and
+    every check uses fresh visitor instances, so a single checker can also check
+    sources in several threads at once.
+    """
+
+    def __init__(
+        self, config: Optional[Config] = None, codes: Optional[Iterable[str]] = None
+    ):
+        """
+        Initialize a `Checker` instance.
+
+        Args:
+            config (Optional[Config]): The plugin configuration. Defaults to the
+                default configuration.
+            codes (Optional[Iterable[str]]): The codes of the rules to check. Defaults
+                to all the rules, including the configured rules.
+        """
+        self.config = config if config is not None else Config()
+        self.visitors = tuple(load_visitors(codes, self.config.blank_line_rules))
+
+    def check_source(self, source: Union[str, bytes]) -> list[Problem]:
+        """
+        Check source code.
+
+        Args:
+            source (Union[str, bytes]): The source code. Bytes are decoded like
+                Python does, using the encoding declared in the source code.
+
+        Raises:
+            SyntaxError: If the source code cannot be parsed.
+
+        Returns:
+            list[Problem]: The problems found, in line order.
+        """
+        if isinstance(source, str):
+            lines = io.StringIO(source, newline="").readlines()
+            return check(lines, self.config, ast.parse(source), self.visitors)
+        return check_buffer(source, self.config, self.visitors)
+
+    def check_sources(
+        self, sources: Iterable[Union[str, bytes]], threads: int = 1
+    ) -> Iterator[list[Problem]]:
+        """
+        Check several sources, in a pool of threads if more than one is requested.
+
+        Args:
+            sources (Iterable[Union[str, bytes]]): The source code to check.
+            threads (int): The number of threads to check sources in.
+
+        Raises:
+            SyntaxError: If a source cannot be parsed. The problems found in the
+                sources before it are yielded first.
+
+        Yields:
+            Iterator[list[Problem]]: The problems found in each source, in the order
+            given.
+        """
+        if threads <= 1:
+            yield from map(self.check_source, sources)
+            return
+        # Only imported when needed, to keep importing the plugin cheap.
+        # pylint: disable=import-outside-toplevel
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(threads) as executor:
+            yield from executor.map(self.check_source, sources)
+
+
+def _check(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    tree: ast.AST,
+    source: Union[list[str], Buffer],
+    config: Config,
+    visitors: Optional[Sequence[type[BaseVisitor]]],
+    statistics: Optional["FileStatistics"],
+    changed: Optional["LineRanges"],
+) -> Iterator[Problem]:
+    # Set up eagerly, so the lines and tree are checked before the first problem is
+    # requested, and only the walk itself is lazy.
+    if isinstance(source, list):
+        lines = source
+        line_index = LineIndex(lines)
+    else:
+        lines = []
+        line_index = LineIndex.from_buffer(source)
+    if visitors is None:
+        visitors = load_visitors(rules=config.blank_line_rules)
+    visitors, skipped = prescan(source, visitors)
+    instances = [cls(lines, config, line_index) for cls in visitors]
+    if statistics is not None:
+        for visitor in instances:
+            statistics.instrument(visitor)
+        for cls in skipped:
+            statistics.skip(cls)
+        statistics.walk_skipped = not instances and bool(skipped)
+    fused = FusedVisitor(instances)
+    include = None
+    if changed is not None:
+        include = functools.partial(_is_changed, changed=changed, line_index=line_index)
+    # When the prescan skipped all the visitors, the tree is not walked at all.
+    problems = fused.iter_problems(tree, include) if instances else iter(())
+    if changed is not None:
+        problems = (
+            p
+            for p in problems
+            if changed.overlaps(
+                p.line_number - line_index.blanks_before(p.line_number), p.line_number
+            )
+        )
+    return _finish(problems, fused, instances, statistics)
+
+
+def _finish(
+    problems: Iterator[Problem],
+    fused: FusedVisitor,
+    instances: list[BaseVisitor],
+    statistics: Optional["FileStatistics"],
+) -> Iterator[Problem]:
+    try:
+        yield from problems
+    finally:
+        if statistics is not None:
+            statistics.finish(instances, fused.nodes_visited)
+
+
+def _is_changed(node: ast.stmt, changed: "LineRanges", line_index: LineIndex) -> bool:
+    # The span of a statement starts at its first decorator, if any, and includes the
+    # blank lines immediately before it.
+    first = min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+    last = node.end_lineno or node.lineno
+    return changed.overlaps(first - line_index.blanks_before(first), last)
@@ -0,0 +1,477 @@
+"""Command line interface of the standalone flake8-plus tools."""
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import Any, Iterable, Optional, TextIO
+
+from . import daemon, fixer, lsp, runner, shard
+from .checker import rule_codes
+from .config import Config
+from .config_files import config_from_options, find_config_file, read_config_file
+from .diff import LineRanges, git_diff, parse_unified_diff
+from .exceptions import ConfigError, DaemonError, DiffError, RuleError, ShardError
+from .rules import parse_rules
+from .selection import CONFIG_OPTIONS, RuleSelection
+from .version import VERSION
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Run the standalone flake8-plus command line interface.
+
+    Args:
+        argv (Optional[list[str]]): The command line arguments. Defaults to
+            `sys.argv[1:]`.
+
+    Returns:
+        int: The exit code.
+    """
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    if not hasattr(args, "command"):
+        parser.print_help()
+        return 2
+    try:
+        return args.command(args)
+    except (ConfigError, DaemonError, DiffError, RuleError, ShardError) as error:
+        print(f"flake8-plus: {error}", file=sys.stderr)
+        return 2
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="flake8-plus",
+        description="Check files for the flake8-plus rules only, without flake8.",
+    )
+    parser.add_argument("--version", action="version", version=VERSION)
+    subparsers = parser.add_subparsers(title="commands")
+
+    check_parser = subparsers.add_parser(
+        "check", help="Check files and report problems."
+    )
+    check_parser.set_defaults(command=_check)
+    check_parser.add_argument(
+        "paths",
+        nargs="*",
+        default=["."],
+        help="Files and folders to check. (Default: the current folder)",
+    )
+    _add_config_arguments(check_parser)
+    _add_file_arguments(check_parser)
+    _add_jobs_argument(check_parser)
+    _add_output_arguments(check_parser)
+    check_parser.add_argument(
+        "--mmap-threshold",
+        type=int,
+        metavar="bytes",
+        default=runner.MMAP_THRESHOLD,
+        help="Memory-map files of at least this size instead of reading them into "
+        "lines, to bound the memory used for huge generated files. Use 0 to never "
+        "memory-map files. (Default: %(default)s)",
+    )
+    diff_group = check_parser.add_mutually_exclusive_group()
+    diff_group.add_argument(
+        "--diff",
+        metavar="path",
+        help="Only check and report problems on the lines changed by this unified "
+        "diff. Use - to read the diff from stdin.",
+    )
+    diff_group.add_argument(
+        "--diff-rev",
+        metavar="range",
+        help="Only check and report problems on the lines changed in this git "
+        "revision range, for example main...HEAD.",
+    )
+    check_parser.add_argument(
+        "--shard",
+        type=_shard,
+        metavar="i/n",
+        help="Only check the i-th of n shards of the files, balanced by size or by "
+        "--shard-timings. Results are written as a shard report for `merge`, unless "
+        "--format is given.",
+    )
+    check_parser.add_argument(
+        "--shard-timings",
+        action="append",
+        default=[],
+        metavar="report",
+        help="Balance shards by the time it took to check files in the reports of a "
+        "previous run. May be given several times.",
+    )
+
+    merge_parser = subparsers.add_parser(
+        "merge", help="Merge the reports of all shards into one sorted report."
+    )
+    merge_parser.set_defaults(command=_merge)
+    merge_parser.add_argument("reports", nargs="+", help="The shard reports.")
+    _add_output_arguments(merge_parser)
+
+    fix_parser = subparsers.add_parser(
+        "fix", help="Fix problems by inserting and removing blank lines."
+    )
+    fix_parser.set_defaults(command=_fix)
+    fix_parser.add_argument(
+        "paths",
+        nargs="*",
+        default=["."],
+        help="Files and folders to fix. (Default: the current folder)",
+    )
+    _add_config_arguments(fix_parser)
+    _add_file_arguments(fix_parser)
+    _add_jobs_argument(fix_parser)
+    fix_parser.add_argument(
+        "-q", "--quiet", action="store_true", help="Only report files that failed."
+    )
+
+    lsp_parser = subparsers.add_parser(
+        "lsp", help="Run a language server over stdio, for editor integrations."
+    )
+    lsp_parser.set_defaults(command=_lsp)
+    _add_config_arguments(lsp_parser)
+
+    _add_daemon_parser(subparsers)
+    return parser
+
+
+def _add_daemon_parser(subparsers: Any):
+    daemon_parser = subparsers.add_parser(
+        "daemon",
+        help="Check files using a long-lived daemon keeping results in memory.",
+    )
+    daemon_subparsers = daemon_parser.add_subparsers(title="daemon commands")
+    parsers = {}
+    for name, command, help_ in [
+        ("start", _daemon_start, "Start the daemon in the background."),
+        ("stop", _daemon_stop, "Stop the daemon."),
+        ("status", _daemon_status, "Show whether the daemon is running."),
+        ("serve", _daemon_serve, "Run the daemon in the foreground."),
+        ("check", _daemon_check, "Check files, starting the daemon if needed."),
+    ]:
+        parsers[name] = daemon_subparsers.add_parser(name, help=help_)
+        parsers[name].set_defaults(command=command)
+        parsers[name].add_argument(
+            "--socket",
+            help="Path of the socket of the daemon. (Default: one per user and "
+            "current folder, in a folder private to the user)",
+        )
+    for name in ["start", "serve", "check"]:
+        _add_jobs_argument(parsers[name])
+    parsers["check"].add_argument(
+        "paths",
+        nargs="*",
+        default=["."],
+        help="Files and folders to check. (Default: the current folder)",
+    )
+    _add_config_arguments(parsers["check"])
+    _add_file_arguments(parsers["check"])
+    _add_output_arguments(parsers["check"])
+
+
+def _add_config_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--config",
+        type=Path,
+        help="Configuration file to read. (Default: the setup.cfg, tox.ini, .flake8 "
+        "or pyproject.toml file flake8 would use)",
+    )
+    parser.add_argument(
+        "--isolated", action="store_true", help="Ignore all configuration files."
+    )
+    for name in ["imports", "return", "except"]:
+        parser.add_argument(
+            f"--blanks-before-{name}",
+            type=int,
+            metavar="n",
+            help=f"Expected number of blank lines before {name}.",
+        )
+    parser.add_argument(
+        "--blank-line-rules",
+        metavar="rules",
+        help="Additional rules checking the number of blank lines before nodes, "
+        "replacing the configured rules. (Default: the configured rules)",
+    )
+
+
+def _add_file_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--exclude",
+        help="Comma separated patterns of files and folders to exclude, replacing "
+        "the default and configured patterns.",
+    )
+    parser.add_argument(
+        "--extend-exclude",
+        help="Comma separated patterns of files and folders to exclude in addition "
+        "to the default and configured patterns.",
+    )
+
+
+def _add_jobs_argument(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of processes to check files in. (Default: %(default)s)",
+    )
+
+
+def _add_output_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--format",
+        choices=list(runner.FORMATTERS),
+        help="Output format. (Default: text)",
+    )
+    parser.add_argument(
+        "--output-file", help="Write the results to this file instead of stdout."
+    )
+    parser.add_argument(
+        "--max-violations",
+        type=_positive_int,
+        metavar="n",
+        help="Stop once this many problems have been reported. (Default: no limit)",
+    )
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def _shard(value: str) -> shard.Shard:
+    try:
+        return shard.parse_shard(value)
+    except ShardError as error:
+        raise argparse.ArgumentTypeError(str(error)) from None
+
+
+def _load_options(args: argparse.Namespace) -> tuple[dict[str, Any], Optional[Path]]:
+    if args.isolated:
+        return {}, None
+    path = args.config or find_config_file(Path.cwd())
+    if path is None:
+        return {}, None
+    return read_config_file(path), path.parent
+
+
+def _load_config(args: argparse.Namespace) -> Config:
+    options, _ = _load_options(args)
+    for name in ["imports", "return", "except"]:
+        value = getattr(args, f"blanks_before_{name}")
+        if value is not None:
+            options[f"blanks_before_{name}"] = value
+    if args.blank_line_rules is not None:
+        options["blank_line_rules"] = args.blank_line_rules
+    config = config_from_options(options)
+    parse_rules(config.blank_line_rules)
+    return config
+
+
+def _load_selection(args: argparse.Namespace, config: Config) -> RuleSelection:
+    options, _ = _load_options(args)
+    return RuleSelection.from_config(options, rule_codes(config))
+
+
+def _find_files(args: argparse.Namespace) -> list[str]:
+    options, base = _load_options(args)
+    if args.exclude is not None:
+        exclude = runner.split_patterns(args.exclude, Path.cwd())
+    elif "exclude" in options:
+        exclude = runner.split_patterns(options["exclude"], base)
+    else:
+        exclude = list(runner.DEFAULT_EXCLUDE)
+    exclude += runner.split_patterns(options.get("extend_exclude"), base)
+    exclude += runner.split_patterns(args.extend_exclude, Path.cwd())
+    return runner.discover_files(args.paths, exclude)
+
+
+def _check(args: argparse.Namespace) -> int:
+    config = _load_config(args)
+    selection = _load_selection(args, config)
+    paths = _find_files(args)
+    changed = _load_changed_lines(args)
+    current = shard.Shard(1, 1)
+    if args.shard is not None:
+        current = args.shard
+        timings = shard.read_timings(args.shard_timings)
+        paths = shard.split_files(paths, current.total, timings)[current.number - 1]
+        args.format = args.format or "report"
+    # One problem more than reported tells whether a file had more problems.
+    max_problems = None if args.max_violations is None else args.max_violations + 1
+    results = runner.run(
+        paths,
+        config,
+        args.jobs,
+        changed,
+        args.mmap_threshold,
+        max_problems,
+        timed=args.format == "report",
+        selection=selection,
+    )
+    return _write_results(results, args, current)
+
+
+def _merge(args: argparse.Namespace) -> int:
+    report = shard.merge_reports([shard.read_report(path) for path in args.reports])
+    problems = sum(len(result.problems) for result in report.results)
+    print(
+        f"Merged {len(args.reports)} report(s): {problems} problem(s) in "
+        f"{len(report.results)} file(s) checked.",
+        file=sys.stderr,
+    )
+    return _write_results(report.results, args)
+
+
+def _write_results(
+    results: Iterable[runner.FileResult],
+    args: argparse.Namespace,
+    current: shard.Shard = shard.Shard(1, 1),
+) -> int:
+    formatter = runner.FORMATTERS[args.format or "text"]
+    files = found = 0
+    truncated = False
+    stream: TextIO
+    with _open_output(args.output_file) as stream:
+        for result in results:
+            problems = result.problems
+            if args.max_violations is not None:
+                problems = problems[: args.max_violations - found]
+            for line in formatter(result._replace(problems=problems)):
+                stream.write(line + "\n")
+            stream.flush()
+            if len(problems) < len(result.problems):
+                truncated = True
+                break
+            files += 1
+            found += len(problems)
+        if args.format == "report" and not truncated:
+            # The summary tells `merge` that all problems of all files are reported.
+            stream.write(shard.format_summary(current, files, found) + "\n")
+    return 1 if found or truncated else 0
+
+
+def _fix(args: argparse.Namespace) -> int:
+    config = _load_config(args)
+    selection = _load_selection(args, config)
+    paths = _find_files(args)
+    files = problems = 0
+    failed = False
+    for result in fixer.run(paths, config, args.jobs, selection):
+        if result.error is not None:
+            failed = True
+            print(f"{result.path}:1:1: {result.error}", file=sys.stderr)
+        elif result.fixed:
+            files += 1
+            problems += result.fixed
+            if not args.quiet:
+                print(f"Fixed {result.fixed} problem(s) in {result.path}")
+    if not args.quiet:
+        print(f"Fixed {problems} problem(s) in {files} file(s).")
+    return 1 if failed else 0
+
+
+def _lsp(args: argparse.Namespace) -> int:
+    config = _load_config(args)
+    server = lsp.LanguageServer(config, _load_selection(args, config))
+    return server.serve(sys.stdin.buffer, sys.stdout.buffer)
+
+
+def _daemon_start(args: argparse.Namespace) -> int:
+    socket_path = args.socket or daemon.default_socket_path()
+    try:
+        pid = daemon.start(socket_path, args.jobs)
+    except DaemonError as error:
+        print(f"flake8-plus: {error}", file=sys.stderr)
+        return 1
+    print(f"Daemon running with pid {pid} at {socket_path}")
+    return 0
+
+
+def _daemon_stop(args: argparse.Namespace) -> int:
+    socket_path = args.socket or daemon.default_socket_path()
+    try:
+        daemon.request(socket_path, {"command": "stop"})
+    except DaemonError:
+        print("Daemon not running")
+        return 0
+    print("Daemon stopped")
+    return 0
+
+
+def _daemon_status(args: argparse.Namespace) -> int:
+    socket_path = args.socket or daemon.default_socket_path()
+    try:
+        status = daemon.request(socket_path, {"command": "status"})
+    except DaemonError:
+        print("Daemon not running")
+        return 1
+    print(f"Daemon running with pid {status['pid']}, {status['files']} file(s) known")
+    return 0
+
+
+def _daemon_serve(args: argparse.Namespace) -> int:
+    daemon.Daemon(args.jobs).serve(args.socket or daemon.default_socket_path())
+    return 0
+
+
+def _daemon_check(args: argparse.Namespace) -> int:
+    config = _load_config(args)
+    options, _ = _load_options(args)
+    paths = _find_files(args)
+    socket_path = args.socket or daemon.default_socket_path()
+    message = {
+        "command": "check",
+        "paths": [os.path.abspath(path) for path in paths],
+        "config": vars(config),
+        # The daemon resolves the rules selected for each file like `check` does.
+        "selection": {
+            name: options[name] for name in CONFIG_OPTIONS if name in options
+        },
+        "cwd": os.getcwd(),
+    }
+    try:
+        daemon.start(socket_path, args.jobs)
+        response = daemon.request(socket_path, message)
+    except DaemonError as error:
+        print(f"flake8-plus: {error}", file=sys.stderr)
+        return 2
+    results = (
+        runner.FileResult(path, [tuple(problem) for problem in problems])
+        for path, (_, problems) in zip(paths, response["results"])
+    )
+    return _write_results(results, args)
+
+
+def _load_changed_lines(args: argparse.Namespace) -> Optional[dict[str, LineRanges]]:
+    if args.diff_rev is not None:
+        return parse_unified_diff(git_diff(args.diff_rev))
+    if args.diff == "-":
+        return parse_unified_diff(sys.stdin.read())
+    if args.diff is not None:
+        try:
+            text = Path(args.diff).read_text(encoding="utf-8")
+        except OSError as error:
+            raise DiffError(f"cannot read diff: {error}") from error
+        return parse_unified_diff(text)
+    return None
+
+
+def _open_output(path: Optional[str]) -> TextIO:
+    if path is None:
+        return _Unclosable(sys.stdout)  # type: ignore
+    return open(path, "w", encoding="utf-8")  # pylint: disable=consider-using-with
+
+
+class _Unclosable:
+    """Wrapper preventing a stream from being closed by a `with` statement."""
+
+    def __init__(self, stream: TextIO):
+        self._stream = stream
+
+    def __enter__(self) -> TextIO:
+        return self._stream
+
+    def __exit__(self, *args: Any) -> None:
+        self._stream.flush()
@@ -11,6 +11,7 @@ class Config:
         blanks_before_imports: int = defaults.BLANKS_BEFORE_IMPORTS,
         blanks_before_return: int = defaults.BLANKS_BEFORE_RETURN,
         blanks_before_except: int = defaults.BLANKS_BEFORE_EXCEPT,
+        blank_line_rules: str = defaults.BLANK_LINE_RULES,
     ):
         """
         Initialize a `Configuration` instance.
@@ -21,7 +22,10 @@ class Config:
             blanks_before_return (int): Number of blanks line expected before return
                 statement.
             blanks_before_except (int): Number of blanks line expected before except.
+            blank_line_rules (str): Additional rules, as given to the
+                `blank-line-rules` option (see the `rules` module).
         """
         self.blanks_before_imports = blanks_before_imports
         self.blanks_before_return = blanks_before_return
         self.blanks_before_except = blanks_before_except
+        self.blank_line_rules = blank_line_rules
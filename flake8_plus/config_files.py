@@ -0,0 +1,124 @@
+"""Reading of the flake8 configuration files used by the standalone tools."""
+import configparser
+from pathlib import Path
+from typing import Any, Mapping, Optional
+
+from . import defaults
+from .config import Config
+from .exceptions import ConfigError
+
+try:  # pragma: no cover
+    import tomllib
+except ImportError:  # pragma: no cover
+    try:
+        import tomli as tomllib  # type: ignore
+    except ImportError:
+        tomllib = None  # type: ignore
+
+INI_FILES = ("setup.cfg", "tox.ini", ".flake8")
+PYPROJECT_FILE = "pyproject.toml"
+
+
+def find_config_file(start: Path) -> Optional[Path]:
+    """
+    Find the configuration file flake8 would use when run from a folder.
+
+    The folder and each of its parents are searched for a `setup.cfg`, `tox.ini` or
+    `.flake8` file with a `[flake8]` section, or a `pyproject.toml` file with a
+    `[tool.flake8]` table (as used by the Flake8-pyproject plugin).
+
+    Args:
+        start (Path): The folder to start searching from.
+
+    Returns:
+        Optional[Path]: The configuration file, or `None` if there is none.
+    """
+    for folder in [start.resolve(), *start.resolve().parents]:
+        for name in INI_FILES:
+            path = folder / name
+            if path.is_file() and _read_ini(path) is not None:
+                return path
+        path = folder / PYPROJECT_FILE
+        if path.is_file() and _read_pyproject(path) is not None:
+            return path
+    return None
+
+
+def read_config_file(path: Path) -> dict[str, str]:
+    """
+    Read the flake8 options from a configuration file.
+
+    Args:
+        path (Path): The configuration file.
+
+    Returns:
+        dict[str, str]: The options, with dashes in their names replaced by
+        underscores like flake8 does.
+    """
+    if path.name == PYPROJECT_FILE:
+        options = _read_pyproject(path)
+    else:
+        options = _read_ini(path)
+    return {
+        name.replace("-", "_"): value.strip() for name, value in (options or {}).items()
+    }
+
+
+def config_from_options(options: Mapping[str, Any]) -> Config:
+    """
+    Create a plugin configuration from flake8 options.
+
+    Args:
+        options (Mapping[str, Any]): The options, as read by `read_config_file`.
+
+    Raises:
+        ConfigError: If the number of blank lines of an option is not an integer.
+
+    Returns:
+        Config: The plugin configuration.
+    """
+    return Config(
+        _int(options, "blanks_before_imports", defaults.BLANKS_BEFORE_IMPORTS),
+        _int(options, "blanks_before_return", defaults.BLANKS_BEFORE_RETURN),
+        _int(options, "blanks_before_except", defaults.BLANKS_BEFORE_EXCEPT),
+        str(options.get("blank_line_rules", defaults.BLANK_LINE_RULES)),
+    )
+
+
+def _int(options: Mapping[str, Any], name: str, default: int) -> int:
+    value = options.get(name, default)
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        option = name.replace("_", "-")
+        raise ConfigError(
+            f"invalid value {value!r} for {option}, expected an integer"
+        ) from None
+
+
+def _read_ini(path: Path) -> Optional[dict[str, str]]:
+    parser = configparser.RawConfigParser()
+    try:
+        parser.read(path, encoding="utf-8")
+    except configparser.Error:
+        return None
+    if not parser.has_section("flake8"):
+        return None
+    return dict(parser.items("flake8"))
+
+
+def _read_pyproject(path: Path) -> Optional[dict[str, str]]:
+    if tomllib is None:
+        return None
+    with path.open("rb") as file:
+        try:
+            data = tomllib.load(file)
+        except tomllib.TOMLDecodeError:
+            return None
+    table = data.get("tool", {}).get("flake8")
+    if not isinstance(table, dict):
+        return None
+    return {
+        name: ",".join(map(str, value)) if isinstance(value, list) else str(value)
+        for name, value in table.items()
+    }
@@ -0,0 +1,375 @@
+"""
+Long-lived checking daemon and its client, for fast repeated checks.
+
+The daemon only answers the user running it, and the client only talks to a daemon
+run by the same user, of the same version. By default, the socket is in a folder only
+that user can access.
+"""
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import stat as stat_module
+import struct
+import subprocess  # nosec
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, NamedTuple, Optional, Sequence
+
+from .checker import rule_codes
+from .config import Config
+from .exceptions import DaemonError
+from .runner import FileResult, Result, run_sources
+from .selection import RuleSelection
+from .version import VERSION
+
+ENVIRONMENT_VARIABLE = "FLAKE8_PLUS_DAEMON_SOCKET"
+START_TIMEOUT = 10.0
+
+
+class _FileState(NamedTuple):
+    mtime_ns: int
+    size: int
+    digest: bytes
+    key: tuple
+    problems: list[Result]
+
+
+class Daemon:
+    """
+    Checker keeping the results of the files it checked in memory.
+
+    A file is only checked again if it changed, or if it is checked with a different
+    configuration or selection of rules. Files whose modification time and size are
+    unchanged are assumed to be unchanged; otherwise their contents are hashed, so
+    touching a file does not cause it to be checked again either.
+    """
+
+    def __init__(self, jobs: int = 1):
+        """
+        Initialize a `Daemon` instance.
+
+        Args:
+            jobs (int): The number of processes to check changed files in.
+        """
+        self.jobs = jobs
+        self.checked = 0
+        self._states: dict[str, _FileState] = {}
+        self._lock = threading.Lock()
+
+    def check(
+        self,
+        paths: Sequence[str],
+        config: Config,
+        selection: Optional[RuleSelection] = None,
+    ) -> list[FileResult]:
+        """
+        Check files, reusing the results of unchanged files.
+
+        Args:
+            paths (Sequence[str]): The absolute paths of the files to check.
+            config (Config): The plugin configuration.
+            selection (Optional[RuleSelection]): If specified, only check the rules it
+                enables for each file, and apply `# noqa` comments unless it disables
+                them (see `runner.check_source`).
+
+        Returns:
+            list[FileResult]: The problems found in each file, in the order given.
+        """
+        with self._lock:
+            results = self._check(paths, config, selection)
+            self._prune(paths)
+            return results
+
+    def _check(
+        self,
+        paths: Sequence[str],
+        config: Config,
+        selection: Optional[RuleSelection],
+    ) -> list[FileResult]:
+        # pylint: disable=too-many-locals
+        config_key = tuple(sorted(vars(config).items()))
+        results: dict[str, list[Result]] = {}
+        changed: dict[str, tuple[os.stat_result, bytes, tuple]] = {}
+        sources: dict[str, bytes] = {}
+        for path in paths:
+            state = self._states.get(path)
+            key = _key(path, config_key, selection)
+            try:
+                stat = os.stat(path)
+                if _is_unchanged(state, stat, key):
+                    results[path] = state.problems  # type: ignore[union-attr]
+                    continue
+                with open(path, "rb") as file:
+                    data = file.read()
+            except OSError as error:
+                self._states.pop(path, None)
+                results[path] = [(1, 0, f"E902 {type(error).__name__}: {error}")]
+                continue
+            digest = hashlib.sha256(data).digest()
+            if state is not None and state.digest == digest and state.key == key:
+                self._states[path] = state._replace(
+                    mtime_ns=stat.st_mtime_ns, size=stat.st_size
+                )
+                results[path] = state.problems
+            else:
+                changed[path] = (stat, digest, key)
+                sources[path] = data
+        # The contents hashed are checked, in parallel like the runner does, so the
+        # problems kept always belong to the digest kept.
+        for result in run_sources(sources, config, self.jobs, selection):
+            stat, digest, key = changed[result.path]
+            self._states[result.path] = _FileState(
+                stat.st_mtime_ns, stat.st_size, digest, key, result.problems
+            )
+            results[result.path] = result.problems
+            self.checked += 1
+        return [FileResult(path, results[path]) for path in paths]
+
+    def _prune(self, paths: Sequence[str]):
+        # Forget the files deleted since they were checked, so the results of files
+        # that come and go, such as generated files, do not pile up.
+        for path in self._states.keys() - set(paths):
+            if not os.path.exists(path):
+                del self._states[path]
+
+    def handle(self, message: dict[str, Any]) -> dict[str, Any]:
+        """
+        Handle a request from a client.
+
+        Args:
+            message (dict[str, Any]): The request.
+
+        Returns:
+            dict[str, Any]: The response.
+        """
+        command = message.get("command")
+        if command == "check":
+            config = Config(**message["config"])
+            selection = None
+            if "selection" in message:
+                selection = RuleSelection.from_config(
+                    message["selection"], rule_codes(config), message["cwd"]
+                )
+            results = self.check(message["paths"], config, selection)
+            return {"results": [[r.path, r.problems] for r in results]}
+        if command == "status":
+            return {"pid": os.getpid(), "version": VERSION, "files": len(self._states)}
+        if command == "stop":
+            return {"stopping": True}
+        return {"error": f"unknown command: {command}"}
+
+    def serve(self, socket_path: str):
+        """
+        Serve requests on a Unix socket until asked to stop.
+
+        Args:
+            socket_path (str): The path of the socket.
+        """
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            """Handler of a single request."""
+
+            def handle(self):
+                if _peer_uid(self.request) not in (None, os.getuid()):
+                    response = {"error": "permission denied"}
+                    self.wfile.write(json.dumps(response).encode() + b"\n")
+                    return
+                try:
+                    message = json.loads(self.rfile.readline())
+                    response = daemon.handle(message)
+                except (KeyError, TypeError, ValueError) as error:
+                    response = {"error": f"{type(error).__name__}: {error}"}
+                self.wfile.write(json.dumps(response).encode() + b"\n")
+                if response.get("stopping"):
+                    threading.Thread(target=self.server.shutdown).start()
+
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        with socketserver.UnixStreamServer(socket_path, Handler) as server:
+            inode = os.stat(socket_path).st_ino
+            try:
+                server.serve_forever()
+            finally:
+                # A daemon started to replace this one may already have bound the
+                # path to its own socket.
+                if _inode(socket_path) == inode:
+                    os.unlink(socket_path)
+
+
+def default_socket_path(cwd: Optional[str] = None) -> str:
+    """
+    Return the path of the socket of the daemon for a project.
+
+    The path is read from the `FLAKE8_PLUS_DAEMON_SOCKET` environment variable if set.
+    Otherwise, each user gets a daemon per folder, with its socket in a folder only the
+    user can access: `flake8-plus` in `$XDG_RUNTIME_DIR`, or `flake8-plus-<uid>` in
+    the temporary folder, as socket paths are limited to around a hundred characters.
+    The folder is created if missing.
+
+    Args:
+        cwd (Optional[str]): The project folder. Defaults to the current folder.
+
+    Raises:
+        DaemonError: If the folder of the socket is not private to the user.
+
+    Returns:
+        str: The path of the socket.
+    """
+    if os.environ.get(ENVIRONMENT_VARIABLE):
+        return os.environ[ENVIRONMENT_VARIABLE]
+    if os.environ.get("XDG_RUNTIME_DIR"):
+        parent = os.path.join(os.environ["XDG_RUNTIME_DIR"], "flake8-plus")
+    else:
+        parent = os.path.join(tempfile.gettempdir(), f"flake8-plus-{os.getuid()}")
+    os.makedirs(parent, mode=0o700, exist_ok=True)
+    # The folder may have been created by another user to intercept the requests.
+    info = os.lstat(parent)
+    if (
+        not stat_module.S_ISDIR(info.st_mode)
+        or info.st_uid != os.getuid()
+        or info.st_mode & 0o077
+    ):
+        raise DaemonError(f"{parent} must be a folder only accessible by its owner")
+    folder = os.path.abspath(cwd or os.getcwd())
+    digest = hashlib.sha256(folder.encode("utf-8", "surrogatepass")).hexdigest()
+    return os.path.join(parent, f"{digest[:16]}.sock")
+
+
+def request(socket_path: str, message: dict[str, Any]) -> dict[str, Any]:
+    """
+    Send a request to the daemon and wait for its response.
+
+    Args:
+        socket_path (str): The path of the socket of the daemon.
+        message (dict[str, Any]): The request.
+
+    Raises:
+        DaemonError: If the daemon is not running, is run by another user, or failed
+            to handle the request.
+
+    Returns:
+        dict[str, Any]: The response.
+    """
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(socket_path)
+            if not _is_own(socket_path, client):
+                raise DaemonError(f"daemon at {socket_path} is run by another user")
+            client.sendall(json.dumps(message).encode() + b"\n")
+            with client.makefile("rb") as stream:
+                line = stream.readline()
+    except OSError as error:
+        raise DaemonError(f"daemon not running at {socket_path}: {error}") from error
+    if not line:
+        raise DaemonError("daemon closed the connection without responding")
+    response = json.loads(line)
+    if "error" in response:
+        raise DaemonError(response["error"])
+    return response
+
+
+def start(socket_path: str, jobs: int = 1) -> int:
+    """
+    Start the daemon in the background, unless it is already running.
+
+    A daemon of another version, typically started before an upgrade, is stopped and
+    replaced.
+
+    Args:
+        socket_path (str): The path of the socket of the daemon.
+        jobs (int): The number of processes to check changed files in.
+
+    Raises:
+        DaemonError: If the daemon did not start.
+
+    Returns:
+        int: The process id of the daemon.
+    """
+    try:
+        status = request(socket_path, {"command": "status"})
+    except DaemonError:
+        status = None
+    if status is not None:
+        if status.get("version") == VERSION:
+            return status["pid"]
+        _stop(socket_path)
+    command = [sys.executable, "-m", "flake8_plus", "daemon", "serve"]
+    command += ["--socket", socket_path, "--jobs", str(jobs)]
+    subprocess.Popen(  # nosec # pylint: disable=consider-using-with
+        command,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + START_TIMEOUT
+    while True:
+        try:
+            status = request(socket_path, {"command": "status"})
+        except DaemonError:
+            status = None
+        if status is not None and status.get("version") == VERSION:
+            return status["pid"]
+        if time.monotonic() > deadline:
+            raise DaemonError(f"daemon did not start at {socket_path}")
+        time.sleep(0.02)
+
+
+def _stop(socket_path: str):
+    # Stops the daemon and waits until it no longer answers.
+    request(socket_path, {"command": "stop"})
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            request(socket_path, {"command": "status"})
+        except DaemonError:
+            return
+        time.sleep(0.02)
+    raise DaemonError(f"daemon at {socket_path} did not stop")
+
+
+def _is_own(socket_path: str, connection: socket.socket) -> bool:
+    # Whether the socket and the process listening on it belong to the current user.
+    uid = os.getuid()
+    return os.stat(socket_path).st_uid == uid and _peer_uid(connection) in (None, uid)
+
+
+def _peer_uid(connection: socket.socket) -> Optional[int]:
+    # The user id of the process at the other end, where the platform tells.
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    size = struct.calcsize("3i")
+    credentials = connection.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, size)
+    _, uid, _ = struct.unpack("3i", credentials)
+    return uid
+
+
+def _inode(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_ino
+    except OSError:
+        return None
+
+
+def _is_unchanged(
+    state: Optional[_FileState], stat: os.stat_result, key: tuple
+) -> bool:
+    return (
+        state is not None
+        and state.mtime_ns == stat.st_mtime_ns
+        and state.size == stat.st_size
+        and state.key == key
+    )
+
+
+def _key(path: str, config_key: tuple, selection: Optional[RuleSelection]) -> tuple:
+    # The results of a file depend on the configuration and on the rules selected for
+    # it, besides its contents.
+    if selection is None:
+        return (config_key,)
+    return (config_key, selection.enabled_for(path), selection.disable_noqa)
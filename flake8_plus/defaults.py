@@ -3,3 +3,6 @@
 BLANKS_BEFORE_IMPORTS = 0
 BLANKS_BEFORE_RETURN = 0
 BLANKS_BEFORE_EXCEPT = 0
+BLANK_LINE_RULES = ""
+CACHE_MAX_ENTRIES = 100_000
+SLOW_FILE_DIR = ".flake8-plus-slow-files"
@@ -0,0 +1,136 @@
+"""
+Checking of modules toplevel definition by toplevel definition, caching the results.
+
+A module is split into chunks, one per toplevel statement (or per group of toplevel
+statements sharing lines), each holding the lines from the end of the previous chunk
+to its last line, so the blank lines and comments before a statement belong to its
+chunk. The problems found in a chunk only depend on its lines and on the type of the
+toplevel statement before it, the previous node of its first statement. The problems
+of chunks holding a function or class definition are thus cached by these, with line
+numbers relative to the chunk, so editing one function of a large module only
+requires walking that function again. Module level rules, such as PLU001, are checked
+separately, on every check, as they only inspect the module header.
+"""
+import ast
+import bisect
+import operator
+from typing import TYPE_CHECKING, Iterable, Optional, Sequence
+
+from .config import Config
+from .line_index import LineIndex
+from .prescan import prescan
+from .problem import Problem
+from .visitors.base_visitor import BaseVisitor
+from .visitors.fused_visitor import FusedVisitor
+from .visitors.rule_visitor import DEFINITION_TYPES
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .cache import Result, ResultCache
+    from .statistics import FileStatistics
+
+Group = tuple[int, int, list[ast.stmt]]
+
+_LINE = operator.itemgetter(0)
+
+
+def group_statements(statements: list[ast.stmt]) -> list[Group]:
+    """
+    Group toplevel statements into chunks, statements sharing a line sharing a chunk.
+
+    Args:
+        statements (list[ast.stmt]): The toplevel statements, in source order.
+
+    Returns:
+        list[Group]: The chunks, each given by the line before its first line, its
+        last line and its statements.
+    """
+    groups: list[Group] = []
+    for statement in statements:
+        decorators = getattr(statement, "decorator_list", [])
+        first = min([statement.lineno] + [d.lineno for d in decorators])
+        last = statement.end_lineno or statement.lineno
+        if groups and first <= groups[-1][1]:
+            offset, end, grouped = groups[-1]
+            grouped.append(statement)
+            groups[-1] = (offset, max(end, last), grouped)
+        else:
+            offset = groups[-1][1] if groups else 0
+            groups.append((offset, last, [statement]))
+    return groups
+
+
+def check_definitions(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    lines: list[str],
+    config: Config,
+    tree: ast.Module,
+    visitors: Sequence[type[BaseVisitor]],
+    cache: "ResultCache",
+    codes: Optional[Iterable[str]] = None,
+    statistics: Optional["FileStatistics"] = None,
+) -> list["Result"]:
+    """
+    Check a module, reusing the cached problems of unchanged toplevel definitions.
+
+    Args:
+        lines (list[str]): The physical lines.
+        config (Config): The plugin configuration.
+        tree (ast.Module): The abstract syntax tree.
+        visitors (Sequence[type[BaseVisitor]]): The visitors to check with.
+        cache (ResultCache): The cache to read and store the problems of definitions.
+        codes (Optional[Iterable[str]]): The codes of the rules checked, if not all of
+            them.
+        statistics (Optional[FileStatistics]): Statistics to record the work of the
+            visitors in.
+
+    Returns:
+        list[Result]: The problems found, sorted by position.
+    """
+    # pylint: disable=too-many-locals
+    groups = []
+    items = []
+    previous: Optional[ast.stmt] = None
+    for group in group_statements(tree.body):
+        offset, end, statements = group
+        if any(isinstance(statement, DEFINITION_TYPES) for statement in statements):
+            groups.append(group)
+            items.append((lines[offset:end], f"after {type(previous).__name__}"))
+        previous = statements[-1]
+    keys = dict(zip(cache.keys(items, config, codes), groups))
+    cached = cache.get_many(list(keys))
+    skipped = {id(s) for key in cached for s in keys[key][2]}
+    line_index = LineIndex(lines)
+    visitors, unused = prescan(lines, visitors)
+    instances = [cls(lines, config, line_index) for cls in visitors]
+    if statistics is not None:
+        for visitor in instances:
+            statistics.instrument(visitor)
+        for cls in unused:
+            statistics.skip(cls)
+    module = FusedVisitor(v for v in instances if not v.descend)
+    fused = FusedVisitor(v for v in instances if v.descend)
+    results = _results(module.iter_problems(tree))
+    problems = _results(
+        fused.iter_problems(tree, lambda statement: id(statement) not in skipped)
+    )
+    missing = []
+    for key, (offset, end, _) in keys.items():
+        if key in cached:
+            results.extend(_shift(cached[key], offset))
+            continue
+        start = bisect.bisect_right(problems, offset, key=_LINE)
+        stop = bisect.bisect_right(problems, end, key=_LINE)
+        missing.append((key, _shift(problems[start:stop], -offset)))
+    cache.put_many(missing)
+    if statistics is not None:
+        statistics.finish(instances, module.nodes_visited + fused.nodes_visited)
+    results.extend(problems)
+    results.sort()
+    return results
+
+
+def _results(problems: Iterable[Problem]) -> list["Result"]:
+    return [(p.line_number, p.col_offset, p.message_with_code) for p in problems]
+
+
+def _shift(results: list["Result"], lines: int) -> list["Result"]:
+    return [(line + lines, col, message) for line, col, message in results]
@@ -0,0 +1,148 @@
+"""Mapping of unified diffs to the changed line ranges of each file."""
+import bisect
+import os
+import re
+import subprocess  # nosec
+from typing import Iterable, Iterator, Optional
+
+from .exceptions import DiffError
+
+_HUNK_HEADER = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+
+class LineRanges:
+    """Sorted, non-overlapping ranges of line numbers."""
+
+    def __init__(self, ranges: Iterable[tuple[int, int]] = ()):
+        """
+        Initialize a `LineRanges` instance.
+
+        Args:
+            ranges (Iterable[tuple[int, int]]): Ranges of (one-based) line numbers,
+                each given by its first and last line number.
+        """
+        merged: list[tuple[int, int]] = []
+        for start, end in sorted(ranges):
+            if merged and start <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        self._starts = [start for start, _ in merged]
+        self._ends = [end for _, end in merged]
+
+    def __bool__(self) -> bool:
+        """Return whether there are any ranges."""
+        return bool(self._starts)
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        """Iterate over the ranges."""
+        return iter(zip(self._starts, self._ends))
+
+    def __eq__(self, other: object) -> bool:
+        """Return whether two instances hold the same ranges."""
+        return isinstance(other, LineRanges) and list(self) == list(other)
+
+    def __repr__(self) -> str:
+        """Return a representation of the ranges."""
+        return f"LineRanges({list(self)})"
+
+    def overlaps(self, first: int, last: int) -> bool:
+        """
+        Return whether any of the ranges overlaps the specified range.
+
+        Args:
+            first (int): The first line number of the range.
+            last (int): The last line number of the range.
+
+        Returns:
+            bool: Whether any of the ranges overlaps the range.
+        """
+        index = bisect.bisect_right(self._starts, last) - 1
+        return index >= 0 and self._ends[index] >= first
+
+
+def parse_unified_diff(text: str, strip: Optional[int] = None) -> dict[str, LineRanges]:
+    """
+    Find the lines changed in each file of a unified diff.
+
+    Added and modified lines are changed lines. Where lines were only removed, the
+    line following the removed lines is considered changed, since removing blank
+    lines changes the number of blank lines before it.
+
+    Args:
+        text (str): The unified diff.
+        strip (Optional[int]): Number of leading path components to strip from file
+            names, like `patch -p`. Defaults to 1 if the names start with `b/` and 0
+            otherwise.
+
+    Returns:
+        dict[str, LineRanges]: The changed lines, by normalized file path. Deleted
+        files are left out.
+    """
+    ranges: dict[str, list[tuple[int, int]]] = {}
+    current: Optional[list[tuple[int, int]]] = None
+    for line in text.splitlines():
+        if line.startswith("+++ "):
+            path = line[4:].split("\t")[0].strip()
+            if path == "/dev/null":
+                current = None
+                continue
+            path = _strip_path(path, strip)
+            current = ranges.setdefault(path, [])
+            continue
+        match = _HUNK_HEADER.match(line)
+        if match and current is not None:
+            start = int(match.group(1))
+            count = 1 if match.group(2) is None else int(match.group(2))
+            if count == 0:
+                current.append((start + 1, start + 1))
+            else:
+                current.append((start, start + count - 1))
+    return {path: LineRanges(path_ranges) for path, path_ranges in ranges.items()}
+
+
+def git_diff(revision_range: str, cwd: Optional[str] = None) -> str:
+    """
+    Run `git diff` for a revision range without context lines.
+
+    Paths are relative to the current folder, and files outside it are left out.
+
+    Args:
+        revision_range (str): The revisions to compare, for example `main...HEAD`.
+        cwd (Optional[str]): The folder to run git in. Defaults to the current folder.
+
+    Raises:
+        DiffError: If git cannot be run or fails, for example on an unknown revision.
+
+    Returns:
+        str: The unified diff.
+    """
+    # The range is given after --end-of-options, so it is never taken for an option.
+    command = [
+        "git",
+        "diff",
+        "--unified=0",
+        "--no-color",
+        "--no-ext-diff",
+        "--relative",
+        "--end-of-options",
+        revision_range,
+        "--",
+    ]
+    try:
+        completed = subprocess.run(  # nosec
+            command, cwd=cwd, check=True, capture_output=True, text=True
+        )
+    except OSError as error:
+        raise DiffError(f"cannot run git: {error}") from error
+    except subprocess.CalledProcessError as error:
+        lines = error.stderr.strip().splitlines() or [f"exit status {error.returncode}"]
+        raise DiffError(f"git diff {revision_range} failed: {lines[0]}") from error
+    return completed.stdout
+
+
+def _strip_path(path: str, strip: Optional[int]) -> str:
+    if strip is None:
+        strip = 1 if path.startswith("b/") else 0
+    parts = path.split("/")
+    return os.path.normpath("/".join(parts[strip:]))
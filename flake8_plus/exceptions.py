@@ -7,3 +7,23 @@ class Flake8PlusError(Exception):
 
 class MultipleStatementsError(Flake8PlusError):
     """Exception raised when multiple statements are found on one line."""
+
+
+class DaemonError(Flake8PlusError):
+    """Exception raised when the daemon cannot be reached or fails a request."""
+
+
+class RuleError(Flake8PlusError):
+    """Exception raised when a configured blank line rule is invalid."""
+
+
+class ShardError(Flake8PlusError):
+    """Exception raised when a shard is invalid or shard reports cannot be merged."""
+
+
+class DiffError(Flake8PlusError):
+    """Exception raised when the diff of the lines to check cannot be obtained."""
+
+
+class ConfigError(Flake8PlusError):
+    """Exception raised when an option in a configuration file is invalid."""
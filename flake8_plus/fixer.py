@@ -0,0 +1,199 @@
+"""Fixing of the blank lines reported by the flake8-plus rules."""
+import io
+import os
+import shutil
+import tempfile
+import tokenize
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import TYPE_CHECKING, Iterable, Iterator, NamedTuple, Optional, Sequence
+
+from .checker import check, load_visitors
+from .config import Config
+from .noqa import filter_noqa, is_file_ignored
+from .problem import Problem
+from .runner import make_chunks
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .selection import RuleSelection
+
+
+class FixResult(NamedTuple):
+    """The outcome of fixing a file."""
+
+    path: str
+    fixed: int
+    error: Optional[str] = None
+
+
+def fix_lines(lines: Iterable[str], problems: Iterable[Problem]) -> Iterator[str]:
+    """
+    Insert and remove blank lines to fix the specified problems.
+
+    The lines are streamed through once. Blank lines are held back until the next
+    non-blank line, and if a problem was found on that line, the blank lines before
+    it are cut or padded to the expected number.
+
+    Args:
+        lines (Iterable[str]): The physical lines.
+        problems (Iterable[Problem]): The problems found in the lines.
+
+    Yields:
+        Iterator[str]: The fixed lines.
+    """
+    expected = {problem.line_number: problem.blanks_expected for problem in problems}
+    blanks: list[str] = []
+    for line_number, line in enumerate(lines, 1):
+        if not line.lstrip():
+            blanks.append(line)
+            continue
+        count = expected.get(line_number)
+        if count is not None:
+            del blanks[count:]
+            ending = line[len(line.rstrip("\r\n")) :] or "\n"
+            blanks.extend([ending] * (count - len(blanks)))
+        yield from blanks
+        blanks.clear()
+        yield line
+    yield from blanks
+
+
+def fix_source(
+    lines: list[str],
+    config: Config,
+    codes: Optional[Iterable[str]] = None,
+    noqa: bool = True,
+) -> tuple[list[str], int]:
+    """
+    Fix the problems found in source code.
+
+    Like the runner, only the problems flake8 would report are fixed: those of the
+    specified rules, and unless disabled, not those on lines with a `# noqa` comment
+    for them, nor any in source code with a `# flake8: noqa` line (see the `noqa`
+    module). Fixing is idempotent: the fixed source code has no such problems, so
+    fixing it again leaves it unchanged.
+
+    Args:
+        lines (list[str]): The physical lines.
+        config (Config): The plugin configuration.
+        codes (Optional[Iterable[str]]): The codes of the rules to fix. Defaults to
+            all the rules, including the configured rules.
+        noqa (bool): Whether to leave the problems suppressed by noqa comments.
+
+    Returns:
+        tuple[list[str], int]: The fixed lines and the number of problems fixed.
+    """
+    if noqa and is_file_ignored(lines):
+        return lines, 0
+    visitors = load_visitors(codes, config.blank_line_rules)
+    problems = check(lines, config, visitors=visitors)
+    if noqa:
+        problems = list(filter_noqa(problems, lines))
+    if not problems:
+        return lines, 0
+    return list(fix_lines(lines, problems)), len(problems)
+
+
+def fix_file(
+    path: str, config: Config, selection: Optional["RuleSelection"] = None
+) -> FixResult:
+    """
+    Fix the problems found in a file.
+
+    The file is decoded using its declared encoding and its line endings are kept.
+    It is only written if problems were fixed, in which case it is replaced
+    atomically, so an interrupted run never leaves a partially written file.
+
+    Args:
+        path (str): The file to fix.
+        config (Config): The plugin configuration.
+        selection (Optional[RuleSelection]): If specified, only fix the rules it
+            enables for the file, and leave problems suppressed by noqa comments
+            unless it disables them.
+
+    Returns:
+        FixResult: The number of problems fixed, or the reason the file could not be
+        fixed.
+    """
+    try:
+        with open(path, "rb") as file:
+            data = file.read()
+        encoding, _ = tokenize.detect_encoding(io.BytesIO(data).readline)
+        lines = io.StringIO(data.decode(encoding), newline="").readlines()
+    except (OSError, SyntaxError, UnicodeDecodeError) as error:
+        return FixResult(path, 0, f"E902 {type(error).__name__}: {error}")
+    codes = None if selection is None else selection.enabled_for(path)
+    noqa = selection is None or not selection.disable_noqa
+    try:
+        fixed_lines, fixed = fix_source(lines, config, codes, noqa)
+    except SyntaxError as error:
+        return FixResult(path, 0, f"E999 {type(error).__name__}: {error.msg}")
+    if fixed:
+        _replace(path, "".join(fixed_lines).encode(encoding))
+    return FixResult(path, fixed)
+
+
+def fix_files(
+    paths: Sequence[str], config: Config, selection: Optional["RuleSelection"] = None
+) -> list[FixResult]:
+    """
+    Fix the problems found in several files.
+
+    Args:
+        paths (Sequence[str]): The files to fix.
+        config (Config): The plugin configuration.
+        selection (Optional[RuleSelection]): If specified, only fix the rules it
+            enables for each file (see `fix_file`).
+
+    Returns:
+        list[FixResult]: The outcome for each file.
+    """
+    return [fix_file(path, config, selection) for path in paths]
+
+
+def run(
+    paths: Sequence[str],
+    config: Config,
+    jobs: int,
+    selection: Optional["RuleSelection"] = None,
+) -> Iterator[FixResult]:
+    """
+    Fix files, in parallel if more than one job is requested.
+
+    Files are chunked like the runner does for checking, and results are yielded as
+    soon as a chunk of files has been fixed.
+
+    Args:
+        paths (Sequence[str]): The files to fix.
+        config (Config): The plugin configuration.
+        jobs (int): The number of processes to fix files in.
+        selection (Optional[RuleSelection]): If specified, only fix the rules it
+            enables for each file (see `fix_file`).
+
+    Yields:
+        Iterator[FixResult]: The outcome for each file.
+    """
+    if jobs <= 1 or len(paths) <= 1:
+        yield from fix_files(paths, config, selection)
+        return
+    chunks = make_chunks(paths, jobs)
+    with ProcessPoolExecutor(min(jobs, len(chunks))) as executor:
+        pending: set[Future] = {
+            executor.submit(fix_files, chunk, config, selection) for chunk in chunks
+        }
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+
+def _replace(path: str, data: bytes):
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, temporary = tempfile.mkstemp(prefix=".flake8-plus-", dir=directory)
+    try:
+        with os.fdopen(handle, "wb") as file:
+            file.write(data)
+        shutil.copymode(path, temporary)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
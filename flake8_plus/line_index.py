@@ -0,0 +1,98 @@
+"""LineIndex class."""
+import mmap
+import re
+from array import array
+from typing import Iterable, Union
+
+Buffer = Union[bytes, bytearray, mmap.mmap]
+
+# Leading whitespace, including the line ending of blank lines.
+_INDENT = re.compile(rb"[ \t\f\v\r\n]*")
+
+
+class LineIndex:
+    """
+    Compact per-file index of blank lines and line indentation.
+
+    The index is built in a single pass over the physical lines and answers the
+    questions the visitors ask about a line in constant time, without allocating new
+    strings per query.
+    """
+
+    def __init__(self, lines: Iterable[str]):
+        """
+        Initialize a `LineIndex` instance.
+
+        Args:
+            lines (Iterable[str]): The physical lines.
+        """
+        blank_runs = array("I")
+        indents = array("I")
+        run = 0
+        for line in lines:
+            stripped = line.lstrip()
+            indents.append(len(line) - len(stripped))
+            run = 0 if stripped else run + 1
+            blank_runs.append(run)
+        self._blank_runs = blank_runs
+        self._indents = indents
+
+    @classmethod
+    def from_buffer(cls, buffer: Buffer) -> "LineIndex":
+        """
+        Build an index from encoded source code, such as a memory-mapped file.
+
+        Lines are found by searching the buffer for line feeds, and only ASCII
+        whitespace counts as indentation, which is all Python allows there.
+
+        Args:
+            buffer (Buffer): The encoded source code.
+
+        Returns:
+            LineIndex: The index.
+        """
+        index = cls(())
+        blank_runs = index._blank_runs
+        indents = index._indents
+        match_indent = _INDENT.match
+        size = len(buffer)
+        run = start = 0
+        while start < size:
+            end = buffer.find(b"\n", start)
+            end = size if end < 0 else end + 1
+            content = match_indent(buffer, start, end).end()
+            indents.append(content - start)
+            run = 0 if content < end else run + 1
+            blank_runs.append(run)
+            start = end
+        return index
+
+    def __len__(self) -> int:
+        """Return the number of lines in the index."""
+        return len(self._indents)
+
+    def indent(self, line_number: int) -> int:
+        """
+        Return the indentation of the specified line.
+
+        Args:
+            line_number (int): The (one-based) line number.
+
+        Returns:
+            int: The number of leading whitespace characters on the line.
+        """
+        return self._indents[line_number - 1]
+
+    def blanks_before(self, line_number: int) -> int:
+        """
+        Return the number of blank lines immediately preceding the specified line.
+
+        Args:
+            line_number (int): The (one-based) line number.
+
+        Returns:
+            int: The number of blank lines.
+        """
+        if line_number < 2:
+            return 0
+        return self._blank_runs[line_number - 2]
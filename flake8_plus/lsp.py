@@ -0,0 +1,572 @@
+"""
+Language server publishing problems to editors, checking edits incrementally.
+
+The server speaks the Language Server Protocol over stdio. Each open document is split
+into chunks, one per toplevel statement (or per group of toplevel statements sharing
+lines), each holding the lines from the end of the previous chunk to its last line, so
+the blank lines and comments before a statement belong to its chunk. A chunk is checked
+on its own, with line numbers relative to its first line, and its problems are kept
+until it is edited. On an edit, only the chunks touched are parsed and checked again,
+so the time taken depends on the size of the edited definitions rather than the size
+of the document.
+"""
+import ast
+import bisect
+import io
+import itertools
+import json
+import operator
+import urllib.parse
+import urllib.request
+from typing import Any, BinaryIO, NamedTuple, Optional, Sequence
+
+from .checker import load_visitors
+from .config import Config
+from .definitions import group_statements
+from .line_index import LineIndex
+from .noqa import filter_noqa_results, is_file_ignored
+from .prescan import prescan
+from .runner import Result
+from .selection import RuleSelection
+from .version import VERSION
+from .visitors.base_visitor import BaseVisitor
+from .visitors.fused_visitor import FusedVisitor
+from .visitors.plu001_visitor import find_first_import
+
+# JSON-RPC error codes.
+PARSE_ERROR = -32700
+INVALID_PARAMS = -32602
+METHOD_NOT_FOUND = -32601
+
+# LSP constants.
+INCREMENTAL_SYNC = 2
+WARNING = 2
+
+Position = tuple[int, int]
+
+# Returned by `LanguageServer._dispatch` for methods the server does not handle.
+_UNKNOWN_METHOD = object()
+
+
+class _Chunk(NamedTuple):
+    size: int
+    last: Optional[ast.stmt]
+    problems: list[Result]
+    has_import: bool
+    module_problems: list[Result]
+
+
+# Getters of the line of a problem and of the fields of a chunk.
+_LINE = operator.itemgetter(0)
+_SIZE = operator.itemgetter(0)
+_PROBLEMS = operator.itemgetter(2)
+_HAS_IMPORT = operator.itemgetter(3)
+
+
+class Document:  # pylint: disable=too-many-instance-attributes
+    """
+    Document checked incrementally as it is edited.
+
+    Rules checking statements only depend on the lines of a chunk and on the last
+    toplevel statement before it, which is the previous node of its first statement.
+    An edit thus only requires checking the chunks it touches again, extended to the
+    following chunk if the blank lines after the edited statements now precede it, or
+    if the last edited statement changed type. Module level rules, such as PLU001,
+    only depend on the first chunk holding an import, so their problems are those
+    found in that chunk.
+    """
+
+    def __init__(
+        self,
+        text: str,
+        config: Config,
+        visitors: Optional[Sequence[type[BaseVisitor]]] = None,
+        noqa: bool = True,
+    ):
+        """
+        Initialize a `Document` instance and check the complete document.
+
+        Args:
+            text (str): The text of the document.
+            config (Config): The plugin configuration.
+            visitors (Optional[Sequence[type[BaseVisitor]]]): The visitors to check
+                with. Defaults to the visitors of all the rules, including the
+                configured rules.
+            noqa (bool): Whether to drop the problems suppressed by `# noqa`
+                comments. Comments suppressing the whole file are not applied.
+        """
+        if visitors is None:
+            visitors = load_visitors(rules=config.blank_line_rules)
+        self.config = config
+        self.noqa = noqa
+        self._module_visitors = [v for v in visitors if not v.descend]
+        self._statement_visitors = [v for v in visitors if v.descend]
+        self.lines = _split_lines(text)
+        self.syntax_error: Optional[SyntaxError] = None
+        self.rechecked_lines = 0
+        self._chunks: Optional[list[_Chunk]] = None
+        self._starts: list[int] = []
+        self._check_all()
+
+    @property
+    def text(self) -> str:
+        """Return the text of the document."""
+        return "".join(self.lines)
+
+    def change(self, start: Position, end: Position, text: str) -> None:
+        """
+        Replace a range of the document and check the chunks it touches again.
+
+        Args:
+            start (Position): The (zero-based) line and column of the start of the
+                range, the column being an index in the line.
+            end (Position): The line and column of the end of the range.
+            text (str): The text to replace the range with.
+        """
+        first, last, delta = self._splice(start, end, text)
+        if self._chunks is None:
+            self._check_all()
+            return
+        i = bisect.bisect_right(self._starts, first) - 1
+        j = max(i, bisect.bisect_right(self._starts, last) - 1)
+        self._recheck(i, j, delta)
+
+    def replace(self, text: str) -> None:
+        """
+        Replace the complete text of the document and check it again.
+
+        Args:
+            text (str): The new text.
+        """
+        self.lines = _split_lines(text)
+        self._check_all()
+
+    def problems(self) -> list[Result]:
+        """
+        Return the problems in the document.
+
+        Returns:
+            list[Result]: The problems, sorted by position. If the document cannot be
+            parsed, the syntax error is the only problem.
+        """
+        if self._chunks is None:
+            error = self.syntax_error
+            assert error is not None  # nosec
+            message = f"E999 {type(error).__name__}: {error.msg}"
+            return [(error.lineno or 1, (error.offset or 1) - 1, message)]
+        # Most chunks have no problems, so they are filtered out without a loop in
+        # Python, which would otherwise dominate the time taken for large documents.
+        chunks = list(zip(self._starts, self._chunks))
+        results: list[Result] = []
+        for offset, chunk in itertools.compress(chunks, map(_PROBLEMS, self._chunks)):
+            results.extend(_shift(chunk.problems, offset))
+        header = itertools.compress(chunks, map(_HAS_IMPORT, self._chunks))
+        for offset, chunk in itertools.islice(header, 1):
+            results.extend(_shift(chunk.module_problems, offset))
+        results.sort()
+        return results
+
+    def _splice(
+        self, start: Position, end: Position, text: str
+    ) -> tuple[int, int, int]:
+        # Replace the text and return the first and last lines replaced, and the
+        # number of lines added.
+        lines = self.lines
+        (first, start_column), (last, end_column) = self._clamp(start), self._clamp(end)
+        stop = min(last + 1, len(lines))
+        prefix = lines[first][:start_column] if first < len(lines) else ""
+        suffix = lines[last][end_column:] if last < len(lines) else ""
+        replacement = _split_lines(prefix + text + suffix)
+        lines[first:stop] = replacement
+        return first, max(first, stop - 1), len(replacement) - max(stop - first, 0)
+
+    def _clamp(self, position: Position) -> Position:
+        # Positions past the last line refer to the end of the document.
+        line, column = position
+        lines = self.lines
+        if line < len(lines):
+            return line, column
+        if lines and not lines[-1].endswith(("\n", "\r")):
+            return len(lines) - 1, len(lines[-1])
+        return len(lines), 0
+
+    def _check_all(self) -> None:
+        self.rechecked_lines = len(self.lines)
+        try:
+            tree = ast.parse(self.text)
+        except SyntaxError as error:
+            self.syntax_error = error
+            self._chunks = None
+            return
+        self.syntax_error = None
+        self._chunks = self._check_region(self.lines, tree, None, True)
+        self._update_starts()
+
+    def _recheck(self, i: int, j: int, delta: int) -> None:
+        chunks = self._chunks
+        assert chunks is not None  # nosec
+        begin = self._starts[i]
+        end = self._starts[j] + chunks[j].size + delta
+        while True:
+            try:
+                tree = ast.parse("".join(self.lines[begin:end]))
+            except SyntaxError:
+                # The edit may span chunks in ways a region cannot show, such as by
+                # opening a string closed in a later chunk.
+                self._check_all()
+                return
+            if j == len(chunks) - 1:
+                break
+            # Blank lines after the last statement belong to the next chunk, and the
+            # last statement is the previous node of its first statement.
+            statements = tree.body
+            if (
+                not statements
+                or (statements[-1].end_lineno or 0) < end - begin
+                or type(statements[-1]) is not type(chunks[j].last)
+            ):
+                j += 1
+                end += chunks[j].size
+                continue
+            break
+        previous = chunks[i - 1].last if i > 0 else None
+        region = self.lines[begin:end]
+        chunks[i : j + 1] = self._check_region(
+            region, tree, previous, j == len(chunks) - 1
+        )
+        self._update_starts()
+        self.rechecked_lines = len(region)
+
+    def _check_region(
+        self,
+        lines: list[str],
+        tree: ast.Module,
+        previous: Optional[ast.AST],
+        tail: bool,
+    ) -> list[_Chunk]:
+        line_index = LineIndex(lines)
+        problems = self._check_statements(lines, line_index, tree, previous)
+        chunks = []
+        index = 0
+        for offset, end, statements in group_statements(tree.body):
+            stop = bisect.bisect_right(problems, end, lo=index, key=_LINE)
+            module_problems = self._check_header(lines, line_index, statements)
+            chunk_lines = lines[offset:end]
+            chunks.append(
+                _Chunk(
+                    end - offset,
+                    statements[-1],
+                    self._filter(_shift(problems[index:stop], -offset), chunk_lines),
+                    module_problems is not None,
+                    self._filter(_shift(module_problems or [], -offset), chunk_lines),
+                )
+            )
+            index = stop
+        if tail:
+            offset = sum(chunk.size for chunk in chunks)
+            chunks.append(_Chunk(len(lines) - offset, None, [], False, []))
+        return chunks
+
+    def _filter(self, problems: list[Result], lines: list[str]) -> list[Result]:
+        # Strings and lines continued with backslashes never span chunks, so the
+        # comments of a chunk only depend on its own lines, and are only looked for
+        # again when it is checked again.
+        if not self.noqa or not problems:
+            return problems
+        return list(filter_noqa_results(problems, lines))
+
+    def _check_statements(
+        self,
+        lines: list[str],
+        line_index: LineIndex,
+        tree: ast.Module,
+        previous: Optional[ast.AST],
+    ) -> list[Result]:
+        visitors, _ = prescan(lines, self._statement_visitors)
+        if not visitors:
+            return []
+        fused = FusedVisitor(cls(lines, self.config, line_index) for cls in visitors)
+        fused.previous_node = previous
+        return [
+            (p.line_number, p.col_offset, p.message_with_code)
+            for p in fused.iter_problems(tree)
+        ]
+
+    def _check_header(
+        self, lines: list[str], line_index: LineIndex, statements: list[ast.stmt]
+    ) -> Optional[list[Result]]:
+        # Check statements with the module level rules, if they hold an import.
+        module = ast.Module(body=statements, type_ignores=[])
+        if not self._module_visitors or find_first_import(module) is None:
+            return None
+        problems = []
+        for cls in self._module_visitors:
+            visitor = cls(lines, self.config, line_index)
+            visitor.visit(module)
+            problems.extend(
+                (p.line_number, p.col_offset, p.message_with_code)
+                for p in visitor.problems
+            )
+        return problems
+
+    def _update_starts(self) -> None:
+        assert self._chunks is not None  # nosec
+        sizes = map(_SIZE, self._chunks)
+        self._starts = list(itertools.accumulate(sizes, initial=0))[:-1]
+
+
+class LanguageServer:
+    """
+    Language server checking the open documents as they are edited.
+
+    Only the messages needed to publish diagnostics are handled: the lifecycle
+    messages, and the opening, changing and closing of text documents. Documents are
+    synchronized incrementally, and diagnostics are published after every change.
+    Like the runner, only the rules selected for the file of a document are checked,
+    and `# noqa` comments are applied to the problems published.
+    """
+
+    def __init__(self, config: Config, selection: Optional[RuleSelection] = None):
+        """
+        Initialize a `LanguageServer` instance.
+
+        Args:
+            config (Config): The plugin configuration.
+            selection (Optional[RuleSelection]): If specified, only check the rules it
+                enables for the file of each document, and apply `# noqa` comments
+                unless it disables them.
+        """
+        self.config = config
+        self.selection = selection
+        self.visitors = load_visitors(rules=config.blank_line_rules)
+        self._selected_visitors: dict[frozenset[str], list[type[BaseVisitor]]] = {}
+        self.documents: dict[str, Document] = {}
+        self.shutdown = False
+        self.exited = False
+
+    def handle(self, message: dict[str, Any]) -> list[dict[str, Any]]:
+        """
+        Handle a message from the client.
+
+        Args:
+            message (dict[str, Any]): The request or notification.
+
+        Returns:
+            list[dict[str, Any]]: The messages to send to the client: the response to
+            a request, and any diagnostics to publish.
+        """
+        method = message.get("method")
+        params = message.get("params") or {}
+        request_id = message.get("id")
+        try:
+            result, notifications = self._dispatch(method, params)
+        except (KeyError, TypeError, ValueError) as error:
+            if request_id is None:
+                return []
+            text = f"{type(error).__name__}: {error}"
+            return [_error(request_id, INVALID_PARAMS, text)]
+        if result is _UNKNOWN_METHOD:
+            if request_id is None:
+                return []
+            return [_error(request_id, METHOD_NOT_FOUND, f"unknown method {method}")]
+        if request_id is None:
+            return notifications
+        return [{"jsonrpc": "2.0", "id": request_id, "result": result}, *notifications]
+
+    def serve(self, reader: BinaryIO, writer: BinaryIO) -> int:
+        """
+        Serve a client until it asks the server to exit or closes the connection.
+
+        Args:
+            reader (BinaryIO): The stream to read messages from, usually stdin.
+            writer (BinaryIO): The stream to write messages to, usually stdout.
+
+        Returns:
+            int: The exit code, which is 0 if the client shut the server down first,
+            as the protocol requires, and 1 otherwise.
+        """
+        while not self.exited:
+            try:
+                message = _read_message(reader)
+            except ValueError as error:
+                _write_message(writer, _error(None, PARSE_ERROR, str(error)))
+                continue
+            if message is None:
+                break
+            for response in self.handle(message):
+                _write_message(writer, response)
+        return 0 if self.shutdown else 1
+
+    def _dispatch(
+        self, method: Optional[str], params: dict[str, Any]
+    ) -> tuple[Any, list[dict[str, Any]]]:
+        # pylint: disable=too-many-return-statements
+        if method == "initialize":
+            capabilities = {
+                "textDocumentSync": {"openClose": True, "change": INCREMENTAL_SYNC}
+            }
+            server_info = {"name": "flake8-plus", "version": VERSION}
+            return {"capabilities": capabilities, "serverInfo": server_info}, []
+        if method == "shutdown":
+            self.shutdown = True
+            return None, []
+        if method == "exit":
+            self.exited = True
+            return None, []
+        if method == "textDocument/didOpen":
+            item = params["textDocument"]
+            visitors = self._visitors_for(item["uri"])
+            document = Document(item["text"], self.config, visitors, self._noqa)
+            self.documents[item["uri"]] = document
+            return None, [self._publish(item["uri"], item.get("version"))]
+        if method == "textDocument/didChange":
+            identifier = params["textDocument"]
+            document = self.documents[identifier["uri"]]
+            for change in params["contentChanges"]:
+                _apply(document, change)
+            return None, [self._publish(identifier["uri"], identifier.get("version"))]
+        if method == "textDocument/didClose":
+            uri = params["textDocument"]["uri"]
+            self.documents.pop(uri, None)
+            return None, [_diagnostics(uri, None, [])]
+        if method is None or method.startswith("$/") or method == "initialized":
+            return None, []
+        return _UNKNOWN_METHOD, []
+
+    def _visitors_for(self, uri: str) -> list[type[BaseVisitor]]:
+        if self.selection is None:
+            return self.visitors
+        codes = self.selection.enabled_for(_path(uri))
+        visitors = self._selected_visitors.get(codes)
+        if visitors is None:
+            visitors = load_visitors(codes, self.config.blank_line_rules)
+            self._selected_visitors[codes] = visitors
+        return visitors
+
+    @property
+    def _noqa(self) -> bool:
+        return self.selection is None or not self.selection.disable_noqa
+
+    def _problems(self, document: Document) -> list[Result]:
+        # Like the runner, files with a `# flake8: noqa` line are not checked at all.
+        if self._noqa and is_file_ignored(document.lines):
+            return []
+        return document.problems()
+
+    def _publish(self, uri: str, version: Optional[int]) -> dict[str, Any]:
+        document = self.documents[uri]
+        lines = document.lines
+        diagnostics = []
+        for line_number, col_offset, message in self._problems(document):
+            line = lines[line_number - 1] if line_number <= len(lines) else ""
+            content = line.rstrip("\r\n")
+            start = {"line": line_number - 1, "character": _character(line, col_offset)}
+            end = {"line": line_number - 1, "character": _utf16_length(content)}
+            code, _, text = message.partition(" ")
+            diagnostics.append(
+                {
+                    "range": {"start": start, "end": end},
+                    "severity": WARNING,
+                    "code": code,
+                    "source": "flake8-plus",
+                    "message": text,
+                }
+            )
+        return _diagnostics(uri, version, diagnostics)
+
+
+def _path(uri: str) -> str:
+    # The path of the file of a `file:` URI, or the URI itself for other schemes,
+    # such as those of unsaved documents.
+    parsed = urllib.parse.urlparse(uri)
+    if parsed.scheme != "file":
+        return uri
+    return urllib.request.url2pathname(urllib.parse.unquote(parsed.path))
+
+
+def _shift(results: list[Result], lines: int) -> list[Result]:
+    return [(line + lines, col, message) for line, col, message in results]
+
+
+def _split_lines(text: str) -> list[str]:
+    # Only line feeds and carriage returns end lines, in Python and the protocol alike.
+    return io.StringIO(text, newline="").readlines()
+
+
+def _apply(document: Document, change: dict[str, Any]) -> None:
+    if "range" not in change:
+        document.replace(change["text"])
+        return
+    lines = document.lines
+    positions = []
+    for key in ("start", "end"):
+        position = change["range"][key]
+        line_number = position["line"]
+        line = lines[line_number] if line_number < len(lines) else ""
+        positions.append((line_number, _index(line, position["character"])))
+    document.change(positions[0], positions[1], change["text"])
+
+
+def _index(line: str, character: int) -> int:
+    # Convert a column in UTF-16 code units, as positions are given by default, to an
+    # index in a line. Columns past the end of the line refer to its end.
+    content = line.rstrip("\r\n")
+    if content.isascii():
+        return min(character, len(content))
+    units = 0
+    for index, char in enumerate(content):
+        if units >= character:
+            return index
+        units += 2 if ord(char) > 0xFFFF else 1
+    return len(content)
+
+
+def _character(line: str, col_offset: int) -> int:
+    # Convert a column offset in UTF-8 bytes, as given by `ast`, to UTF-16 code units.
+    if line.isascii():
+        return col_offset
+    return _utf16_length(line.encode()[:col_offset].decode(errors="ignore"))
+
+
+def _utf16_length(text: str) -> int:
+    return len(text.encode("utf-16-le")) // 2
+
+
+def _diagnostics(
+    uri: str, version: Optional[int], diagnostics: list[dict[str, Any]]
+) -> dict[str, Any]:
+    params: dict[str, Any] = {"uri": uri, "diagnostics": diagnostics}
+    if version is not None:
+        params["version"] = version
+    return {
+        "jsonrpc": "2.0",
+        "method": "textDocument/publishDiagnostics",
+        "params": params,
+    }
+
+
+def _error(request_id: Any, code: int, message: str) -> dict[str, Any]:
+    error = {"code": code, "message": message}
+    return {"jsonrpc": "2.0", "id": request_id, "error": error}
+
+
+def _read_message(reader: BinaryIO) -> Optional[dict[str, Any]]:
+    length = None
+    while True:
+        header = reader.readline()
+        if not header:
+            return None
+        if not header.strip():
+            break
+        name, _, value = header.decode("ascii").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    if length is None:
+        raise ValueError("missing Content-Length header")
+    return json.loads(reader.read(length))
+
+
+def _write_message(writer: BinaryIO, message: dict[str, Any]) -> None:
+    body = json.dumps(message, separators=(",", ":")).encode()
+    writer.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+    writer.flush()
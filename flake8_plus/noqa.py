@@ -0,0 +1,218 @@
+"""
+Suppression of problems by `# noqa` comments, like flake8 does.
+
+Flake8 does not check files with a line starting with `# flake8: noqa` at all, and
+drops the problems reported on lines with a `# noqa` comment, either blanket or
+naming the code of the problem. A comment after a multi-line string, or after lines
+continued with backslashes, applies to all of their physical lines. The standalone
+tools apply the same comments, so they report the same problems as the plugin run by
+flake8.
+"""
+import bisect
+import functools
+import operator
+import re
+import tokenize
+from array import array
+from typing import Callable, Iterable, Iterator, TypeVar, Union
+
+from flake8 import defaults, utils
+
+from .line_index import Buffer
+from .problem import Problem
+
+# Searching for the comment itself is much faster than matching `NOQA_FILE` at the
+# start of every line, which is only done once the comment is found.
+_FILE_NOQA = re.compile(r"# flake8[:=]\s*noqa", re.IGNORECASE)
+_FILE_NOQA_BYTES = re.compile(rb"# flake8[:=]\s*noqa", re.IGNORECASE)
+_FILE_NOQA_LINE_BYTES = re.compile(
+    rb"^" + defaults.NOQA_FILE.pattern.encode("ascii"), re.IGNORECASE | re.MULTILINE
+)
+_INLINE_NOQA = re.compile(r"# noqa", re.IGNORECASE)
+_INLINE_NOQA_BYTES = re.compile(rb"# noqa", re.IGNORECASE)
+_SKIPPED_TOKENS = (tokenize.ENCODING, tokenize.ENDMARKER, tokenize.DEDENT)
+_CODE = operator.attrgetter("code")
+_LINE = operator.itemgetter(0)
+
+_T = TypeVar("_T")
+
+
+def is_file_ignored(source: Union[list[str], Buffer]) -> bool:
+    """
+    Return whether flake8 would skip source code because of a `# flake8: noqa` line.
+
+    Args:
+        source (Union[list[str], Buffer]): The physical lines, or the encoded source
+            code.
+
+    Returns:
+        bool: Whether the source code is not checked at all.
+    """
+    if isinstance(source, list):
+        return _FILE_NOQA.search("".join(source)) is not None and any(
+            defaults.NOQA_FILE.match(line) for line in source
+        )
+    return (
+        _FILE_NOQA_BYTES.search(source) is not None
+        and _FILE_NOQA_LINE_BYTES.search(source) is not None
+    )
+
+
+def filter_noqa(
+    problems: Iterable[Problem], source: Union[list[str], Buffer]
+) -> Iterator[Problem]:
+    """
+    Drop the problems on lines with a `# noqa` comment for them.
+
+    The comments are only looked for once the first problem is found, so checking
+    source code without problems costs nothing more.
+
+    Args:
+        problems (Iterable[Problem]): The problems found in the source code.
+        source (Union[list[str], Buffer]): The physical lines, or the encoded source
+            code.
+
+    Returns:
+        Iterator[Problem]: The problems not suppressed, in the order given.
+    """
+    return _filter(problems, source, lambda problem: problem.line_number, _CODE)
+
+
+def filter_noqa_results(
+    results: Iterable[tuple[int, int, str]], source: Union[list[str], Buffer]
+) -> Iterator[tuple[int, int, str]]:
+    """
+    Drop the results on lines with a `# noqa` comment for them.
+
+    Like `filter_noqa`, for results already formatted as (line number, column offset,
+    message prefixed with the code) tuples.
+
+    Args:
+        results (Iterable[tuple[int, int, str]]): The results found in the source
+            code.
+        source (Union[list[str], Buffer]): The physical lines, or the encoded source
+            code.
+
+    Returns:
+        Iterator[tuple[int, int, str]]: The results not suppressed, in the order given.
+    """
+    return _filter(results, source, _LINE, _message_code)
+
+
+def _filter(
+    items: Iterable[_T],
+    source: Union[list[str], Buffer],
+    line: Callable[[_T], int],
+    code: Callable[[_T], str],
+) -> Iterator[_T]:
+    comments = None
+    for item in items:
+        if comments is None:
+            comments = _noqa_lines(source)
+        text = comments.get(line(item))
+        if text is None or not _is_ignored(code(item), text):
+            yield item
+
+
+def _message_code(result: tuple[int, int, str]) -> str:
+    return result[2].partition(" ")[0]
+
+
+def _is_ignored(code: str, text: str) -> bool:
+    # Like `flake8.violation.Violation.is_inline_ignored`.
+    match = defaults.NOQA_INLINE_REGEXP.search(text)
+    if match is None:
+        return False
+    codes = match.group("codes")
+    if codes is None:
+        return True
+    names = tuple(utils.parse_comma_separated_list(codes))
+    return code in names or code.startswith(names)
+
+
+def _noqa_lines(source: Union[list[str], Buffer]) -> dict[int, str]:
+    # Map each physical line of the lines joined by the tokenizer holding a noqa
+    # comment to their text, like `flake8.processor.FileProcessor` does for all lines.
+    if isinstance(source, list):
+        if _INLINE_NOQA.search("".join(source)) is None:
+            return {}
+        noqa = [n for n, line in enumerate(source, 1) if _INLINE_NOQA.search(line)]
+        readline = functools.partial(next, iter(source), "")
+        ranges = _logical_lines(tokenize.generate_tokens(readline))
+        return _map_lines(noqa, ranges, lambda first, last: source[first - 1 : last])
+    if _INLINE_NOQA_BYTES.search(source) is None:
+        return {}
+    reader = _BufferReader(source)
+    encoding, _ = tokenize.detect_encoding(_BufferReader(source).readline)
+    ranges = _logical_lines(tokenize.tokenize(reader.readline))
+    starts = reader.read_starts()
+    noqa = sorted(
+        {
+            bisect.bisect_right(starts, match.start())
+            for match in _INLINE_NOQA_BYTES.finditer(source)
+        }
+    )
+    return _map_lines(
+        noqa,
+        ranges,
+        lambda first, last: [
+            source[starts[first - 1] : starts[last]].decode(encoding, "replace")
+        ],
+    )
+
+
+def _map_lines(
+    noqa: list[int],
+    ranges: list[tuple[int, int]],
+    get_lines: Callable[[int, int], list[str]],
+) -> dict[int, str]:
+    firsts = [first for first, _ in ranges]
+    mapping = {}
+    for number in noqa:
+        index = bisect.bisect_right(firsts, number) - 1
+        first, last = number, number
+        if index >= 0 and ranges[index][1] >= number:
+            first, last = ranges[index]
+        text = "".join(get_lines(first, last))
+        mapping.update(dict.fromkeys(range(first, last + 1), text))
+    return mapping
+
+
+def _logical_lines(tokens: Iterator[tokenize.TokenInfo]) -> list[tuple[int, int]]:
+    # The first and last physical line of the lines ending with each NEWLINE or NL
+    # token. Flake8 maps every line to itself if the tokenizer fails.
+    ranges = []
+    first, last = None, 0
+    try:
+        for token in tokens:
+            if token.type in _SKIPPED_TOKENS:
+                continue
+            first = token.start[0] if first is None else first
+            last = max(last, token.end[0])
+            if token.type in (tokenize.NL, tokenize.NEWLINE):
+                ranges.append((first, last))
+                first = None
+    except (tokenize.TokenError, SyntaxError):
+        return []
+    return ranges
+
+
+class _BufferReader:
+    """Reader of the lines of a buffer, recording where each line starts."""
+
+    def __init__(self, buffer: Buffer):
+        self._buffer = buffer
+        self._starts = array("Q", [0])
+
+    def readline(self) -> Union[bytes, bytearray]:
+        start = self._starts[-1]
+        end = self._buffer.find(b"\n", start) + 1 or len(self._buffer)
+        if end > start:
+            self._starts.append(end)
+        return self._buffer[start:end]
+
+    def read_starts(self) -> array:
+        # Reads the lines the tokenizer did not, if it stopped early.
+        while self.readline():
+            pass
+        return self._starts
@@ -1,40 +1,60 @@
 """The flake8-plus plugin."""
 # pylint: disable=too-few-public-methods
 import ast
+import functools
+import time
 from argparse import Namespace
-from typing import Any, Generator, Type
-
-from flake8.options.manager import OptionManager
+from typing import TYPE_CHECKING, Any, Generator, Iterator, Optional, Type
 
 from . import defaults
+from .checker import iter_check, load_visitors, rule_codes
 from .config import Config
 from .version import VERSION
-from .visitors.plu001_visitor import PLU001Visitor
-from .visitors.plu002_visitor import PLU002Visitor
-from .visitors.plu003_visitor import PLU003Visitor
+
+if TYPE_CHECKING:  # pragma: no cover
+    from flake8.options.manager import OptionManager
+
+    from .cache import Result, ResultCache
+    from .selection import RuleSelection
+    from .slow_files import SlowFileDetector
+    from .statistics import FileStatistics, StatisticsCollector
+    from .visitors.base_visitor import BaseVisitor
+
+# The number of lines from which the results of the toplevel definitions of a file are
+# cached too, see `definitions.check_definitions`. In smaller files, reusing them
+# saves too little time to be worth looking them up.
+DEFINITIONS_MIN_LINES = 1000
 
 
 class Plugin:
-    """Flake8-plus plugin."""
+    """
+    Flake8-plus plugin.
+
+    Importing the plugin is kept cheap, since flake8 imports it in every process: the
+    cache and statistics modules are only imported when enabled, and the visitors only
+    once the first file is checked. Only the visitors of the rules flake8 reports for
+    a file are run.
+    """
 
     name = "flake8-plus"
     version = VERSION
-    visitors = [
-        PLU001Visitor,
-        PLU002Visitor,
-        PLU003Visitor,
-    ]
+    selection: Optional["RuleSelection"] = None
+    cache: Optional["ResultCache"] = None
+    statistics: Optional["StatisticsCollector"] = None
+    slow_files: Optional["SlowFileDetector"] = None
 
-    def __init__(self, tree: ast.AST, lines: list[str]):
+    def __init__(self, tree: ast.AST, lines: list[str], filename: str = "stdin"):
         """
         Initialize a Plugin instance.
 
         Args:
             tree (ast.AST): The abstract syntax tree.
             lines (list[str]): The physical lines.
+            filename (str): The name of the file being checked.
         """
         self._tree = tree
         self._lines = lines
+        self._filename = filename
 
     def run(self) -> Generator[tuple[int, int, str, Type[Any]], None, None]:
         """
@@ -44,14 +64,98 @@ class Plugin:
             Generator[tuple[int, int, str, Type[Any]], None, None]: Generator of
             problems found.
         """
-        for cls in Plugin.visitors:
-            visitor = cls(self._lines, Plugin.config)
-            visitor.visit(self._tree)
-            for p in visitor.problems:
-                yield p.line_number, p.col_offset, p.message_with_code, type(self)
+        if Plugin.selection is None:
+            codes = rule_codes(Plugin.config)
+        else:
+            codes = Plugin.selection.enabled_for(self._filename)
+            if not codes:
+                return
+        start = time.perf_counter()
+        cache = Plugin.cache
+        if cache is None:
+            results: Iterator["Result"] = self._check(codes)
+        else:
+            key = cache.key(self._lines, Plugin.config, codes)
+            cached = cache.get(key)
+            if cached is None:
+                if len(self._lines) < DEFINITIONS_MIN_LINES:
+                    cached = list(self._check(codes))
+                else:
+                    cached = self._check_definitions(codes, cache)
+                cache.put(key, cached)
+            elif Plugin.statistics is not None:
+                file_statistics = _file_statistics(self._filename)
+                file_statistics.cached = True
+                Plugin.statistics.record(file_statistics)
+            results = iter(cached)
+        if Plugin.slow_files is not None:
+            results = self._detect_slow_file(results, codes, start)
+        for line_number, col_offset, message in results:
+            yield line_number, col_offset, message, type(self)
+
+    def _check(self, codes: frozenset[str]) -> Iterator["Result"]:
+        statistics = Plugin.statistics
+        file_statistics = None
+        if statistics is not None:
+            file_statistics = _file_statistics(self._filename)
+        visitors = _load_visitors(codes, Plugin.config.blank_line_rules)
+        problems = iter_check(
+            self._lines, Plugin.config, self._tree, visitors, file_statistics
+        )
+        for p in problems:
+            yield p.line_number, p.col_offset, p.message_with_code
+        if statistics is not None and file_statistics is not None:
+            statistics.record(file_statistics)
+
+    def _detect_slow_file(
+        self, results: Iterator["Result"], codes: frozenset[str], start: float
+    ) -> Iterator["Result"]:
+        # The results are collected first, so the time taken to check the file is
+        # known before they are reported.
+        detector = Plugin.slow_files
+        assert detector is not None  # nosec
+        collected = list(results)
+        seconds = time.perf_counter() - start
+        if seconds > detector.threshold:
+            visitors = _load_visitors(codes, Plugin.config.blank_line_rules)
+            detector.profile(
+                self._filename,
+                self._lines,
+                Plugin.config,
+                self._tree,
+                visitors,
+                seconds,
+            )
+        return iter(collected)
+
+    def _check_definitions(
+        self, codes: frozenset[str], cache: "ResultCache"
+    ) -> list["Result"]:
+        # Large files missing from the cache are usually edited versions of cached
+        # files, so the problems of their unchanged definitions are looked up too.
+        # pylint: disable=import-outside-toplevel
+        from .definitions import check_definitions
+
+        statistics = Plugin.statistics
+        file_statistics = None
+        if statistics is not None:
+            file_statistics = _file_statistics(self._filename)
+        visitors = _load_visitors(codes, Plugin.config.blank_line_rules)
+        results = check_definitions(
+            self._lines,
+            Plugin.config,
+            self._tree,  # type: ignore
+            visitors,
+            cache,
+            codes,
+            file_statistics,
+        )
+        if statistics is not None and file_statistics is not None:
+            statistics.record(file_statistics)
+        return results
 
     @staticmethod
-    def add_options(option_manager: OptionManager) -> None:  # pragma: no cover
+    def add_options(option_manager: "OptionManager") -> None:  # pragma: no cover
         """Add custom configuration option(s) to flake8."""
         option_manager.add_option(
             "--blanks-before-imports",
@@ -82,6 +186,71 @@ class Plugin:
             help="Expected number of blank lines before except. (Default: %(default)s)",
         )
 
+        option_manager.add_option(
+            "--blank-line-rules",
+            metavar="rules",
+            default=defaults.BLANK_LINE_RULES,
+            parse_from_config=True,
+            help="Additional rules checking the number of blank lines before nodes, "
+            "separated by commas, each given as <code>:<node types>[:<predicate>...]="
+            "<blank lines>, for example PLU100:Raise=1. (Default: no rules)",
+        )
+
+        option_manager.add_option(
+            "--plus-cache-dir",
+            metavar="path",
+            default=None,
+            parse_from_config=True,
+            help="Cache flake8-plus results in this folder, so unchanged files are not "
+            "checked again. (Default: no caching)",
+        )
+
+        option_manager.add_option(
+            "--plus-cache-max-entries",
+            type=int,
+            metavar="n",
+            default=defaults.CACHE_MAX_ENTRIES,
+            parse_from_config=True,
+            help="Maximum number of results to keep in the flake8-plus cache. The "
+            "least recently used results are evicted first. (Default: %(default)s)",
+        )
+
+        option_manager.add_option(
+            "--plus-statistics",
+            action="store_true",
+            parse_from_config=True,
+            help="Print a summary of the time spent, nodes visited, blank line queries "
+            "and problems found by each flake8-plus visitor at the end of the run.",
+        )
+
+        option_manager.add_option(
+            "--plus-statistics-file",
+            metavar="path",
+            default=None,
+            parse_from_config=True,
+            help="Write per-file and summarized flake8-plus statistics to this file as "
+            "JSON at the end of the run.",
+        )
+
+        option_manager.add_option(
+            "--plus-slow-file-threshold",
+            type=float,
+            metavar="seconds",
+            default=None,
+            parse_from_config=True,
+            help="Profile the files flake8-plus takes longer than this to check, and "
+            "list the slowest at the end of the run. (Default: disabled)",
+        )
+
+        option_manager.add_option(
+            "--plus-slow-file-dir",
+            metavar="path",
+            default=defaults.SLOW_FILE_DIR,
+            parse_from_config=True,
+            help="Write the profiles and reports of slow files to this folder. "
+            "(Default: %(default)s)",
+        )
+
     @classmethod
     def parse_options(cls, options: Namespace) -> None:  # pragma: no cover
         """Parse the custom configuration options given to flake8."""
@@ -89,4 +258,43 @@ class Plugin:
             options.blanks_before_imports,
             options.blanks_before_return,
             options.blanks_before_except,
+            options.blank_line_rules,
         )
+        # pylint: disable=import-outside-toplevel
+        from .selection import RuleSelection
+
+        cls.selection = RuleSelection(options, rule_codes(cls.config))
+        cls.cache = None
+        if options.plus_cache_dir:
+            from .cache import ResultCache
+
+            cls.cache = ResultCache(
+                options.plus_cache_dir, options.plus_cache_max_entries
+            )
+        cls.statistics = None
+        if options.plus_statistics or options.plus_statistics_file:
+            from .statistics import StatisticsCollector
+
+            cls.statistics = StatisticsCollector.setup(
+                options.plus_statistics, options.plus_statistics_file
+            )
+        cls.slow_files = None
+        if options.plus_slow_file_threshold is not None:
+            from .slow_files import SlowFileDetector
+
+            cls.slow_files = SlowFileDetector.setup(
+                options.plus_slow_file_threshold, options.plus_slow_file_dir
+            )
+
+
+@functools.cache
+def _load_visitors(codes: frozenset[str], rules: str) -> list[type["BaseVisitor"]]:
+    return load_visitors(codes, rules)
+
+
+def _file_statistics(filename: str) -> "FileStatistics":
+    # pylint: disable=import-outside-toplevel
+    from .statistics import FileStatistics
+
+    statistics = FileStatistics(filename)
+    return statistics
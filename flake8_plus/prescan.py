@@ -0,0 +1,48 @@
+"""
+Prescan of the raw source code, skipping visitors that cannot find any problem.
+
+Most rules only check nodes introduced by a keyword, such as `return` statements or
+`except` clauses, and these nodes cannot occur in source code without the keyword.
+Searching the source code for the keywords of each visitor (see
+`BaseVisitor.keywords`) is much cheaper than walking the tree, so visitors whose
+keywords do not occur anywhere are not run at all. The search is deliberately crude:
+keywords in comments, strings or longer names count as occurrences too, so a visitor
+may be run needlessly, but never skipped when it could find a problem.
+"""
+from typing import Sequence, Union
+
+from .line_index import Buffer
+from .visitors.base_visitor import BaseVisitor
+
+
+def prescan(
+    source: Union[list[str], Buffer], visitors: Sequence[type[BaseVisitor]]
+) -> tuple[list[type[BaseVisitor]], list[type[BaseVisitor]]]:
+    """
+    Split visitors into those that may find problems in source code and the others.
+
+    Args:
+        source (Union[list[str], Buffer]): The physical lines, or the encoded source
+            code.
+        visitors (Sequence[type[BaseVisitor]]): The visitor classes.
+
+    Returns:
+        tuple[list[type[BaseVisitor]], list[type[BaseVisitor]]]: The visitors to run,
+        and the visitors that cannot find any problem, both in the order given.
+    """
+    words = {word for visitor in visitors for word in visitor.keywords or ()}
+    found: set[str] = set()
+    if words and isinstance(source, list):
+        text = "".join(source)
+        found = {word for word in words if word in text}
+    elif words:
+        # Source encodings are ASCII compatible, so keywords are found as bytes.
+        found = {word for word in words if source.find(word.encode("ascii")) != -1}
+    run = []
+    skipped = []
+    for visitor in visitors:
+        if visitor.keywords is None or not found.isdisjoint(visitor.keywords):
+            run.append(visitor)
+        else:
+            skipped.append(visitor)
+    return run, skipped
@@ -1,27 +1,56 @@
 """Problem class."""
 # pylint: disable=too-few-public-methods
+from typing import ClassVar
+
+_MESSAGES: dict[tuple[type, int, int], str] = {}
 
 
 class Problem:
-    """Problem class."""
+    """
+    Problem class.
+
+    Problems are slotted and only hold their position and blank line counts. The
+    message is formatted when it is first requested, and the formatted message is
+    shared by all problems of the same class with the same counts.
+    """
+
+    __slots__ = ("line_number", "col_offset", "blanks_actual", "blanks_expected")
 
-    code: str
+    code: ClassVar[str]
+    format_: ClassVar[str]
 
-    def __init__(self, line_number: int, col_offset: int, message: str):
+    def __init__(
+        self,
+        line_number: int,
+        col_offset: int,
+        blanks_actual: int,
+        blanks_expected: int,
+    ):
         """
         Initialize a `Problem` instance.
 
         Args:
             line_number (int): The line number.
             col_offset (int): The column offset.
-            message (str): The message.
+            blanks_actual (int): Number of actual blanks.
+            blanks_expected (int): Number of expected blanks.
         """
         self.line_number = line_number
         self.col_offset = col_offset
-        self.message = message
+        self.blanks_actual = blanks_actual
+        self.blanks_expected = blanks_expected
+
+    @property
+    def message(self) -> str:
+        """Return the problem message."""
+        return self.message_with_code[len(self.code) + 1 :]
 
     @property
     def message_with_code(self) -> str:
         """Return the problem message prefixed with with the problem code."""
-        code = type(self).code
-        return f"{code} {self.message}"
+        key = (type(self), self.blanks_expected, self.blanks_actual)
+        message = _MESSAGES.get(key)
+        if message is None:
+            text = self.format_.format(self.blanks_expected, self.blanks_actual)
+            message = _MESSAGES[key] = f"{self.code} {text}"
+        return message
@@ -0,0 +1,110 @@
+"""
+Parsing of the blank line rules configured with the `blank-line-rules` option.
+
+Each rule is written as `<code>:<node types>[:<predicate>...]=<blank lines>`, where the
+node types are `ast` class names separated by `|`, and the predicates are names from
+`PREDICATES`. Rules are separated by commas or newlines. For example, the following
+expects one blank line before `raise` statements and no blank lines before nested
+`with` statements::
+
+    blank-line-rules =
+        PLU100:Raise=1
+        PLU101:With|AsyncWith:nested=0
+
+Codes from PLU100 up are reserved for configured rules, so they never clash with the
+codes of the rules built into the plugin.
+"""
+import ast
+import re
+from functools import cache
+
+from .exceptions import RuleError
+from .problem import Problem
+from .visitors.rule_visitor import PREDICATES, RuleSpec, RuleVisitor
+
+_RULE = re.compile(
+    r"(?P<code>\w+):(?P<types>[\w|]+)(?P<predicates>(?::\w+)*)=(?P<n>\d+)"
+)
+_CODE = re.compile(r"PLU[1-9][0-9]{2}")
+
+
+@cache
+def parse_rules(text: str) -> tuple[RuleSpec, ...]:
+    """
+    Parse the specification of configured blank line rules.
+
+    Args:
+        text (str): The rules, as given to the `blank-line-rules` option.
+
+    Raises:
+        RuleError: If a rule is invalid, or two rules have the same code.
+
+    Returns:
+        tuple[RuleSpec, ...]: The rules, in the order given.
+    """
+    rules: list[RuleSpec] = []
+    codes: set[str] = set()
+    for entry in re.split(r"[,\n]", text):
+        entry = "".join(entry.split())
+        if not entry:
+            continue
+        match = _RULE.fullmatch(entry)
+        if match is None:
+            raise RuleError(
+                f"invalid blank line rule {entry!r}, expected "
+                "<code>:<node types>[:<predicate>...]=<blank lines>"
+            )
+        code = match["code"]
+        if not _CODE.fullmatch(code):
+            raise RuleError(f"invalid code {code!r}, expected PLU100 to PLU999")
+        if code in codes:
+            raise RuleError(f"duplicate blank line rule {code}")
+        codes.add(code)
+        names = match["types"].split("|")
+        predicates = tuple(name for name in match["predicates"].split(":") if name)
+        for name in predicates:
+            if name not in PREDICATES:
+                raise RuleError(
+                    f"unknown predicate {name!r} in {code}, expected one of "
+                    f"{', '.join(PREDICATES)}"
+                )
+        format_ = f"expected {{}} blank lines before {' or '.join(names)}, found {{}}"
+        rules.append(
+            RuleSpec(
+                _problem_class(code, format_),
+                tuple(_node_type(code, name) for name in names),
+                int(match["n"]),
+                predicates,
+            )
+        )
+    return tuple(rules)
+
+
+@cache
+def compile_rules(rules: tuple[RuleSpec, ...]) -> type[RuleVisitor]:
+    """
+    Compile configured blank line rules into a single visitor.
+
+    Args:
+        rules (tuple[RuleSpec, ...]): The rules.
+
+    Returns:
+        type[RuleVisitor]: The visitor checking all the rules.
+    """
+    namespace = {"__doc__": "Visitor class for the configured rules.", "rules": rules}
+    return type("ConfiguredRulesVisitor", (RuleVisitor,), namespace)
+
+
+@cache
+def _problem_class(code: str, format_: str) -> type[Problem]:
+    namespace = {"__slots__": (), "code": code, "format_": format_}
+    return type(f"{code}Problem", (Problem,), namespace)
+
+
+def _node_type(code: str, name: str) -> type[ast.AST]:
+    node_type = getattr(ast, name, None)
+    if not isinstance(node_type, type) or "lineno" not in getattr(
+        node_type, "_attributes", ()
+    ):
+        raise RuleError(f"invalid node type {name!r} in {code}")
+    return node_type
@@ -0,0 +1,580 @@
+"""Standalone runner checking files with the flake8-plus rules only."""
+import fnmatch
+import io
+import itertools
+import json
+import mmap
+import os
+import re
+import time
+import tokenize
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    as_completed,
+    wait,
+)
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from .checker import iter_check, iter_check_buffer, load_visitors
+from .config import Config
+from .diff import LineRanges
+from .line_index import Buffer
+from .noqa import filter_noqa, is_file_ignored
+from .problem import Problem
+from .visitors.base_visitor import BaseVisitor
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .selection import RuleSelection
+
+DEFAULT_EXCLUDE = (
+    ".svn",
+    "CVS",
+    ".bzr",
+    ".hg",
+    ".git",
+    "__pycache__",
+    ".tox",
+    ".nox",
+    ".eggs",
+    "*.egg",
+)
+CHUNKS_PER_JOB = 8
+MAX_CHUNK_FILES = 64
+MMAP_THRESHOLD = 16 * 1024 * 1024
+
+_LONE_CARRIAGE_RETURN = re.compile(rb"\r(?!\n)")
+
+Result = tuple[int, int, str]
+
+
+class FileResult(NamedTuple):
+    """The problems found in a file, and the seconds it took if it was timed."""
+
+    path: str
+    problems: list[Result]
+    seconds: float = 0.0
+
+
+def discover_files(
+    paths: Iterable[str], exclude: Sequence[str] = DEFAULT_EXCLUDE
+) -> list[str]:
+    """
+    Find the Python files to check.
+
+    Folders are searched recursively for `*.py` files. Files given explicitly are
+    checked regardless of their extension. Exclude patterns are matched against both
+    the name and the absolute path of each file and folder, like flake8 does.
+
+    Args:
+        paths (Iterable[str]): Files and folders to check.
+        exclude (Sequence[str]): Patterns of files and folders to exclude.
+
+    Returns:
+        list[str]: The files to check, sorted.
+    """
+    files = set()
+    for path in paths:
+        if _is_excluded(path, exclude):
+            continue
+        if not os.path.isdir(path):
+            files.add(os.path.normpath(path))
+            continue
+        for folder, folder_names, file_names in os.walk(path):
+            folder_names[:] = sorted(
+                name
+                for name in folder_names
+                if not _is_excluded(os.path.join(folder, name), exclude)
+            )
+            files.update(
+                os.path.normpath(os.path.join(folder, name))
+                for name in file_names
+                if name.endswith(".py")
+                and not _is_excluded(os.path.join(folder, name), exclude)
+            )
+    return sorted(files)
+
+
+def check_file(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    path: str,
+    config: Config,
+    changed: Optional[LineRanges] = None,
+    mmap_threshold: int = MMAP_THRESHOLD,
+    max_problems: Optional[int] = None,
+    selection: Optional["RuleSelection"] = None,
+) -> FileResult:
+    """
+    Check a file.
+
+    Files that cannot be read or parsed are reported with the codes flake8 uses for
+    them, E902 and E999 respectively. Files of at least `mmap_threshold` bytes are
+    memory-mapped and checked without reading them into lines (see
+    `checker.check_buffer`), which keeps the memory used for huge generated files
+    close to the size of their abstract syntax tree. Like in flake8, files with a
+    `# flake8: noqa` line are not checked, and problems on lines with a `# noqa`
+    comment for them are not reported (see the `noqa` module).
+
+    Args:
+        path (str): The file to check.
+        config (Config): The plugin configuration.
+        changed (Optional[LineRanges]): If specified, only check and report problems
+            on these lines (see `checker.check`).
+        mmap_threshold (int): The size in bytes from which files are memory-mapped.
+        max_problems (Optional[int]): If specified, stop checking the file once this
+            many problems have been found, reporting the first ones in line order.
+        selection (Optional[RuleSelection]): If specified, only check the rules it
+            enables for the file, and apply `# noqa` comments unless it disables them.
+
+    Returns:
+        FileResult: The problems found.
+    """
+    try:
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if 0 < mmap_threshold <= size:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    # Lone carriage returns end lines for Python but not for the
+                    # index, so such files are read into lines instead.
+                    if _LONE_CARRIAGE_RETURN.search(buffer) is None:
+                        return _check(
+                            path,
+                            buffer,
+                            lambda visitors: iter_check_buffer(
+                                buffer, config, visitors, changed=changed
+                            ),
+                            config,
+                            max_problems,
+                            selection,
+                        )
+            data = file.read()
+    except OSError as error:
+        return FileResult(path, [(1, 0, f"E902 {type(error).__name__}: {error}")])
+    return check_source(path, data, config, changed, max_problems, selection)
+
+
+def check_source(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    path: str,
+    data: bytes,
+    config: Config,
+    changed: Optional[LineRanges] = None,
+    max_problems: Optional[int] = None,
+    selection: Optional["RuleSelection"] = None,
+) -> FileResult:
+    """
+    Check the contents of a file.
+
+    The contents are decoded like `tokenize.open` does, using the encoding declared
+    in the file, and checked like `check_file` does.
+
+    Args:
+        path (str): The file the contents were read from.
+        data (bytes): The contents of the file.
+        config (Config): The plugin configuration.
+        changed (Optional[LineRanges]): If specified, only check and report problems
+            on these lines (see `checker.check`).
+        max_problems (Optional[int]): If specified, stop checking once this many
+            problems have been found.
+        selection (Optional[RuleSelection]): If specified, only check the rules it
+            enables for the file, and apply `# noqa` comments unless it disables them.
+
+    Returns:
+        FileResult: The problems found.
+    """
+    try:
+        encoding, _ = tokenize.detect_encoding(io.BytesIO(data).readline)
+        lines = io.TextIOWrapper(io.BytesIO(data), encoding).readlines()
+    except (SyntaxError, UnicodeDecodeError) as error:
+        return FileResult(path, [(1, 0, f"E902 {type(error).__name__}: {error}")])
+    return _check(
+        path,
+        lines,
+        lambda visitors: iter_check(lines, config, visitors=visitors, changed=changed),
+        config,
+        max_problems,
+        selection,
+    )
+
+
+def check_files(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    paths: Sequence[str],
+    config: Config,
+    changed: Optional[dict[str, LineRanges]] = None,
+    mmap_threshold: int = MMAP_THRESHOLD,
+    max_problems: Optional[int] = None,
+    timed: bool = False,
+    selection: Optional["RuleSelection"] = None,
+) -> list[FileResult]:
+    """
+    Check several files.
+
+    Args:
+        paths (Sequence[str]): The files to check.
+        config (Config): The plugin configuration.
+        changed (Optional[dict[str, LineRanges]]): If specified, only check and
+            report problems on the changed lines of each file.
+        mmap_threshold (int): The size in bytes from which files are memory-mapped.
+        max_problems (Optional[int]): If specified, stop checking each file once
+            this many problems have been found in it.
+        timed (bool): Whether to measure the time it takes to check each file.
+        selection (Optional[RuleSelection]): If specified, only check the rules it
+            enables for each file (see `check_file`).
+
+    Returns:
+        list[FileResult]: The problems found in each file.
+    """
+    return [
+        _check_file(
+            path,
+            config,
+            None if changed is None else changed.get(path, LineRanges()),
+            mmap_threshold,
+            max_problems,
+            timed,
+            selection,
+        )
+        for path in paths
+    ]
+
+
+def check_sources(
+    sources: Sequence[tuple[str, bytes]],
+    config: Config,
+    selection: Optional["RuleSelection"] = None,
+) -> list[FileResult]:
+    """
+    Check the contents of several files.
+
+    Args:
+        sources (Sequence[tuple[str, bytes]]): The path and the contents of each file.
+        config (Config): The plugin configuration.
+        selection (Optional[RuleSelection]): If specified, only check the rules it
+            enables for each file (see `check_source`).
+
+    Returns:
+        list[FileResult]: The problems found in each file.
+    """
+    return [
+        check_source(path, data, config, selection=selection) for path, data in sources
+    ]
+
+
+def make_chunks(
+    paths: Sequence[str], jobs: int, sizes: Optional[Mapping[str, int]] = None
+) -> list[list[str]]:
+    """
+    Split files into chunks of roughly equal size for checking in parallel.
+
+    Files are sorted by size, largest first, and packed into chunks of at most the
+    total size divided by `CHUNKS_PER_JOB` times the number of jobs. Large files thus
+    get chunks of their own and are checked first, while small files are batched to
+    keep the overhead of inter-process communication low.
+
+    Args:
+        paths (Sequence[str]): The files to check.
+        jobs (int): The number of processes checking files.
+        sizes (Optional[Mapping[str, int]]): The size of each file. Defaults to the
+            sizes of the files on disk.
+
+    Returns:
+        list[list[str]]: The chunks, largest first.
+    """
+    if sizes is None:
+        sizes = {path: _size(path) for path in paths}
+    target = sum(sizes.values()) / max(jobs * CHUNKS_PER_JOB, 1)
+    chunks: list[list[str]] = []
+    chunk: list[str] = []
+    chunk_size = 0
+    for path in sorted(paths, key=lambda p: (-sizes[p], p)):
+        if chunk and (
+            chunk_size + sizes[path] > target or len(chunk) >= MAX_CHUNK_FILES
+        ):
+            chunks.append(chunk)
+            chunk, chunk_size = [], 0
+        chunk.append(path)
+        chunk_size += sizes[path]
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def run(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    paths: Sequence[str],
+    config: Config,
+    jobs: int,
+    changed: Optional[dict[str, LineRanges]] = None,
+    mmap_threshold: int = MMAP_THRESHOLD,
+    max_problems: Optional[int] = None,
+    timed: bool = False,
+    selection: Optional["RuleSelection"] = None,
+) -> Iterator[FileResult]:
+    """
+    Check files, in parallel if more than one job is requested.
+
+    Results are yielded as soon as a chunk of files has been checked, so the order
+    of the files depends on the order in which the chunks complete. If the consumer
+    stops early, the chunks not yet started are cancelled.
+
+    Args:
+        paths (Sequence[str]): The files to check.
+        config (Config): The plugin configuration.
+        jobs (int): The number of processes to check files in.
+        changed (Optional[dict[str, LineRanges]]): If specified, only check files with
+            changed lines, and only check and report problems on those lines.
+        mmap_threshold (int): The size in bytes from which files are memory-mapped.
+        max_problems (Optional[int]): If specified, stop checking each file once
+            this many problems have been found in it.
+        timed (bool): Whether to measure the time it takes to check each file, for
+            balancing shards in later runs (see `shard.split_files`).
+        selection (Optional[RuleSelection]): If specified, only check the rules it
+            enables for each file (see `check_file`).
+
+    Yields:
+        Iterator[FileResult]: The problems found in each file.
+    """
+    # pylint: disable=too-many-locals
+    if changed is not None:
+        changed = _changed_files(paths, changed)
+        paths = list(changed)
+    if jobs <= 1 or len(paths) <= 1:
+        for path in paths:
+            yield _check_file(
+                path,
+                config,
+                None if changed is None else changed[path],
+                mmap_threshold,
+                max_problems,
+                timed,
+                selection,
+            )
+        return
+    chunks = make_chunks(paths, jobs)
+    with ProcessPoolExecutor(min(jobs, len(chunks))) as executor:
+        pending: set[Future] = set()
+        for chunk in chunks:
+            chunk_changed = None if changed is None else {p: changed[p] for p in chunk}
+            pending.add(
+                executor.submit(
+                    check_files,
+                    chunk,
+                    config,
+                    chunk_changed,
+                    mmap_threshold,
+                    max_problems,
+                    timed,
+                    selection,
+                )
+            )
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+
+def run_sources(
+    sources: Mapping[str, bytes],
+    config: Config,
+    jobs: int,
+    selection: Optional["RuleSelection"] = None,
+) -> Iterator[FileResult]:
+    """
+    Check the contents of files, in parallel if more than one job is requested.
+
+    Like `run`, but the contents already read are checked, rather than the files on
+    disk, which may have changed since.
+
+    Args:
+        sources (Mapping[str, bytes]): The contents of each file, by path.
+        config (Config): The plugin configuration.
+        jobs (int): The number of processes to check files in.
+        selection (Optional[RuleSelection]): If specified, only check the rules it
+            enables for each file (see `check_source`).
+
+    Yields:
+        Iterator[FileResult]: The problems found in each file, in no particular order.
+    """
+    if jobs <= 1 or len(sources) <= 1:
+        for path, data in sources.items():
+            yield check_source(path, data, config, selection=selection)
+        return
+    sizes = {path: len(data) for path, data in sources.items()}
+    chunks = make_chunks(list(sources), jobs, sizes)
+    with ProcessPoolExecutor(min(jobs, len(chunks))) as executor:
+        futures = [
+            executor.submit(
+                check_sources,
+                [(path, sources[path]) for path in chunk],
+                config,
+                selection,
+            )
+            for chunk in chunks
+        ]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def format_text(result: FileResult) -> Iterator[str]:
+    """
+    Format the problems found in a file like flake8's default format.
+
+    Args:
+        result (FileResult): The problems found in a file.
+
+    Yields:
+        Iterator[str]: A line per problem.
+    """
+    for line, col, message in result.problems:
+        yield f"{result.path}:{line}:{col + 1}: {message}"
+
+
+def format_ndjson(result: FileResult) -> Iterator[str]:
+    """
+    Format the problems found in a file as newline delimited JSON.
+
+    Args:
+        result (FileResult): The problems found in a file.
+
+    Yields:
+        Iterator[str]: A JSON object per problem.
+    """
+    for line, col, message in result.problems:
+        code, _, text = message.partition(" ")
+        record = {
+            "path": result.path,
+            "line": line,
+            "column": col + 1,
+            "code": code,
+            "message": text,
+        }
+        yield json.dumps(record)
+
+
+def format_report(result: FileResult) -> Iterator[str]:
+    """
+    Format the problems found in a file as a shard report (see `shard.read_report`).
+
+    The problems are formatted like `format_ndjson` does, followed by a record of the
+    file with the number of problems found and the time it took to check it.
+
+    Args:
+        result (FileResult): The problems found in a file.
+
+    Yields:
+        Iterator[str]: A JSON object per problem, and one for the file.
+    """
+    yield from format_ndjson(result)
+    record = {
+        "file": result.path,
+        "problems": len(result.problems),
+        "seconds": result.seconds,
+    }
+    yield json.dumps(record)
+
+
+FORMATTERS = {"text": format_text, "ndjson": format_ndjson, "report": format_report}
+
+
+def split_patterns(value: Optional[str], base: Optional[Path] = None) -> list[str]:
+    """
+    Split a comma or whitespace separated list of exclude patterns.
+
+    Patterns containing a path separator are made absolute relative to `base`, like
+    flake8 does for patterns read from configuration files.
+
+    Args:
+        value (Optional[str]): The patterns.
+        base (Optional[Path]): The folder relative patterns are relative to.
+
+    Returns:
+        list[str]: The patterns.
+    """
+    patterns = []
+    for pattern in (value or "").replace(",", " ").split():
+        if "/" in pattern and base is not None:
+            pattern = os.path.abspath(base / pattern)
+        patterns.append(pattern.rstrip("/"))
+    return patterns
+
+
+def _check(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    path: str,
+    source: Union[list[str], Buffer],
+    check_: Callable[[Optional[list[type[BaseVisitor]]]], Iterator[Problem]],
+    config: Config,
+    max_problems: Optional[int],
+    selection: Optional["RuleSelection"],
+) -> FileResult:
+    noqa = selection is None or not selection.disable_noqa
+    if noqa and is_file_ignored(source):
+        return FileResult(path, [])
+    visitors = None
+    if selection is not None:
+        codes = selection.enabled_for(path)
+        visitors = load_visitors(codes, config.blank_line_rules)
+    try:
+        found = check_(visitors)
+        if noqa:
+            found = filter_noqa(found, source)
+        problems = list(itertools.islice(found, max_problems))
+    except SyntaxError as error:
+        message = f"E999 {type(error).__name__}: {error.msg}"
+        return FileResult(path, [(error.lineno or 1, (error.offset or 1) - 1, message)])
+    results = sorted(
+        (p.line_number, p.col_offset, p.message_with_code) for p in problems
+    )
+    return FileResult(path, results)
+
+
+def _changed_files(
+    paths: Sequence[str], changed: dict[str, LineRanges]
+) -> dict[str, LineRanges]:
+    # Diffs name files relative to the current folder.
+    relevant = {path: changed.get(os.path.relpath(path)) for path in paths}
+    return {path: ranges for path, ranges in relevant.items() if ranges}
+
+
+def _check_file(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    path: str,
+    config: Config,
+    changed: Optional[LineRanges],
+    mmap_threshold: int,
+    max_problems: Optional[int],
+    timed: bool,
+    selection: Optional["RuleSelection"],
+) -> FileResult:
+    args = (path, config, changed, mmap_threshold, max_problems, selection)
+    if not timed:
+        return check_file(*args)
+    start = time.perf_counter()
+    result = check_file(*args)
+    return result._replace(seconds=time.perf_counter() - start)
+
+
+def _is_excluded(path: str, exclude: Sequence[str]) -> bool:
+    name = os.path.basename(os.path.normpath(path))
+    absolute = os.path.abspath(path)
+    return any(
+        fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(absolute, pattern)
+        for pattern in exclude
+    )
+
+
+def _size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
@@ -0,0 +1,123 @@
+"""Resolution of the rules enabled by flake8's select and ignore options."""
+# pylint: disable=too-few-public-methods
+import copy
+import logging
+import os
+from argparse import Namespace
+from typing import Iterable, Mapping, Optional
+
+from flake8 import utils
+from flake8.style_guide import Decision, DecisionEngine
+
+LOG = logging.getLogger(__name__)
+
+# The code prefix the plugin is registered with, which flake8 selects by default.
+ENTRY_POINT = "PLU"
+
+# The configuration file options the selection is resolved from.
+CONFIG_OPTIONS = (
+    "select",
+    "ignore",
+    "extend_select",
+    "extend_ignore",
+    "per_file_ignores",
+    "disable_noqa",
+)
+
+# The values configparser reads as true, like flake8 does for boolean options.
+_TRUE = {"1", "yes", "true", "on"}
+
+
+class RuleSelection:
+    """
+    The rules flake8 reports, per file.
+
+    Flake8 drops the problems of rules disabled by `--select`, `--ignore` and their
+    `--extend-*` variants, or by `--per-file-ignores`, only after the plugin reported
+    them. The selection is resolved once from the same options, so the visitors of
+    disabled rules need not run at all. The standalone tools also honor
+    `--disable-noqa`, as they apply `# noqa` comments themselves.
+    """
+
+    def __init__(
+        self, options: Namespace, codes: Iterable[str], cwd: Optional[str] = None
+    ):
+        """
+        Initialize a `RuleSelection` instance.
+
+        Args:
+            options (Namespace): The options given to flake8.
+            codes (Iterable[str]): The codes of all the rules.
+            cwd (Optional[str]): The folder the patterns of `--per-file-ignores` are
+                relative to. Defaults to the current folder, like in flake8.
+        """
+        codes = sorted(codes)
+        self.enabled = _enabled(options, codes)
+        self.disable_noqa = bool(getattr(options, "disable_noqa", False))
+        self._per_file: list[tuple[str, frozenset[str]]] = []
+        for pattern, ignored in utils.parse_files_to_codes_mapping(
+            getattr(options, "per_file_ignores", "")
+        ):
+            file_options = copy.copy(options)
+            file_options.extend_ignore = list(options.extend_ignore or []) + ignored
+            enabled = _enabled(file_options, codes)
+            pattern = utils.normalize_path(pattern, cwd or os.curdir)
+            self._per_file.append((pattern, enabled))
+        # Like flake8, the longest matching pattern wins.
+        self._per_file.sort(key=lambda item: -len(item[0]))
+
+    @classmethod
+    def from_config(
+        cls, options: Mapping[str, str], codes: Iterable[str], cwd: Optional[str] = None
+    ) -> "RuleSelection":
+        """
+        Create a selection from the options in a flake8 configuration file.
+
+        Args:
+            options (Mapping[str, str]): The options, as read by
+                `config_files.read_config_file`. Only `CONFIG_OPTIONS` are used.
+            codes (Iterable[str]): The codes of all the rules.
+            cwd (Optional[str]): The folder the patterns of `per-file-ignores` are
+                relative to. Defaults to the current folder.
+
+        Returns:
+            RuleSelection: The selection.
+        """
+        namespace = Namespace(
+            extended_default_select=[ENTRY_POINT],
+            extended_default_ignore=[],
+            per_file_ignores=options.get("per_file_ignores", ""),
+            disable_noqa=options.get("disable_noqa", "").lower() in _TRUE,
+        )
+        for name in ["select", "ignore", "extend_select", "extend_ignore"]:
+            value = options.get(name)
+            parsed = None if value is None else utils.parse_comma_separated_list(value)
+            setattr(namespace, name, parsed)
+        return cls(namespace, codes, cwd)
+
+    def enabled_for(self, filename: str) -> frozenset[str]:
+        """
+        Return the codes of the rules reported for the specified file.
+
+        Args:
+            filename (str): The name of the file.
+
+        Returns:
+            frozenset[str]: The codes of the enabled rules.
+        """
+        for pattern, enabled in self._per_file:
+            if utils.matches_filename(
+                filename,
+                patterns=[pattern],
+                log_message=f"{pattern} does %(whether)smatch %(path)s",
+                logger=LOG,
+            ):
+                return enabled
+        return self.enabled
+
+
+def _enabled(options: Namespace, codes: Iterable[str]) -> frozenset[str]:
+    engine = DecisionEngine(options)
+    return frozenset(
+        code for code in codes if engine.decision_for(code) is Decision.Selected
+    )
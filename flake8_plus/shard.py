@@ -0,0 +1,213 @@
+"""
+Sharding of the files to check across machines, and merging of the shard reports.
+
+Every machine discovers the same files and splits them the same way (see
+`split_files`), checks its own shard and writes a report: newline delimited JSON with
+a record per problem, a record per file checked (see `runner.format_report`), and a
+summary record written once all files have been checked (see `format_summary`). The
+reports of all shards are then merged into one (see `merge_reports`), holding the same
+problems and files as a run checking all files at once.
+"""
+import heapq
+import json
+import os
+from typing import Iterable, NamedTuple, Optional, Sequence
+
+from .exceptions import ShardError
+from .runner import FileResult, Result
+
+
+class Shard(NamedTuple):
+    """A shard, numbered from 1 to the number of shards."""
+
+    number: int
+    total: int
+
+
+class Report(NamedTuple):
+    """The results of a shard, by file, sorted by path."""
+
+    shard: Shard
+    results: list[FileResult]
+
+
+def parse_shard(value: str) -> Shard:
+    """
+    Parse a shard given as `number/total`, for example `2/4`.
+
+    Args:
+        value (str): The shard.
+
+    Raises:
+        ShardError: If the shard is not of the form `number/total` with
+            `1 <= number <= total`.
+
+    Returns:
+        Shard: The shard.
+    """
+    number, _, total = value.partition("/")
+    try:
+        shard = Shard(int(number), int(total))
+    except ValueError:
+        raise ShardError(f"invalid shard {value!r}, expected number/total") from None
+    if not 1 <= shard.number <= shard.total:
+        raise ShardError(f"invalid shard {value!r}, expected 1 <= number <= total")
+    return shard
+
+
+def split_files(
+    paths: Sequence[str], total: int, timings: Optional[dict[str, float]] = None
+) -> list[list[str]]:
+    """
+    Split files into shards taking roughly the same time to check.
+
+    Files are weighted by the time it took to check them in a previous run, or by
+    their size. Files missing from the timings are weighted by their size times the
+    average time per byte of the files in them. The heaviest files are assigned first,
+    each to the lightest shard so far. The split only depends on the paths, the sizes
+    of the files and the timings, so every machine given the same files and timings
+    computes the same shards.
+
+    Args:
+        paths (Sequence[str]): The files to check.
+        total (int): The number of shards.
+        timings (Optional[dict[str, float]]): The seconds it took to check files in a
+            previous run (see `read_timings`).
+
+    Returns:
+        list[list[str]]: The files of each shard, sorted.
+    """
+    timings = timings or {}
+    sizes = {path: _size(path) for path in paths}
+    timed_bytes = sum(size for path, size in sizes.items() if path in timings)
+    timed_seconds = sum(timings[path] for path in sizes if path in timings)
+    rate = timed_seconds / timed_bytes if timed_seconds and timed_bytes else 1.0
+    weights = {path: timings.get(path, sizes[path] * rate) for path in paths}
+    loads = [(0.0, index) for index in range(total)]
+    shards: list[list[str]] = [[] for _ in range(total)]
+    for path in sorted(paths, key=lambda p: (-weights[p], p)):
+        load, index = heapq.heappop(loads)
+        shards[index].append(path)
+        heapq.heappush(loads, (load + weights[path], index))
+    return [sorted(shard) for shard in shards]
+
+
+def format_summary(shard: Shard, files: int, problems: int) -> str:
+    """
+    Format the summary record ending the report of a shard.
+
+    Args:
+        shard (Shard): The shard.
+        files (int): The number of files checked.
+        problems (int): The number of problems found.
+
+    Returns:
+        str: The JSON object.
+    """
+    record = {
+        "shard": shard.number,
+        "shards": shard.total,
+        "files": files,
+        "problems": problems,
+    }
+    return json.dumps(record)
+
+
+def read_report(path: str) -> Report:
+    """
+    Read the report of a shard.
+
+    Args:
+        path (str): The report file.
+
+    Raises:
+        ShardError: If the report cannot be read, or is incomplete.
+
+    Returns:
+        Report: The results of the shard.
+    """
+    problems: dict[str, list[Result]] = {}
+    seconds: dict[str, float] = {}
+    summary = None
+    try:
+        with open(path, encoding="utf-8") as file:
+            for record in map(json.loads, file):
+                if "line" in record:
+                    problems.setdefault(record["path"], []).append(_result(record))
+                elif "file" in record:
+                    seconds[record["file"]] = record["seconds"]
+                elif "shards" in record:
+                    summary = record
+    except (OSError, ValueError, KeyError) as error:
+        raise ShardError(f"cannot read report {path}: {error}") from None
+    if summary is None:
+        raise ShardError(f"report {path} is incomplete, the shard did not finish")
+    found = sum(len(file_problems) for file_problems in problems.values())
+    if summary["files"] != len(seconds) or summary["problems"] != found:
+        raise ShardError(f"report {path} does not match its summary")
+    results = [
+        FileResult(file, sorted(problems.get(file, [])), seconds[file])
+        for file in sorted(seconds)
+    ]
+    return Report(Shard(summary["shard"], summary["shards"]), results)
+
+
+def read_timings(paths: Iterable[str]) -> dict[str, float]:
+    """
+    Read the seconds it took to check each file from the reports of a previous run.
+
+    Args:
+        paths (Iterable[str]): The report files.
+
+    Returns:
+        dict[str, float]: The seconds it took to check each file, by path.
+    """
+    return {
+        result.path: result.seconds
+        for path in paths
+        for result in read_report(path).results
+    }
+
+
+def merge_reports(reports: Sequence[Report]) -> Report:
+    """
+    Merge the reports of all shards of a run into one.
+
+    Args:
+        reports (Sequence[Report]): The reports, in any order.
+
+    Raises:
+        ShardError: If reports are missing, duplicated, or overlap.
+
+    Returns:
+        Report: The results of all files, sorted by path, as shard 1/1.
+    """
+    totals = {report.shard.total for report in reports}
+    if len(totals) > 1:
+        raise ShardError(f"reports of runs split into {sorted(totals)} shards")
+    total = totals.pop() if totals else 0
+    numbers = [report.shard.number for report in reports]
+    missing = sorted(set(range(1, total + 1)) - set(numbers))
+    if missing:
+        raise ShardError(f"missing the reports of shards {missing} of {total}")
+    if len(numbers) > total:
+        raise ShardError(f"several reports of the same shard of {total}")
+    results = sorted(
+        (result for report in reports for result in report.results),
+        key=lambda result: result.path,
+    )
+    for previous, result in zip(results, results[1:]):
+        if previous.path == result.path:
+            raise ShardError(f"{result.path} was checked in more than one shard")
+    return Report(Shard(1, 1), results)
+
+
+def _result(record: dict) -> Result:
+    return record["line"], record["column"] - 1, f"{record['code']} {record['message']}"
+
+
+def _size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
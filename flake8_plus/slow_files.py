@@ -0,0 +1,194 @@
+"""Detection and profiling of files that take unusually long to check."""
+import ast
+import atexit
+import cProfile
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Optional, Sequence, TextIO
+
+from .checker import check
+from .config import Config
+from .statistics import FileStatistics
+from .visitors.base_visitor import BaseVisitor
+
+ENVIRONMENT_VARIABLE = "FLAKE8_PLUS_SLOW_FILES_RUN"
+TOP_OFFENDERS = 10
+
+
+class SlowFileDetector:
+    """
+    Detector of files taking longer than a threshold to check, in all processes.
+
+    Each file exceeding the threshold is checked again twice: once under `cProfile`,
+    and once with the visitors instrumented as for statistics, which would otherwise
+    clutter the profile with their wrappers. The profile is dumped to the report
+    folder in the `pstats` format, next to a JSON report holding the size of the file,
+    the number of nodes walked and the time spent by each visitor. Reports are tagged
+    with the run they belong to, so the process that set up the detector can report
+    the slowest files of the run when it exits, including those found by the
+    processes it started, such as the workers of `flake8 --jobs`.
+    """
+
+    def __init__(self, threshold: float, directory: Path, run: str):
+        """
+        Initialize a `SlowFileDetector` instance.
+
+        Args:
+            threshold (float): The time in seconds from which a file is slow.
+            directory (Path): The folder to write the reports to.
+            run (str): The identifier of the run.
+        """
+        self.threshold = threshold
+        self.directory = directory
+        self.run = run
+
+    @classmethod
+    def setup(
+        cls, threshold: float, directory: str, stream: TextIO = sys.stdout
+    ) -> "SlowFileDetector":
+        """
+        Set up a detector for the current process.
+
+        The first process to call this starts a run, and reports its slowest files
+        when it exits. Processes it starts inherit the run through an environment
+        variable.
+
+        Args:
+            threshold (float): The time in seconds from which a file is slow.
+            directory (str): The folder to write the reports to.
+            stream (TextIO): The stream to print the slowest files to at exit.
+
+        Returns:
+            SlowFileDetector: The detector.
+        """
+        existing = os.environ.get(ENVIRONMENT_VARIABLE)
+        if existing:
+            return cls(threshold, Path(directory), existing)
+        run = f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}"
+        os.environ[ENVIRONMENT_VARIABLE] = run
+        detector = cls(threshold, Path(directory), run)
+        atexit.register(detector.report, stream)
+        return detector
+
+    def profile(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        filename: str,
+        lines: list[str],
+        config: Config,
+        tree: Optional[ast.AST],
+        visitors: Sequence[type[BaseVisitor]],
+        seconds: float,
+    ) -> dict[str, Any]:
+        """
+        Check a slow file again under the profiler and write its report.
+
+        Args:
+            filename (str): The name of the file.
+            lines (list[str]): The physical lines.
+            config (Config): The plugin configuration.
+            tree (Optional[ast.AST]): The abstract syntax tree. Defaults to parsing the
+                lines.
+            visitors (Sequence[type[BaseVisitor]]): The visitors the file was checked
+                with.
+            seconds (float): The time it took to check the file.
+
+        Returns:
+            dict[str, Any]: The report.
+        """
+        if tree is None:
+            tree = ast.parse("".join(lines))
+        profiler = cProfile.Profile()
+        profiler.runcall(check, lines, config, tree, visitors)
+        statistics = FileStatistics(filename)
+        check(lines, config, tree, visitors, statistics)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        name = _report_name(filename)
+        profile_path = self.directory / f"{name}.pstats"
+        profiler.dump_stats(profile_path)
+        report = {
+            "run": self.run,
+            "filename": filename,
+            "seconds": seconds,
+            "size": sum(len(line.encode("utf-8", "surrogatepass")) for line in lines),
+            "lines": len(lines),
+            "nodes": statistics.nodes,
+            "profile": str(profile_path),
+            "rules": {key: rule.to_dict() for key, rule in statistics.rules.items()},
+        }
+        report_path = self.directory / f"{name}.json"
+        report_path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        return report
+
+    def load(self) -> list[dict[str, Any]]:
+        """
+        Load the reports of the slow files of the current run.
+
+        Returns:
+            list[dict[str, Any]]: The reports, slowest first.
+        """
+        reports = []
+        for path in self.directory.glob("*.json"):
+            try:
+                report = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            if isinstance(report, dict) and report.get("run") == self.run:
+                reports.append(report)
+        reports.sort(key=lambda report: (-report["seconds"], report["filename"]))
+        return reports
+
+    def report(self, stream: TextIO = sys.stdout) -> None:
+        """
+        Print the slowest files of the current run, if any, and end the run.
+
+        Args:
+            stream (TextIO): The stream to print to.
+        """
+        reports = self.load()
+        if reports:
+            stream.write(format_offenders(reports, self.threshold))
+            stream.write(f"Profiles and reports are in {self.directory}\n")
+        if os.environ.get(ENVIRONMENT_VARIABLE) == self.run:
+            del os.environ[ENVIRONMENT_VARIABLE]
+
+
+def format_offenders(
+    reports: list[dict[str, Any]], threshold: float, top: int = TOP_OFFENDERS
+) -> str:
+    """
+    Format the slowest files as a table.
+
+    Args:
+        reports (list[dict[str, Any]]): The reports of the slow files, slowest first.
+        threshold (float): The time in seconds from which a file is slow.
+        top (int): The maximum number of files to list.
+
+    Returns:
+        str: The table.
+    """
+    lines = [
+        f"flake8-plus: {len(reports)} files took more than {threshold:g} seconds to "
+        "check, the slowest:",
+        f"{'seconds':>9} {'bytes':>10} {'nodes':>10} {'slowest visitor':<28} file",
+    ]
+    for report in reports[:top]:
+        rules = report["rules"].items()
+        name, rule = max(rules, key=lambda item: item[1]["seconds"], default=("", {}))
+        slowest = f"{name} ({rule['seconds']:.3f})" if name else "-"
+        lines.append(
+            f"{report['seconds']:9.3f} {report['size']:10d} {report['nodes']:10d} "
+            f"{slowest:<28} {report['filename']}"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def _report_name(filename: str) -> str:
+    # Readable, and unique per file even if files only differ in separators.
+    digest = hashlib.sha256(filename.encode("utf-8", "surrogatepass")).hexdigest()
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", filename).strip("_.")[-80:]
+    return f"{slug}-{digest[:8]}"
@@ -0,0 +1,263 @@
+"""Per-rule statistics collected while checking files."""
+# pylint: disable=too-few-public-methods
+import atexit
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional, TextIO
+
+from .visitors.base_visitor import BaseVisitor
+from .visitors.walker import Handler
+
+ENVIRONMENT_VARIABLE = "FLAKE8_PLUS_STATISTICS_DIR"
+
+
+class RuleStatistics:
+    """Statistics for one rule visitor checking one file."""
+
+    def __init__(self):
+        """Initialize a `RuleStatistics` instance."""
+        self.seconds = 0.0
+        self.nodes = 0
+        self.blank_queries = 0
+        self.problems = 0
+        self.skipped = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the statistics as a dictionary."""
+        return vars(self).copy()
+
+
+class FileStatistics:
+    """
+    Statistics for checking one file.
+
+    Visitors are instrumented by shadowing their handlers and `compute_blanks_before`
+    with counting and timing wrappers, so visitors that are not instrumented run at
+    full speed.
+    """
+
+    def __init__(self, filename: str):
+        """
+        Initialize a `FileStatistics` instance and start timing the check.
+
+        Args:
+            filename (str): The name of the file checked.
+        """
+        self.filename = filename
+        self._start = time.perf_counter()
+        self.seconds = 0.0
+        self.nodes = 0
+        self.cached = False
+        self.walk_skipped = False
+        self.rules: dict[str, RuleStatistics] = {}
+
+    def instrument(self, visitor: BaseVisitor) -> None:
+        """
+        Instrument a visitor so its work is recorded in these statistics.
+
+        Args:
+            visitor (BaseVisitor): The visitor to instrument.
+        """
+        rule = self.rules.setdefault(type(visitor).__name__, RuleStatistics())
+        visitor.handlers = {
+            node_type: _timed(handler, rule)
+            for node_type, handler in visitor.handlers.items()
+        }
+        compute_blanks_before = visitor.compute_blanks_before
+
+        def counted_compute_blanks_before(node: Any) -> int:
+            rule.blank_queries += 1
+            return compute_blanks_before(node)
+
+        visitor.compute_blanks_before = counted_compute_blanks_before  # type: ignore
+
+    def skip(self, visitor_class: type[BaseVisitor]) -> None:
+        """
+        Record that the prescan skipped a visitor, as it could not find any problem.
+
+        Args:
+            visitor_class (type[BaseVisitor]): The class of the visitor.
+        """
+        self.rules.setdefault(visitor_class.__name__, RuleStatistics()).skipped = 1
+
+    def finish(self, visitors: list[BaseVisitor], nodes: int) -> None:
+        """
+        Record the totals once the visitors have checked the file.
+
+        Args:
+            visitors (list[BaseVisitor]): The instrumented visitors.
+            nodes (int): The number of nodes walked.
+        """
+        self.nodes = nodes
+        self.seconds = time.perf_counter() - self._start
+        for visitor in visitors:
+            self.rules[type(visitor).__name__].problems = visitor.problem_count
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the statistics as a dictionary."""
+        return {
+            "filename": self.filename,
+            "seconds": self.seconds,
+            "nodes": self.nodes,
+            "cached": self.cached,
+            "walk_skipped": self.walk_skipped,
+            "rules": {name: rule.to_dict() for name, rule in self.rules.items()},
+        }
+
+
+class StatisticsCollector:
+    """
+    Collector of file statistics from all processes of a flake8 run.
+
+    Each process appends the statistics of the files it checks to its own file in a
+    shared spool folder. The process that created the folder aggregates the spooled
+    statistics when it exits, and reports them.
+    """
+
+    def __init__(self, directory: Path):
+        """
+        Initialize a `StatisticsCollector` instance.
+
+        Args:
+            directory (Path): The spool folder.
+        """
+        self.directory = directory
+
+    @classmethod
+    def setup(cls, show: bool, output: Optional[str]) -> "StatisticsCollector":
+        """
+        Set up a collector for the current process.
+
+        The first process to call this creates the spool folder and reports the
+        statistics when it exits. Processes it starts, such as the workers of
+        `flake8 --jobs`, inherit the folder through an environment variable.
+
+        Args:
+            show (bool): Whether to print a summary at exit.
+            output (Optional[str]): File to write the statistics to as JSON at exit.
+
+        Returns:
+            StatisticsCollector: The collector.
+        """
+        existing = os.environ.get(ENVIRONMENT_VARIABLE)
+        if existing and Path(existing).is_dir():
+            return cls(Path(existing))
+        directory = Path(tempfile.mkdtemp(prefix="flake8-plus-statistics-"))
+        os.environ[ENVIRONMENT_VARIABLE] = str(directory)
+        collector = cls(directory)
+        atexit.register(collector.report, show, output)
+        return collector
+
+    def record(self, statistics: FileStatistics) -> None:
+        """
+        Spool the statistics for a file.
+
+        Args:
+            statistics (FileStatistics): The statistics to spool.
+        """
+        path = self.directory / f"{os.getpid()}.ndjson"
+        with path.open("a", encoding="utf-8") as file:
+            file.write(json.dumps(statistics.to_dict()) + "\n")
+
+    def load(self) -> list[dict[str, Any]]:
+        """
+        Load the statistics spooled by all processes.
+
+        Returns:
+            list[dict[str, Any]]: The statistics for each file.
+        """
+        records = []
+        for path in sorted(self.directory.glob("*.ndjson")):
+            with path.open(encoding="utf-8") as file:
+                records.extend(json.loads(line) for line in file if line.strip())
+        return records
+
+    def report(
+        self, show: bool, output: Optional[str], stream: TextIO = sys.stdout
+    ) -> None:
+        """
+        Report the statistics spooled by all processes and remove the spool folder.
+
+        Args:
+            show (bool): Whether to print a summary.
+            output (Optional[str]): File to write the statistics to as JSON.
+            stream (TextIO): The stream to print the summary to.
+        """
+        records = self.load()
+        summary = summarize(records)
+        if output:
+            data = {"summary": summary, "files": records}
+            Path(output).write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+        if show:
+            stream.write(format_summary(summary))
+        shutil.rmtree(self.directory, ignore_errors=True)
+        if os.environ.get(ENVIRONMENT_VARIABLE) == str(self.directory):
+            del os.environ[ENVIRONMENT_VARIABLE]
+
+
+def summarize(records: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Aggregate the statistics of several files.
+
+    Args:
+        records (list[dict[str, Any]]): The statistics for each file.
+
+    Returns:
+        dict[str, Any]: The aggregated statistics.
+    """
+    rules: dict[str, dict[str, Any]] = {}
+    for record in records:
+        for name, rule in record["rules"].items():
+            totals = rules.setdefault(name, dict.fromkeys(rule, 0))
+            for key, value in rule.items():
+                totals[key] += value
+    return {
+        "files": len(records),
+        "cached": sum(record["cached"] for record in records),
+        "seconds": sum(record["seconds"] for record in records),
+        "nodes": sum(record["nodes"] for record in records),
+        "walks_skipped": sum(record["walk_skipped"] for record in records),
+        "rules": rules,
+    }
+
+
+def format_summary(summary: dict[str, Any]) -> str:
+    """
+    Format aggregated statistics as a table.
+
+    Args:
+        summary (dict[str, Any]): The aggregated statistics.
+
+    Returns:
+        str: The table.
+    """
+    lines = [
+        f"flake8-plus: {summary['files']} files ({summary['cached']} from cache), "
+        f"{summary['seconds']:.3f} seconds, {summary['nodes']} nodes walked, "
+        f"{summary['walks_skipped']} walks skipped",
+        f"{'visitor':<20} {'seconds':>9} {'nodes':>10} {'blank queries':>14} "
+        f"{'problems':>9} {'skipped':>8}",
+    ]
+    for name, rule in sorted(summary["rules"].items()):
+        lines.append(
+            f"{name:<20} {rule['seconds']:9.3f} {rule['nodes']:10d} "
+            f"{rule['blank_queries']:14d} {rule['problems']:9d} {rule['skipped']:8d}"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def _timed(handler: Handler, rule: RuleStatistics) -> Handler:
+    perf_counter: Callable[[], float] = time.perf_counter
+
+    def timed_handler(visitor: BaseVisitor, node: Any) -> None:
+        start = perf_counter()
+        handler(visitor, node)
+        rule.seconds += perf_counter() - start
+        rule.nodes += 1
+
+    return timed_handler
@@ -1,62 +1,118 @@
 """Base class for visitors used in Flake8-plus."""
 import ast
-from typing import Any
+from typing import Any, Optional
 
 from ..config import Config
 from ..exceptions import MultipleStatementsError
+from ..line_index import LineIndex
 from ..problem import Problem
+from .walker import STATEMENT_TYPES, Handler, Walker
 
 
 class BaseVisitor(ast.NodeVisitor):
-    """Base class for visitors used in Flake8-plus."""
+    """
+    Base class for visitors used in Flake8-plus.
 
-    def __init__(self, lines: list[str], config: Config):
+    Subclasses register for node types by defining `visit_<NodeType>` methods. Unlike
+    with a plain `ast.NodeVisitor`, these handlers only check the node itself; the
+    traversal of child nodes is done by a `Walker`, either on behalf of this visitor
+    alone (see `visit`) or on behalf of several visitors (see `FusedVisitor`).
+    Visitors that only register for module nodes (such as `ast.Module`) do not descend
+    into the tree at all, and visitors that only register for statement level nodes
+    never descend into expressions.
+
+    Visitors that can only find problems in source code containing certain keywords
+    list them in `keywords`, so they are not run on source code containing none of
+    them (see `prescan`).
+    """
+
+    handlers: dict[type[ast.AST], Handler] = {}
+    descend = True
+    statements_only = False
+    keywords: Optional[frozenset[str]] = None
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Collect the `visit_<NodeType>` handlers defined by the subclass."""
+        super().__init_subclass__(**kwargs)
+        handlers = {}
+        for klass in reversed(cls.__mro__):
+            if not issubclass(klass, BaseVisitor):
+                continue
+            for name, method in vars(klass).items():
+                if not name.startswith("visit_"):
+                    continue
+                node_type = getattr(ast, name[len("visit_") :], None)
+                if isinstance(node_type, type) and issubclass(node_type, ast.AST):
+                    handlers[node_type] = method
+        cls.handlers = handlers
+        cls.descend = not all(issubclass(t, ast.mod) for t in handlers)
+        cls.statements_only = all(issubclass(t, STATEMENT_TYPES) for t in handlers)
+
+    def __init__(
+        self,
+        lines: list[str],
+        config: Config,
+        line_index: Optional[LineIndex] = None,
+    ):
         """
         Initialize BaseVisitor instance.
 
         Args:
             lines (list[str]): The physical lines.
             config (Config): Configuration instance for the plugin and visitor.
+            line_index (Optional[LineIndex]): Index of the physical lines. Pass the
+                same index to all visitors checking a file to only build it once.
+                Defaults to building a new index from `lines`.
         """
         self.problems: list[Problem] = []
+        self.problem_count = 0
         self._lines = lines
+        self.line_index = line_index if line_index is not None else LineIndex(lines)
         self.config = config
-        self._previous_node = None
+        self._previous_node: Optional[ast.AST] = None
 
-    def visit(self, node: ast.AST) -> Any:
+    def visit(self, node: ast.AST) -> None:
         """
-        Visit an `AST` instance.
+        Visit an `AST` instance and all of its descendants.
 
         Args:
             node (ast.AST): The abstract syntax tree to visit.
+        """
+        dispatch = {t: ((self, h),) for t, h in self.handlers.items()}
+        walker = Walker(dispatch, self.descend, self.statements_only)
+        walker.previous_node = self._previous_node
+        walker.walk(node)
+        self._previous_node = walker.previous_node
 
-        Returns:
-            Any: The result of calling `visit` on the super class.
+    def report(self, problem: Problem) -> None:
         """
-        result = super().visit(node)
-        self._previous_node = node
-        return result
+        Report a problem.
+
+        Problems are held in `problems` until they are collected, which a
+        `FusedVisitor` does as soon as no problem on an earlier line can be found any
+        more (see `FusedVisitor.iter_problems`). `problem_count` counts all the
+        problems reported, collected or not.
+
+        Args:
+            problem (Problem): The problem found.
+        """
+        self.problems.append(problem)
+        self.problem_count += 1
 
     def compute_blanks_before(self, node: ast.AST) -> int:
         """
-        Compute the number of blank immediately preceding the specified line number.
+        Compute the number of blank immediately preceding the specified node.
 
         Args:
-            line_number (int): The line number to check for blank lines before.
+            node (ast.AST): The node to check for blank lines before.
+
+        Raises:
+            MultipleStatementsError: If the node is not the first statement on its
+                line.
 
         Returns:
             int: The number of blank lines.
         """
-        line_index = node.lineno - 1
-        line = self._lines[line_index]
-        line_offset = len(line) - len(line.lstrip())
-        if line_offset != node.col_offset:
+        if self.line_index.indent(node.lineno) != node.col_offset:
             raise MultipleStatementsError(f"Multiple statements on line {node.lineno}")
-
-        indices_reversed = reversed(range(0, line_index))
-        n_blanks = 0
-        for index in indices_reversed:
-            if self._lines[index].strip():
-                break
-            n_blanks += 1
-        return n_blanks
+        return self.line_index.blanks_before(node.lineno)
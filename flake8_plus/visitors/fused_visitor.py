@@ -0,0 +1,150 @@
+"""Visitor running several rule visitors in a single walk of the tree."""
+import ast
+import heapq
+import itertools
+from typing import Callable, Iterable, Iterator, Optional
+
+from ..problem import Problem
+from .base_visitor import BaseVisitor
+from .walker import Dispatch, Walker
+
+# The number of lines of toplevel statements walked before collecting problems.
+BATCH_LINES = 256
+
+
+class FusedVisitor:
+    """
+    Visitor dispatching each node to every rule visitor registered for its type.
+
+    The tree is walked once, regardless of the number of rule visitors, using a
+    dispatch table mapping node types to the handlers of all the rule visitors. Before
+    a rule handler is called, the rule visitor's `_previous_node` is set to the node
+    most recently finished by the walk, which is exactly what it would have been had
+    the rule visitor walked the tree on its own.
+    """
+
+    def __init__(
+        self,
+        visitors: Iterable[BaseVisitor],
+        statements_only: Optional[bool] = None,
+    ):
+        """
+        Initialize a `FusedVisitor` instance.
+
+        Args:
+            visitors (Iterable[BaseVisitor]): The rule visitors to dispatch nodes to.
+            statements_only (Optional[bool]): Whether to only walk statement bodies.
+                Defaults to doing so if all the visitors register for statement level
+                node types only.
+        """
+        self.visitors = list(visitors)
+        dispatch: Dispatch = {}
+        for visitor in self.visitors:
+            for node_type, handler in visitor.handlers.items():
+                dispatch[node_type] = dispatch.get(node_type, ()) + (
+                    (visitor, handler),
+                )
+        if statements_only is None:
+            statements_only = all(visitor.statements_only for visitor in self.visitors)
+        self._walker = Walker(
+            dispatch,
+            any(visitor.descend for visitor in self.visitors),
+            statements_only,
+        )
+
+    @property
+    def statements_only(self) -> bool:
+        """Return whether only statement bodies are walked."""
+        return self._walker.statements_only
+
+    @property
+    def nodes_visited(self) -> int:
+        """Return the number of nodes visited so far."""
+        return self._walker.nodes_visited
+
+    @property
+    def previous_node(self) -> Optional[ast.AST]:
+        """Return the node most recently finished by the walk."""
+        return self._walker.previous_node
+
+    @previous_node.setter
+    def previous_node(self, node: Optional[ast.AST]) -> None:
+        """Set the previous node, for walking a tree continuing another walk."""
+        self._walker.previous_node = node
+
+    @property
+    def problems(self) -> list[Problem]:
+        """Return the problems found by all rule visitors and not yet collected."""
+        return [p for visitor in self.visitors for p in visitor.problems]
+
+    def visit(self, node: ast.AST) -> None:
+        """
+        Visit an `AST` instance and all of its descendants.
+
+        Args:
+            node (ast.AST): The abstract syntax tree to visit.
+        """
+        self._walker.walk(node)
+
+    def iter_problems(
+        self, node: ast.AST, include: Optional[Callable[[ast.stmt], bool]] = None
+    ) -> Iterator[Problem]:
+        """
+        Visit an `AST` instance and yield the problems found, in line order.
+
+        A module is walked in batches of toplevel statements spanning about
+        `BATCH_LINES` lines, exactly as in a walk of the complete module. After each
+        batch, the problems reported by the rule visitors are collected, and those on
+        lines before the next batch are yielded, as no problem can be found there any
+        more. Only the problems found in a single batch are thus held at a time, and a
+        consumer stopping early stops the walk too. Other nodes are walked completely
+        before yielding.
+
+        Args:
+            node (ast.AST): The abstract syntax tree to visit.
+            include (Optional[Callable[[ast.stmt], bool]]): Predicate selecting the
+                toplevel statements of a module to walk. Handlers for the module node
+                itself are always called. Defaults to walking all statements.
+
+        Yields:
+            Iterator[Problem]: The problems found, sorted by line and column.
+        """
+        heap: list[tuple[int, int, int, Problem]] = []
+        order = itertools.count()
+        if isinstance(node, ast.Module):
+            walker = self._walker
+            module_walker = Walker(walker.dispatch, descend=False)
+            module_walker.walk(node)
+            walker.nodes_visited += module_walker.nodes_visited
+            statements = node.body if walker.descend else []
+            start = 0
+            while start < len(statements):
+                end = start + 1
+                limit = statements[start].lineno + BATCH_LINES
+                while end < len(statements) and statements[end].lineno < limit:
+                    end += 1
+                walker.walk_statements(statements[start:end], include)
+                self._collect(heap, order)
+                if end < len(statements):
+                    first_line = _first_line(statements[end])
+                    while heap and heap[0][0] < first_line:
+                        yield heapq.heappop(heap)[-1]
+                start = end
+        else:
+            self.visit(node)
+        self._collect(heap, order)
+        while heap:
+            yield heapq.heappop(heap)[-1]
+
+    def _collect(
+        self, heap: list[tuple[int, int, int, Problem]], order: Iterator[int]
+    ) -> None:
+        for visitor in self.visitors:
+            for p in visitor.problems:
+                heapq.heappush(heap, (p.line_number, p.col_offset, next(order), p))
+            visitor.problems.clear()
+
+
+def _first_line(statement: ast.stmt) -> int:
+    decorators = getattr(statement, "decorator_list", [])
+    return min([statement.lineno] + [d.lineno for d in decorators])
@@ -1,87 +1,46 @@
 """Exception classes raised by various operations within pylint."""
 # pylint: disable=too-few-public-methods
 import ast
-from typing import Any
+from typing import Optional
 
-from ..config import Config
 from ..problem import Problem
 from .base_visitor import BaseVisitor
+from .walker import BODY_FIELDS
 
 
 class PLU001Problem(Problem):
     """Problem 001: Number of blank lines before first import."""
 
+    __slots__ = ()
+
     code = "PLU001"
     format_ = "expected {} blank lines before first import, found {}"
 
-    def __init__(  # pylint: disable=unused-argument
-        self,
-        line_number: int,
-        col_offset: int,
-        blanks_actual: int,
-        blanks_expected: int,
-        **kwargs: dict[str, Any],
-    ):
-        """
-        Initialize a `PLU001Problem` instance.
-
-        Args:
-            line_number (int): The line number.
-            col_offset (int): The column offset.
-            blanks_actual (int): Number of actual blanks before first import.
-            blanks_expected (int): Number of expected blanks before first import.
-        """
-        message = PLU001Problem.format_.format(blanks_expected, blanks_actual)
-        super().__init__(line_number, col_offset, message)
-
 
 class PLU001Visitor(BaseVisitor):
-    """Visitor class for the PLU001 rule."""
+    """
+    Visitor class for the PLU001 rule.
 
-    def __init__(self, lines: list[str], config: Config):
-        """
-        Initialize a PLU001Visitor instance.
+    Only the module header is inspected: the statements of the module are searched in
+    source order for the first import statement, and the search stops there. Neither
+    expressions nor anything following the first import is ever visited.
+    """
 
-        Args:
-            lines (list[str]): The physical lines.
-            config (Config): Configuration instance for the plugin and visitor.
-        """
-        self._previous_import = False
-        super().__init__(lines, config)
+    keywords = frozenset({"import"})
 
-    def visit_Import(self, node: ast.Import) -> Any:
+    def visit_Module(self, node: ast.Module) -> None:
         """
-        Visit an `Import` node.
+        Visit a `Module` node.
 
         Args:
-            node (ast.Import): The node to visit.
-
-        Returns:
-            Any: The result of calling `generic_visit`.
+            node (ast.Module): The node to visit.
         """
         # pylint: disable=invalid-name
-        self._process_import(node)
-        return self.generic_visit(node)
-
-    def visit_ImportFrom(self, node: ast.ImportFrom) -> Any:
-        """
-        Visit an `ImportFrom` node.
-
-        Args:
-            node (ast.Import): The node to visit.
-
-        Returns:
-            Any: The result of calling `generic_visit`.
-        """
-        # pylint: disable=invalid-name
-        self._process_import(node)
-        return self.generic_visit(node)
+        first_import = find_first_import(node)
+        if first_import is not None:
+            self._process_import(first_import)
 
     def _process_import(self, node: ast.AST):
-        if self._previous_import:
-            return
-
-        self._previous_import = True
         if node.col_offset != 0:
             # Either a non-top-level import, or there are multiple
             # statements on one line.
@@ -96,4 +55,34 @@ class PLU001Visitor(BaseVisitor):
                 actual,
                 self.config.blanks_before_imports,
             )
-            self.problems.append(problem)
+            self.report(problem)
+
+
+def find_first_import(node: ast.Module) -> Optional[ast.AST]:
+    """
+    Find the first import statement of a module, in source order.
+
+    Imports are statements, so only statement bodies need to be searched. Searching
+    them depth first yields statements in source order, so this finds the same import
+    as a full walk would, including imports nested inside a compound statement
+    preceding the first toplevel import.
+
+    Args:
+        node (ast.Module): The module.
+
+    Returns:
+        Optional[ast.AST]: The first import statement, if any.
+    """
+    stack: list[ast.AST] = list(reversed(node.body))
+    while stack:
+        statement = stack.pop()
+        if isinstance(statement, ast.Import | ast.ImportFrom):
+            return statement
+        children = [
+            child
+            for name, value in ast.iter_fields(statement)
+            if name in BODY_FIELDS and isinstance(value, list)
+            for child in value
+        ]
+        stack.extend(reversed(children))
+    return None
@@ -0,0 +1,125 @@
+"""Visitor compiled from declarative blank line rules."""
+# pylint: disable=protected-access,too-few-public-methods
+import ast
+from typing import Any, Callable, NamedTuple, Optional, Union
+
+from ..exceptions import MultipleStatementsError
+from ..problem import Problem
+from .base_visitor import BaseVisitor
+
+Predicate = Callable[[ast.AST, Optional[ast.AST]], bool]
+
+DEFINITION_TYPES = (ast.AsyncFunctionDef, ast.ClassDef, ast.FunctionDef)
+
+# Context predicates rules can be restricted with, by name. Each is called with the
+# node and the previous node, the last node finished by the walk.
+PREDICATES: dict[str, Predicate] = {
+    "toplevel": lambda node, previous: node.col_offset == 0,
+    "nested": lambda node, previous: node.col_offset > 0,
+    "not_after_definition": lambda node, previous: not isinstance(
+        previous, DEFINITION_TYPES
+    ),
+}
+
+# The keyword without which nodes of each type cannot occur in source code. Rules for
+# other node types are always checked, see `BaseVisitor.keywords`.
+KEYWORDS: dict[type[ast.AST], str] = {
+    ast.Assert: "assert",
+    ast.AsyncFor: "for",
+    ast.AsyncFunctionDef: "def",
+    ast.AsyncWith: "with",
+    ast.Await: "await",
+    ast.Break: "break",
+    ast.ClassDef: "class",
+    ast.Continue: "continue",
+    ast.Delete: "del",
+    ast.ExceptHandler: "except",
+    ast.For: "for",
+    ast.FunctionDef: "def",
+    ast.Global: "global",
+    ast.If: "if",
+    ast.Import: "import",
+    ast.ImportFrom: "import",
+    ast.Lambda: "lambda",
+    ast.Match: "match",
+    ast.Nonlocal: "nonlocal",
+    ast.Pass: "pass",
+    ast.Raise: "raise",
+    ast.Return: "return",
+    ast.Try: "try",
+    ast.While: "while",
+    ast.With: "with",
+    ast.Yield: "yield",
+    ast.YieldFrom: "yield",
+}
+
+
+class RuleSpec(NamedTuple):
+    """Specification of a rule checking the number of blank lines before nodes."""
+
+    problem: type[Problem]
+    node_types: tuple[type[ast.AST], ...]
+    expected: Union[int, str]
+    predicates: tuple[str, ...] = ()
+
+
+class RuleVisitor(BaseVisitor):
+    """
+    Visitor checking the rules specified in its `rules` class attribute.
+
+    Each rule gives a problem class, the node types it applies to, the expected number
+    of blank lines before such nodes (or the name of the `Config` attribute holding
+    it), and the names of the predicates (see `PREDICATES`) a node must satisfy to be
+    checked. When a subclass is defined, its rules are compiled into one
+    `visit_<NodeType>` handler per node type, checking all the rules for that type and
+    counting the blank lines before a node at most once. All rules thus share a single
+    entry per node type in the dispatch table of the walk, however many there are.
+    The keywords of the visitor are those of the node types of its rules, if all of
+    them have one (see `KEYWORDS`).
+    """
+
+    rules: tuple[RuleSpec, ...] = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Compile the rules of the subclass into `visit_<NodeType>` handlers."""
+        checks: dict[type[ast.AST], list[tuple]] = {}
+        for rule in cls.rules:
+            predicate = _combine([PREDICATES[name] for name in rule.predicates])
+            for node_type in rule.node_types:
+                checks.setdefault(node_type, []).append(
+                    (rule.problem, rule.expected, predicate)
+                )
+        for node_type, node_checks in checks.items():
+            setattr(cls, f"visit_{node_type.__name__}", _handler(tuple(node_checks)))
+        words = [KEYWORDS.get(node_type) for node_type in checks]
+        cls.keywords = None if None in words else frozenset(words)
+        super().__init_subclass__(**kwargs)
+
+
+def _combine(predicates: list[Predicate]) -> Optional[Predicate]:
+    # Handlers run for every node of their types, so rules without predicates skip
+    # the call altogether, and a single predicate is called directly.
+    if not predicates:
+        return None
+    if len(predicates) == 1:
+        return predicates[0]
+    return lambda node, previous: all(p(node, previous) for p in predicates)
+
+
+def _handler(checks: tuple) -> Callable[[RuleVisitor, ast.AST], None]:
+    def visit(self: RuleVisitor, node: Any) -> None:
+        actual = None
+        for problem, expected, predicate in checks:
+            if predicate is not None and not predicate(node, self._previous_node):
+                continue
+            if actual is None:
+                try:
+                    actual = self.compute_blanks_before(node)
+                except MultipleStatementsError:
+                    return
+            if not isinstance(expected, int):
+                expected = getattr(self.config, expected)
+            if actual != expected:
+                self.report(problem(node.lineno, node.col_offset, actual, expected))
+
+    return visit
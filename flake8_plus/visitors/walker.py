@@ -0,0 +1,156 @@
+"""Iterative walker used as the traversal engine for all visitors."""
+# pylint: disable=protected-access,too-few-public-methods
+import ast
+from ast import AST
+from typing import TYPE_CHECKING, Callable, Optional, Sequence
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .base_visitor import BaseVisitor
+
+Handler = Callable[["BaseVisitor", ast.AST], None]
+Dispatch = dict[type[ast.AST], tuple[tuple["BaseVisitor", Handler], ...]]
+
+# Fields holding lists of statements (or of `ExceptHandler` and `match_case` nodes
+# holding statements themselves). All other fields hold expressions or other
+# non-statement nodes.
+BODY_FIELDS = frozenset(("body", "orelse", "finalbody", "handlers", "cases"))
+STATEMENT_TYPES = (ast.mod, ast.stmt, ast.excepthandler, ast.match_case)
+
+
+class Walker:
+    """
+    Iterative, explicit-stack walker dispatching nodes to rule visitor handlers.
+
+    Nodes are visited depth first, in the same order as `ast.NodeVisitor` would visit
+    them, but without recursion, so the Python stack depth is bounded regardless of
+    how deeply the tree is nested. Before a handler is called, the visitor's
+    `_previous_node` is set to the node most recently finished by the walk, that is
+    the last node whose subtree has been walked completely.
+    """
+
+    def __init__(
+        self,
+        dispatch: Dispatch,
+        descend: bool = True,
+        statements_only: bool = False,
+    ):
+        """
+        Initialize a `Walker` instance.
+
+        Args:
+            dispatch (Dispatch): Table mapping node types to the visitors and handlers
+                to call for nodes of that type.
+            descend (bool): Whether to walk the descendants of the root node.
+            statements_only (bool): Whether to only walk statement bodies (see
+                `BODY_FIELDS`) and never descend into expressions. Skipped fields
+                still update the previous node as a full walk would have.
+        """
+        self.dispatch = dispatch
+        self.descend = descend
+        self.statements_only = statements_only
+        self.nodes_visited = 0
+        self.previous_node: Optional[ast.AST] = None
+
+    def walk(self, node: ast.AST) -> None:
+        """
+        Walk an `AST` instance and, unless disabled, all of its descendants.
+
+        Args:
+            node (ast.AST): The abstract syntax tree to walk.
+        """
+        self._walk([node])
+
+    def walk_statements(
+        self,
+        statements: Sequence[ast.stmt],
+        include: Optional[Callable[[ast.stmt], bool]] = None,
+    ) -> None:
+        """
+        Walk consecutive statements of a body, as a walk of their parent would.
+
+        Args:
+            statements (Sequence[ast.stmt]): The statements to walk.
+            include (Optional[Callable[[ast.stmt], bool]]): Predicate selecting the
+                statements to walk. Statements not selected are skipped, but still
+                become the previous node, as if they had been walked. Defaults to
+                walking all statements.
+        """
+        self._walk(
+            [
+                statement if include is None or include(statement) else (statement,)
+                for statement in reversed(statements)
+            ]
+        )
+
+    def _walk(self, stack: list) -> None:
+        # This is the hot loop of the plugin, hence the inlining and local aliases.
+        # pylint: disable=too-many-locals,too-many-branches,too-many-nested-blocks
+        # The stack holds nodes to enter as well as 1-tuples marking where the walk
+        # finishes a node, which makes that node the previous node.
+        pop = stack.pop
+        push = stack.append
+        extend = stack.extend
+        get_handlers = self.dispatch.get
+        statements_only = self.statements_only
+        descend = self.descend
+        previous = self.previous_node
+        count = 0
+        while stack:
+            item = pop()
+            item_type = type(item)
+            if item_type is tuple:
+                previous = item[0]
+                continue
+            count += 1
+            handlers = get_handlers(item_type)
+            if handlers is not None:
+                for visitor, handler in handlers:
+                    visitor._previous_node = previous
+                    handler(visitor, item)
+            if not descend:
+                previous = item
+                continue
+            if statements_only:
+                children = _body_children(item)
+            else:
+                children = []
+                append = children.append
+                for name in item._fields:
+                    value = getattr(item, name, None)
+                    if isinstance(value, AST):
+                        append(value)
+                    elif type(value) is list:  # pylint: disable=unidiomatic-typecheck
+                        for child in value:
+                            if isinstance(child, AST):
+                                append(child)
+            if children:
+                push((item,))
+                children.reverse()
+                extend(children)
+            else:
+                previous = item
+        self.nodes_visited += count
+        self.previous_node = previous
+
+
+def _body_children(node: ast.AST) -> list:
+    events: list = []
+    pending = None
+    for name in node._fields:
+        value = getattr(node, name, None)
+        if type(value) is list:  # pylint: disable=unidiomatic-typecheck
+            if name in BODY_FIELDS:
+                if value:
+                    if pending is not None:
+                        events.append((pending,))
+                        pending = None
+                    events.extend(value)
+                continue
+            # A full walk would have finished with the last node in the list.
+            for child in reversed(value):
+                if isinstance(child, ast.AST):
+                    pending = child
+                    break
+        elif isinstance(value, ast.AST):
+            pending = value
+    return events
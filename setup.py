@@ -59,7 +59,7 @@ setup(
     author_email="sorenlind@mac.com",
     url="https://github.com/sorenlind/flake8-plus",
     keywords="",
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
     install_requires=["flake8"],
     extras_require={
         "dev": [
@@ -70,6 +70,7 @@ setup(
             "flake8",
             "flake8-annotations",
             "flake8-pytest-style",
+            "hypothesis",
             "mypy",
             "pycodestyle",
             "pydocstyle",
@@ -83,6 +84,7 @@ setup(
         ],
         "test": [
             "coverage",
+            "hypothesis",
             "pytest",
             "pytest-cov",
             "pytest-mock",
@@ -104,5 +106,8 @@ setup(
         "flake8.extension": [
             "PLU = flake8_plus:Plugin",
         ],
+        "console_scripts": [
+            "flake8-plus = flake8_plus.cli:main",
+        ],
     },
 )
@@ -0,0 +1,132 @@
+"""
+Reference implementation of the flake8-plus rules, for equivalence testing.
+
+The visitor below is a deliberately naive, recursive implementation of all the rules,
+following the original visitors of the plugin: every node is visited, and blank lines
+are counted by scanning the lines backwards for every query. It is slow, but its
+behavior is easy to verify, so the optimized engines are tested against it.
+"""
+import ast
+import io
+from typing import Any
+
+from flake8_plus.config import Config
+
+Result = tuple[int, int, str]
+
+_MESSAGES = {
+    "PLU001": "expected {} blank lines before first import, found {}",
+    "PLU002": "expected {} blank lines before return statement, found {}",
+    "PLU003": "expected {} blank lines before except, found {}",
+}
+
+
+class ReferenceVisitor(ast.NodeVisitor):
+    """Naive recursive visitor checking all the rules."""
+
+    def __init__(self, lines: list[str], config: Config):
+        """
+        Initialize a `ReferenceVisitor` instance.
+
+        Args:
+            lines (list[str]): The physical lines.
+            config (Config): The plugin configuration.
+        """
+        self.results: set[Result] = set()
+        self._lines = lines
+        self._config = config
+        self._previous_node: Any = None
+        self._previous_import = False
+
+    def visit(self, node: ast.AST) -> Any:
+        """
+        Visit a node and remember it as the previous node.
+
+        Args:
+            node (ast.AST): The node to visit.
+
+        Returns:
+            Any: The result of visiting the node.
+        """
+        result = super().visit(node)
+        self._previous_node = node
+        return result
+
+    def visit_Import(self, node: ast.Import | ast.ImportFrom) -> Any:
+        """
+        Check the first import.
+
+        Args:
+            node (ast.Import | ast.ImportFrom): The node to visit.
+
+        Returns:
+            Any: The result of calling `generic_visit`.
+        """
+        # pylint: disable=invalid-name
+        if not self._previous_import:
+            self._previous_import = True
+            if node.col_offset == 0:
+                self._check(node, "PLU001", self._config.blanks_before_imports)
+        return self.generic_visit(node)
+
+    visit_ImportFrom = visit_Import
+
+    def visit_Return(self, node: ast.Return) -> Any:
+        """
+        Check a return statement not directly following a definition.
+
+        Args:
+            node (ast.Return): The node to visit.
+
+        Returns:
+            Any: The result of calling `generic_visit`.
+        """
+        # pylint: disable=invalid-name
+        if not isinstance(
+            self._previous_node, ast.AsyncFunctionDef | ast.ClassDef | ast.FunctionDef
+        ):
+            self._check(node, "PLU002", self._config.blanks_before_return)
+        return self.generic_visit(node)
+
+    def visit_ExceptHandler(self, node: ast.ExceptHandler) -> Any:
+        """
+        Check an except clause.
+
+        Args:
+            node (ast.ExceptHandler): The node to visit.
+
+        Returns:
+            Any: The result of calling `generic_visit`.
+        """
+        # pylint: disable=invalid-name
+        self._check(node, "PLU003", self._config.blanks_before_except)
+        return self.generic_visit(node)
+
+    def _check(self, node: Any, code: str, expected: int):
+        line = self._lines[node.lineno - 1]
+        if len(line) - len(line.lstrip()) != node.col_offset:
+            return  # Multiple statements on one line.
+        actual = 0
+        for index in reversed(range(node.lineno - 1)):
+            if self._lines[index].strip():
+                break
+            actual += 1
+        if actual != expected:
+            message = f"{code} {_MESSAGES[code].format(expected, actual)}"
+            self.results.add((node.lineno, node.col_offset, message))
+
+
+def reference_results(source_code: str, config: Config) -> set[Result]:
+    """
+    Check source code with the reference implementation.
+
+    Args:
+        source_code (str): The source code.
+        config (Config): The plugin configuration.
+
+    Returns:
+        set[Result]: The problems found, as line numbers, column offsets and messages.
+    """
+    visitor = ReferenceVisitor(io.StringIO(source_code).readlines(), config)
+    visitor.visit(ast.parse(source_code))
+    return visitor.results
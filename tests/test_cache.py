@@ -0,0 +1,88 @@
+"""Tests for the cache module."""
+# pylint: disable=no-self-use
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from flake8_plus import cache as cache_module
+from flake8_plus.cache import ResultCache
+from flake8_plus.config import Config
+
+LINES = ['"""Docstring."""\n', "\n", "import ast\n"]
+RESULTS = [(3, 0, "PLU001 expected 0 blank lines before first import, found 1")]
+
+
+def _put_many(directory: Path, worker: int) -> int:
+    cache = ResultCache(directory, 1000)
+    for i in range(50):
+        key = cache.key([f"x = {worker}_{i}\n"], Config())
+        cache.put(key, [(worker, i, "message")])
+    return worker
+
+
+class TestResultCache:
+    """Tests for the ResultCache class."""
+
+    def test_miss(self, tmp_path: Path):
+        """Test that nothing is returned for unknown keys."""
+        cache = ResultCache(tmp_path, 10)
+        assert cache.get(cache.key(LINES, Config())) is None
+
+    def test_roundtrip(self, tmp_path: Path):
+        """Test that stored results are returned."""
+        cache = ResultCache(tmp_path, 10)
+        key = cache.key(LINES, Config())
+        cache.put(key, RESULTS)
+        assert ResultCache(tmp_path, 10).get(key) == RESULTS
+
+    def test_key_depends_on_lines(self):
+        """Test that the key changes when the lines change."""
+        assert ResultCache.key(LINES, Config()) != ResultCache.key(LINES[1:], Config())
+        assert ResultCache.key(["ab", "c"], Config()) != ResultCache.key(
+            ["a", "bc"], Config()
+        )
+
+    def test_key_depends_on_config(self):
+        """Test that the key changes when the configuration changes."""
+        assert ResultCache.key(LINES, Config()) != ResultCache.key(LINES, Config(1))
+
+    def test_key_depends_on_context(self):
+        """Test that lines in another context get another key."""
+        key = ResultCache.key(LINES, Config())
+        assert ResultCache.key(LINES, Config(), context="a") != key
+        assert ResultCache.key(LINES, Config(), context="b") != ResultCache.key(
+            LINES, Config(), context="a"
+        )
+
+    def test_get_and_put_many(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        """Test storing and looking up several results at once, in batches."""
+        monkeypatch.setattr(cache_module, "BATCH_SIZE", 2)
+        cache = ResultCache(tmp_path, 10)
+        keys = [cache.key([str(i)], Config()) for i in range(5)]
+        cache.put_many((key, [(i, 0, "message")]) for i, key in enumerate(keys[:3]))
+        assert cache.get_many(keys) == {
+            key: [(i, 0, "message")] for i, key in enumerate(keys[:3])
+        }
+        assert not cache.get_many(keys[3:])
+
+    def test_evict_least_recently_used(self, tmp_path: Path):
+        """Test that the least recently used results are evicted."""
+        cache = ResultCache(tmp_path, 2)
+        keys = [cache.key([str(i)], Config()) for i in range(3)]
+        for key in keys:
+            cache.put(key, RESULTS)
+        cache.get(keys[0])
+        cache.evict()
+        assert len(cache) == 2
+        assert cache.get(keys[0]) == RESULTS
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[2]) == RESULTS
+
+    def test_concurrent_processes(self, tmp_path: Path):
+        """Test that several processes can use the cache at the same time."""
+        with ProcessPoolExecutor(4) as executor:
+            workers = list(executor.map(_put_many, [tmp_path] * 4, range(4)))
+        cache = ResultCache(tmp_path, 1000)
+        assert len(cache) == 50 * len(workers)
+        assert cache.get(cache.key(["x = 3_49\n"], Config())) == [(3, 49, "message")]
@@ -0,0 +1,116 @@
+"""Tests for the checker module."""
+# pylint: disable=no-self-use
+import ast
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from flake8_plus.checker import Checker, check
+from flake8_plus.config import Config
+from flake8_plus.diff import LineRanges
+
+CODE = """\
+import os
+
+
+def first():
+    x = 1
+
+    return x
+
+
+def second():
+    try:
+        pass
+
+    except ValueError:
+        pass
+    y = 2
+
+    return y
+"""
+
+CASE_FILES = sorted((Path(__file__).parent / "case_files").rglob("*.py"))
+
+
+def _positions(problems: list) -> list[tuple[int, int]]:
+    return sorted((p.line_number, p.col_offset) for p in problems)
+
+
+class TestCheckChanged:
+    """Tests for checking only changed lines."""
+
+    def test_no_changes(self):
+        """Test that nothing is reported when no lines changed."""
+        lines = CODE.splitlines(True)
+        assert not check(lines, Config(), changed=LineRanges())
+
+    def test_unchanged_definitions_skipped(self):
+        """Test that only problems in changed definitions are reported."""
+        lines = CODE.splitlines(True)
+        assert _positions(check(lines, Config())) == [(7, 4), (14, 4), (18, 4)]
+        changed = LineRanges([(5, 7)])
+        assert _positions(check(lines, Config(), changed=changed)) == [(7, 4)]
+
+    def test_problems_outside_hunks_filtered(self):
+        """Test that problems in a changed definition but outside hunks are dropped."""
+        lines = CODE.splitlines(True)
+        changed = LineRanges([(16, 16)])
+        assert not check(lines, Config(), changed=changed)
+
+    def test_blank_lines_changed(self):
+        """Test that a problem is reported when the blank lines before it changed."""
+        lines = CODE.splitlines(True)
+        changed = LineRanges([(13, 13)])
+        assert _positions(check(lines, Config(), changed=changed)) == [(14, 4)]
+
+    @pytest.mark.parametrize("path", CASE_FILES, ids=lambda path: path.name)
+    def test_all_changed(self, path: Path):
+        """Test that all problems are reported when every line changed."""
+        lines = path.read_text(encoding="utf-8").splitlines(True)
+        tree = ast.parse("".join(lines))
+        changed = LineRanges([(1, len(lines) + 1)])
+        for config in (Config(), Config(1, 1, 1)):
+            expected = _positions(check(lines, config, tree))
+            actual = _positions(check(lines, config, tree, changed=changed))
+            assert actual == expected
+
+
+class TestChecker:
+    """Tests for the `Checker` class."""
+
+    def test_check_source(self):
+        """Test that a checker finds the same problems as `check`."""
+        checker = Checker(Config(1, 1, 1))
+        expected = _positions(check(CODE.splitlines(True), Config(1, 1, 1)))
+        assert _positions(checker.check_source(CODE)) == expected
+        assert _positions(checker.check_source(CODE.encode())) == expected
+
+    def test_codes(self):
+        """Test that only the specified rules are checked."""
+        problems = Checker(codes=["PLU003"]).check_source(CODE)
+        assert [p.code for p in problems] == ["PLU003"]
+
+    def test_syntax_error(self):
+        """Test that syntax errors are raised."""
+        with pytest.raises(SyntaxError):
+            Checker().check_source("def func(:\n")
+
+    @pytest.mark.parametrize("threads", [1, 4])
+    def test_check_sources(self, threads: int):
+        """Test that checkers with different configurations can share threads."""
+        sources = [path.read_text(encoding="utf-8") for path in CASE_FILES]
+        checkers = [Checker(Config()), Checker(Config(1, 1, 1))]
+        expected = [
+            [_positions(checker.check_source(source)) for source in sources]
+            for checker in checkers
+        ]
+        with ThreadPoolExecutor(2) as executor:
+            futures = [
+                executor.submit(list, checker.check_sources(sources * 4, threads))
+                for checker in checkers
+            ]
+            for future, checker_expected in zip(futures, expected):
+                actual = [_positions(problems) for problems in future.result()]
+                assert actual == checker_expected * 4
@@ -0,0 +1,292 @@
+"""Tests for the cli module."""
+# pylint: disable=no-self-use,too-few-public-methods
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from flake8_plus.cli import main
+
+BAD_CODE = "def func():\n    x = 1\n\n    return x\n"
+
+
+class TestCheck:
+    """Tests for the `check` command."""
+
+    def test_problems(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ):
+        """Test that problems are reported and the exit code is 1."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "a.py").write_text(BAD_CODE, encoding="utf-8")
+        assert main(["check", "--isolated", "-j", "1"]) == 1
+        output = capsys.readouterr().out
+        assert output == (
+            "a.py:4:5: PLU002 expected 0 blank lines before return statement, found 1\n"
+        )
+
+    def test_config_file(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        """Test that the configuration file is read."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "a.py").write_text(BAD_CODE, encoding="utf-8")
+        (tmp_path / "tox.ini").write_text("[flake8]\nblanks-before-return=1\n")
+        assert main(["check", "-j", "1"]) == 0
+
+    def test_command_line_overrides_config_file(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test that command line options override the configuration file."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "a.py").write_text(BAD_CODE, encoding="utf-8")
+        (tmp_path / "tox.ini").write_text("[flake8]\nblanks-before-return=1\n")
+        assert main(["check", "-j", "1", "--blanks-before-return", "0"]) == 1
+
+    def test_blank_line_rules(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ):
+        """Test checking configured rules, and that invalid rules are reported."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "a.py").write_text(BAD_CODE, encoding="utf-8")
+        args = ["check", "--isolated", "-j", "1", "--blanks-before-return", "1"]
+        assert main(args + ["--blank-line-rules", "PLU100:Assign:nested=1"]) == 1
+        output = capsys.readouterr().out
+        assert (
+            output == "a.py:2:5: PLU100 expected 1 blank lines before Assign, found 0\n"
+        )
+        assert main(args + ["--blank-line-rules", "PLU100:Nothing=1"]) == 2
+        error = capsys.readouterr().err
+        assert error == "flake8-plus: invalid node type 'Nothing' in PLU100\n"
+
+    def test_invalid_config_file(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ):
+        """Test that invalid options in the configuration file are reported."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "a.py").write_text(BAD_CODE, encoding="utf-8")
+        (tmp_path / "tox.ini").write_text("[flake8]\nblanks-before-return=x\n")
+        assert main(["check", "-j", "1"]) == 2
+        assert capsys.readouterr().err == (
+            "flake8-plus: invalid value 'x' for blanks-before-return, expected an "
+            "integer\n"
+        )
+
+    def test_selection_and_noqa(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ):
+        """Test that rules are selected and noqa comments applied like in flake8."""
+        monkeypatch.chdir(tmp_path)
+        noqa = BAD_CODE.replace("return x", "return x  # noqa: PLU002")
+        (tmp_path / "a.py").write_text(noqa + BAD_CODE, encoding="utf-8")
+        (tmp_path / "b.py").write_text(BAD_CODE, encoding="utf-8")
+        (tmp_path / "c.py").write_text("# flake8: noqa\n" + BAD_CODE, encoding="utf-8")
+        assert main(["check", "-j", "1"]) == 1
+        assert capsys.readouterr().out.splitlines() == [
+            "a.py:8:5: PLU002 expected 0 blank lines before return statement, found 1",
+            "b.py:4:5: PLU002 expected 0 blank lines before return statement, found 1",
+        ]
+        config = "[flake8]\nper-file-ignores = b.py:PLU002\n"
+        (tmp_path / "setup.cfg").write_text(config, encoding="utf-8")
+        assert main(["check", "-j", "1"]) == 1
+        assert capsys.readouterr().out.startswith("a.py:8:5: PLU002")
+        config = "[flake8]\nextend-ignore = PLU002\ndisable-noqa = true\n"
+        (tmp_path / "setup.cfg").write_text(config, encoding="utf-8")
+        assert main(["check", "-j", "1"]) == 0
+
+    def test_max_violations(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ):
+        """Test that reporting stops once the maximum number of problems is hit."""
+        monkeypatch.chdir(tmp_path)
+        for name in ["a.py", "b.py"]:
+            (tmp_path / name).write_text(BAD_CODE * 2, encoding="utf-8")
+        args = ["check", "--isolated", "-j", "1", "--max-violations"]
+        assert main(args + ["3"]) == 1
+        output = capsys.readouterr().out
+        assert output.splitlines() == [
+            f"a.py:{line}:5: PLU002 expected 0 blank lines before return statement, "
+            "found 1"
+            for line in [4, 8]
+        ] + ["b.py:4:5: PLU002 expected 0 blank lines before return statement, found 1"]
+        with pytest.raises(SystemExit):
+            main(args + ["0"])
+
+    def test_ndjson_output_file(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        """Test writing NDJSON to a file."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "a.py").write_text(BAD_CODE, encoding="utf-8")
+        output = tmp_path / "out.ndjson"
+        args = ["check", "--isolated", "--format", "ndjson", "--output-file"]
+        main(args + [str(output), "a.py"])
+        record = json.loads(output.read_text(encoding="utf-8"))
+        assert record["path"] == "a.py"
+        assert record["code"] == "PLU002"
+
+    def test_diff(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ):
+        """Test that only the lines changed by a diff are checked."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "a.py").write_text(BAD_CODE, encoding="utf-8")
+        (tmp_path / "b.py").write_text(BAD_CODE, encoding="utf-8")
+        diff = tmp_path / "changes.diff"
+        diff.write_text("+++ b/a.py\n@@ -1 +1 @@\n", encoding="utf-8")
+        assert main(["check", "--isolated", "-j", "1", "--diff", str(diff)]) == 0
+        diff.write_text("+++ b/b.py\n@@ -2,0 +3 @@\n", encoding="utf-8")
+        assert main(["check", "--isolated", "-j", "1", "--diff", str(diff)]) == 1
+        assert capsys.readouterr().out.startswith("b.py:4:5: PLU002")
+        assert main(["check", "--isolated", "--diff", "missing.diff"]) == 2
+        assert capsys.readouterr().err.startswith("flake8-plus: cannot read diff: ")
+
+
+class TestShard:
+    """Tests for the `--shard` option of the `check` command, and `merge`."""
+
+    def test_shard_and_merge(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ):
+        """Test that the merged reports of all shards match a single run."""
+        monkeypatch.chdir(tmp_path)
+        for index in range(7):
+            code = BAD_CODE * index or "x = 1\n"
+            (tmp_path / f"m{index}.py").write_text(code, encoding="utf-8")
+        main(["check", "--isolated", "-j", "1"])
+        expected = capsys.readouterr().out
+        reports = [str(tmp_path / f"shard{index}.ndjson") for index in range(1, 4)]
+        for index, report in enumerate(reports, 1):
+            args = ["check", "--isolated", "-j", "1", "--shard", f"{index}/3"]
+            assert main(args + ["--output-file", report, "."]) == 1
+        assert main(["merge"] + reports) == 1
+        captured = capsys.readouterr()
+        assert captured.out == expected
+        assert (
+            captured.err == "Merged 3 report(s): 21 problem(s) in 7 file(s) checked.\n"
+        )
+        timings = [arg for report in reports for arg in ["--shard-timings", report]]
+        for index in range(1, 4):
+            args = ["check", "--isolated", "-j", "1", "--shard", f"{index}/3"]
+            main(args + timings + ["--format", "text"])
+        output = capsys.readouterr().out
+        assert sorted(output.splitlines()) == sorted(expected.splitlines())
+
+    def test_merge_incomplete(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ):
+        """Test that reports of shards stopped early cannot be merged."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "a.py").write_text(BAD_CODE * 2, encoding="utf-8")
+        args = ["check", "--isolated", "--shard", "1/1", "--max-violations", "1"]
+        assert main(args + ["--output-file", "shard.ndjson"]) == 1
+        assert main(["merge", "shard.ndjson"]) == 2
+        assert "incomplete" in capsys.readouterr().err
+
+    def test_merge_exactly_max_violations(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ):
+        """Test that reports with as many problems as allowed can be merged."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "a.py").write_text(BAD_CODE, encoding="utf-8")
+        (tmp_path / "b.py").write_text("x = 1\n", encoding="utf-8")
+        args = ["check", "--isolated", "--shard", "1/1", "--max-violations", "1"]
+        assert main(args + ["--format", "report", "--output-file", "shard.ndjson"]) == 1
+        capsys.readouterr()
+        assert main(["merge", "shard.ndjson"]) == 1
+        captured = capsys.readouterr()
+        assert captured.out.startswith("a.py:4:5: PLU002")
+        assert (
+            captured.err == "Merged 1 report(s): 1 problem(s) in 2 file(s) checked.\n"
+        )
+
+
+class TestFix:
+    """Tests for the `fix` command."""
+
+    def test_fix(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ):
+        """Test that files are fixed according to the configuration."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "a.py").write_text(BAD_CODE, encoding="utf-8")
+        assert main(["fix", "--isolated", "-j", "1"]) == 0
+        assert capsys.readouterr().out == (
+            "Fixed 1 problem(s) in a.py\nFixed 1 problem(s) in 1 file(s).\n"
+        )
+        assert main(["check", "--isolated", "-j", "1"]) == 0
+        assert main(["fix", "-q", "--isolated", "--blanks-before-return", "1"]) == 0
+        assert (tmp_path / "a.py").read_text(encoding="utf-8") == BAD_CODE
+
+    def test_fix_selection_and_noqa(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test that rules disabled or suppressed in the configuration are not fixed."""
+        monkeypatch.chdir(tmp_path)
+        noqa = BAD_CODE.replace("return x", "return x  # noqa: PLU002")
+        (tmp_path / "a.py").write_text(noqa, encoding="utf-8")
+        (tmp_path / "b.py").write_text(BAD_CODE, encoding="utf-8")
+        (tmp_path / "tox.ini").write_text("[flake8]\nextend-ignore=PLU002\n")
+        assert main(["fix", "-q", "-j", "1"]) == 0
+        assert (tmp_path / "b.py").read_text(encoding="utf-8") == BAD_CODE
+        (tmp_path / "tox.ini").write_text("[flake8]\n")
+        assert main(["fix", "-q", "-j", "1"]) == 0
+        assert (tmp_path / "a.py").read_text(encoding="utf-8") == noqa
+        assert (tmp_path / "b.py").read_text(encoding="utf-8") != BAD_CODE
+
+
+class TestLsp:
+    """Tests for the `lsp` command."""
+
+    def test_lsp(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ):
+        """Test that the language server reads the configuration and serves stdio."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "tox.ini").write_text("[flake8]\nblanks-before-return=1\n")
+        document = {"uri": "file:///a.py", "version": 1, "text": BAD_CODE}
+        messages = [
+            {"method": "textDocument/didOpen", "params": {"textDocument": document}},
+            {"id": 1, "method": "shutdown"},
+            {"method": "exit"},
+        ]
+        data = b"".join(
+            b"Content-Length: %d\r\n\r\n%s" % (len(body), body)
+            for body in (json.dumps(message).encode() for message in messages)
+        )
+        monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(data)))
+        assert main(["lsp"]) == 0
+        output = capsys.readouterr().out
+        assert '"diagnostics":[]' in output
+        assert '"id":1' in output
@@ -0,0 +1,68 @@
+"""Tests for the config_files module."""
+# pylint: disable=no-self-use
+from pathlib import Path
+
+import pytest
+
+from flake8_plus.config_files import (
+    config_from_options,
+    find_config_file,
+    read_config_file,
+    tomllib,
+)
+from flake8_plus.exceptions import ConfigError
+
+
+class TestConfigFiles:
+    """Tests for reading flake8 configuration files."""
+
+    def test_find_in_parent(self, tmp_path: Path):
+        """Test that configuration files are found in parent folders."""
+        (tmp_path / "tox.ini").write_text("[flake8]\nblanks-before-return=1\n")
+        (tmp_path / "setup.cfg").write_text("[metadata]\nname=x\n")
+        (tmp_path / "sub").mkdir()
+        assert find_config_file(tmp_path / "sub") == tmp_path / "tox.ini"
+
+    def test_find_none(self, tmp_path: Path):
+        """Test that files without a flake8 section are ignored."""
+        (tmp_path / "setup.cfg").write_text("[metadata]\nname=x\n")
+        found = find_config_file(tmp_path)
+        assert found is None or tmp_path not in found.parents
+
+    def test_read_ini(self, tmp_path: Path):
+        """Test reading options from an ini file."""
+        path = tmp_path / ".flake8"
+        path.write_text("[flake8]\nblanks-before-return = 1\nblanks_before_except=2\n")
+        config = config_from_options(read_config_file(path))
+        assert config.blanks_before_imports == 0
+        assert config.blanks_before_return == 1
+        assert config.blanks_before_except == 2
+
+    def test_invalid_value(self, tmp_path: Path):
+        """Test that numbers of blank lines that are not integers are reported."""
+        path = tmp_path / ".flake8"
+        path.write_text("[flake8]\nblanks-before-return = x\n")
+        message = "invalid value 'x' for blanks-before-return, expected an integer"
+        with pytest.raises(ConfigError, match=message):
+            config_from_options(read_config_file(path))
+
+    @pytest.mark.skipif(tomllib is None, reason="requires tomllib or tomli")
+    def test_read_pyproject(self, tmp_path: Path):
+        """Test reading options from a pyproject.toml file."""
+        path = tmp_path / "pyproject.toml"
+        path.write_text(
+            '[tool.flake8]\nblanks-before-imports = 1\nexclude = ["a", "b"]\n'
+        )
+        assert find_config_file(tmp_path) == path
+        options = read_config_file(path)
+        assert config_from_options(options).blanks_before_imports == 1
+        assert options["exclude"] == "a,b"
+
+    def test_read_blank_line_rules(self, tmp_path: Path):
+        """Test reading blank line rules spanning several lines."""
+        path = tmp_path / "setup.cfg"
+        path.write_text(
+            "[flake8]\nblank-line-rules =\n  PLU100:Raise=1\n  PLU101:If=0\n"
+        )
+        config = config_from_options(read_config_file(path))
+        assert config.blank_line_rules == "PLU100:Raise=1\nPLU101:If=0"
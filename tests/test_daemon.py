@@ -0,0 +1,231 @@
+"""Tests for the daemon module."""
+# pylint: disable=no-self-use
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+
+from flake8_plus import daemon as daemon_module
+from flake8_plus.checker import RULES
+from flake8_plus.cli import main
+from flake8_plus.config import Config
+from flake8_plus.daemon import Daemon, default_socket_path, request, start
+from flake8_plus.exceptions import DaemonError
+from flake8_plus.runner import check_file
+from flake8_plus.selection import RuleSelection
+from flake8_plus.version import VERSION
+
+BAD_CODE = "def func():\n    x = 1\n\n    return x\n"
+BAD_CODE_OUTPUT = (
+    "a.py:4:5: PLU002 expected 0 blank lines before return statement, found 1\n"
+)
+
+
+class _OldDaemon(Daemon):
+    """Daemon claiming to be of another version."""
+
+    def handle(self, message: dict) -> dict:
+        """Handle a request like a daemon of another version."""
+        response = super().handle(message)
+        if "version" in response:
+            response["version"] = "old"
+        return response
+
+
+def _serve(daemon: Daemon, path: str) -> threading.Thread:
+    thread = threading.Thread(target=daemon.serve, args=(path,))
+    thread.start()
+    # The socket file exists once bound, but connecting fails until listening.
+    while True:
+        try:
+            request(path, {"command": "status"})
+            return thread
+        except DaemonError:
+            time.sleep(0.01)
+
+
+@pytest.fixture(name="socket_path")
+def fixture_socket_path(tmp_path: Path) -> Iterator[str]:
+    """Serve a daemon in a thread for the duration of a test."""
+    path = str(tmp_path / "daemon.sock")
+    thread = _serve(Daemon(), path)
+    yield path
+    try:
+        request(path, {"command": "stop"})
+    except DaemonError:
+        pass  # Stopped by the test.
+    thread.join()
+
+
+class TestDaemon:
+    """Tests for the `Daemon` class."""
+
+    def test_check(self, tmp_path: Path):
+        """Test that results match the runner and unchanged files are reused."""
+        path = tmp_path / "a.py"
+        path.write_text(BAD_CODE, encoding="utf-8")
+        daemon = Daemon()
+        expected = [check_file(str(path), Config())]
+        assert daemon.check([str(path)], Config()) == expected
+        assert daemon.check([str(path)], Config()) == expected
+        assert daemon.checked == 1
+
+    def test_touched_file_not_checked(self, tmp_path: Path):
+        """Test that a touched file with unchanged contents is not checked again."""
+        path = tmp_path / "a.py"
+        path.write_text(BAD_CODE, encoding="utf-8")
+        daemon = Daemon()
+        daemon.check([str(path)], Config())
+        os.utime(path, (0, 0))
+        daemon.check([str(path)], Config())
+        assert daemon.checked == 1
+
+    def test_changes_checked(self, tmp_path: Path):
+        """Test that changed files and configurations are checked again."""
+        path = tmp_path / "a.py"
+        path.write_text(BAD_CODE, encoding="utf-8")
+        daemon = Daemon()
+        assert daemon.check([str(path)], Config())[0].problems
+        path.write_text(BAD_CODE.replace("\n\n", "\n"), encoding="utf-8")
+        assert not daemon.check([str(path)], Config())[0].problems
+        assert daemon.check([str(path)], Config(0, 1, 0))[0].problems
+        assert daemon.checked == 3
+
+    def test_missing_file(self, tmp_path: Path):
+        """Test that files that cannot be read are reported."""
+        result = Daemon().check([str(tmp_path / "missing.py")], Config())
+        assert result[0].problems[0][2].startswith("E902 FileNotFoundError")
+
+    def test_selection(self, tmp_path: Path):
+        """Test that rules are selected and noqa comments applied per file."""
+        (tmp_path / "sub").mkdir()
+        paths = [str(tmp_path / "a.py"), str(tmp_path / "sub" / "b.py")]
+        noqa = BAD_CODE.replace("return x", "return x  # noqa")
+        for path in paths:
+            Path(path).write_text(noqa + BAD_CODE, encoding="utf-8")
+        options = {"per_file_ignores": "sub/*.py:PLU002"}
+        selection = RuleSelection.from_config(options, RULES, str(tmp_path))
+        daemon = Daemon(jobs=2)
+        results = daemon.check(paths, Config(), selection)
+        assert [len(result.problems) for result in results] == [1, 0]
+        results = daemon.check(paths, Config())
+        assert [len(result.problems) for result in results] == [1, 1]
+        assert daemon.checked == 4
+
+    def test_deleted_files_forgotten(self, tmp_path: Path):
+        """Test that the results of deleted files are not kept."""
+        paths = [tmp_path / "a.py", tmp_path / "b.py"]
+        for path in paths:
+            path.write_text(BAD_CODE, encoding="utf-8")
+        daemon = Daemon()
+        daemon.check([str(path) for path in paths], Config())
+        paths[0].unlink()
+        daemon.check([str(paths[1])], Config())
+        assert daemon.handle({"command": "status"})["files"] == 1
+
+
+class TestServer:
+    """Tests for serving requests on a socket."""
+
+    def test_requests(self, tmp_path: Path, socket_path: str):
+        """Test the status, check and stop requests."""
+        path = tmp_path / "a.py"
+        path.write_text(BAD_CODE, encoding="utf-8")
+        status = request(socket_path, {"command": "status"})
+        assert (status["version"], status["files"]) == (VERSION, 0)
+        message = {"command": "check", "paths": [str(path)], "config": {}}
+        response = request(socket_path, message)
+        assert response["results"][0][1][0][:2] == [4, 4]
+        assert request(socket_path, {"command": "status"})["files"] == 1
+        with pytest.raises(DaemonError):
+            request(socket_path, {"command": "unknown"})
+        assert request(socket_path, {"command": "stop"}) == {"stopping": True}
+
+    def test_not_running(self, tmp_path: Path):
+        """Test that requests fail when the daemon is not running."""
+        with pytest.raises(DaemonError):
+            request(str(tmp_path / "missing.sock"), {"command": "status"})
+
+    def test_cli_check(
+        self,
+        tmp_path: Path,
+        socket_path: str,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ):
+        """Test checking files through the daemon from the command line."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "a.py").write_text(BAD_CODE, encoding="utf-8")
+        args = ["daemon", "check", "--isolated", "--socket", socket_path]
+        assert main(args) == 1
+        assert capsys.readouterr().out == BAD_CODE_OUTPUT
+        assert main(args + ["--blanks-before-return", "1"]) == 0
+
+    def test_cli_check_selection(
+        self,
+        tmp_path: Path,
+        socket_path: str,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ):
+        """Test that the client selects rules from the configuration like `check`."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "a.py").write_text(BAD_CODE, encoding="utf-8")
+        (tmp_path / "sub" / "b.py").write_text(BAD_CODE, encoding="utf-8")
+        config = "[flake8]\nper-file-ignores = sub/*.py: PLU002\n"
+        (tmp_path / "setup.cfg").write_text(config, encoding="utf-8")
+        assert main(["daemon", "check", "--socket", socket_path]) == 1
+        assert capsys.readouterr().out == BAD_CODE_OUTPUT
+
+    def test_other_user(self, socket_path: str, monkeypatch: pytest.MonkeyPatch):
+        """Test that daemons run by another user are not trusted."""
+        other_uid = os.getuid() + 1
+        monkeypatch.setattr(daemon_module.os, "getuid", lambda: other_uid)
+        with pytest.raises(DaemonError, match="run by another user"):
+            request(socket_path, {"command": "status"})
+
+    def test_start_replaces_other_version(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test that a daemon of another version is stopped and replaced."""
+        path = str(tmp_path / "daemon.sock")
+        threads = [_serve(_OldDaemon(), path)]
+
+        def popen(*_args: Any, **_kwargs: Any):
+            threads.append(threading.Thread(target=Daemon().serve, args=(path,)))
+            threads[-1].start()
+
+        monkeypatch.setattr(daemon_module.subprocess, "Popen", popen)
+        assert start(path) == os.getpid()
+        assert not threads[0].is_alive()
+        assert request(path, {"command": "status"})["version"] == VERSION
+        request(path, {"command": "stop"})
+        threads[1].join()
+
+    def test_default_socket_path(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        """Test that the socket path depends on the folder and can be overridden."""
+        monkeypatch.delenv("FLAKE8_PLUS_DAEMON_SOCKET", raising=False)
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+        path = default_socket_path("/a")
+        assert path != default_socket_path("/b")
+        assert Path(path).parent == tmp_path / "flake8-plus"
+        assert (tmp_path / "flake8-plus").stat().st_mode & 0o777 == 0o700
+        monkeypatch.setenv("FLAKE8_PLUS_DAEMON_SOCKET", "/tmp/x.sock")
+        assert default_socket_path("/a") == "/tmp/x.sock"
+
+    def test_default_socket_path_not_private(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test that a socket folder others can access is refused."""
+        monkeypatch.delenv("FLAKE8_PLUS_DAEMON_SOCKET", raising=False)
+        monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+        monkeypatch.setattr(daemon_module.tempfile, "tempdir", str(tmp_path))
+        folder = tmp_path / f"flake8-plus-{os.getuid()}"
+        folder.mkdir(mode=0o755)
+        folder.chmod(0o755)
+        with pytest.raises(DaemonError, match="only accessible by its owner"):
+            default_socket_path("/a")
@@ -0,0 +1,91 @@
+"""Tests for the definitions module."""
+# pylint: disable=no-self-use
+import ast
+import io
+from pathlib import Path
+
+from flake8_plus.cache import ResultCache
+from flake8_plus.checker import check, load_visitors
+from flake8_plus.config import Config
+from flake8_plus.definitions import check_definitions, group_statements
+from flake8_plus.statistics import FileStatistics
+
+CODE = """\
+x = 1
+
+
+def read(path):
+    with open(path, encoding="utf-8") as file:
+        text = file.read()
+
+    return text
+
+
+@decorator
+class Parser:
+
+    def parse(self, text):
+        try:
+            value = int(text)
+
+        except ValueError:
+            value = None
+        return value
+"""
+
+
+def _check(
+    source: str, config: Config, cache: ResultCache
+) -> tuple[list[tuple[int, int, str]], FileStatistics]:
+    lines = io.StringIO(source, newline="").readlines()
+    visitors = load_visitors(rules=config.blank_line_rules)
+    statistics = FileStatistics("module.py")
+    tree = ast.parse(source)
+    results = check_definitions(lines, config, tree, visitors, cache, None, statistics)
+    expected = sorted(
+        (p.line_number, p.col_offset, p.message_with_code)
+        for p in check(lines, config, tree, visitors)
+    )
+    assert results == expected
+    return results, statistics
+
+
+class TestDefinitions:
+    """Tests for checking modules definition by definition."""
+
+    def test_group_statements(self):
+        """Test that chunks start after the previous chunk and share lines."""
+        tree = ast.parse(CODE + "y = 1; z = 2\n")
+        groups = [
+            (offset, end, len(s)) for offset, end, s in group_statements(tree.body)
+        ]
+        assert groups == [(0, 1, 1), (1, 8, 1), (8, 20, 1), (20, 21, 2)]
+
+    def test_unchanged_definitions_not_walked(self, tmp_path: Path):
+        """Test that only the edited definition is walked again."""
+        cache = ResultCache(tmp_path, 100)
+        results, statistics = _check(CODE, Config(), cache)
+        assert [line for line, _, _ in results] == [8, 18]
+        assert _check(CODE, Config(), cache)[1].nodes == 3
+        edited = CODE.replace("        text = file.read()\n\n", "        text = 1\n")
+        results, edited_statistics = _check(edited, Config(), cache)
+        assert [line for line, _, _ in results] == [17]
+        assert 3 < edited_statistics.nodes < statistics.nodes
+
+    def test_previous_statement_type(self, tmp_path: Path):
+        """Test that definitions after statements of another type are checked."""
+        config = Config(blank_line_rules="PLU100:ClassDef:not_after_definition=1")
+        cache = ResultCache(tmp_path, 100)
+        results, _ = _check(CODE, config, cache)
+        assert "PLU100" not in {message[:6] for _, _, message in results}
+        edited = CODE.replace("def read(path):", "for path in []:")
+        results, _ = _check(edited, config, cache)
+        assert "PLU100" in {message[:6] for _, _, message in results}
+
+    def test_module_header_not_cached(self, tmp_path: Path):
+        """Test that module level rules are checked separately on every check."""
+        cache = ResultCache(tmp_path, 100)
+        source = "import os\n\n\ndef f():\n    return os\n"
+        results, _ = _check("\n" + source, Config(), cache)
+        assert [message[:6] for _, _, message in results] == ["PLU001"]
+        assert not _check(source, Config(), cache)[0]
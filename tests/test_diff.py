@@ -0,0 +1,83 @@
+"""Tests for the diff module."""
+# pylint: disable=no-self-use,too-few-public-methods
+import subprocess  # nosec
+from pathlib import Path
+
+import pytest
+
+from flake8_plus.diff import LineRanges, git_diff, parse_unified_diff
+from flake8_plus.exceptions import DiffError
+
+DIFF = """\
+diff --git a/pkg/a.py b/pkg/a.py
+index 1111111..2222222 100644
+--- a/pkg/a.py
++++ b/pkg/a.py
+@@ -3 +3,2 @@ import os
+-x = 1
++x = 2
++y = 3
+@@ -10,2 +11,0 @@ def func():
+-
+-
+@@ -20,0 +21 @@ def other():
++    pass
+diff --git a/gone.py b/gone.py
+deleted file mode 100644
+--- a/gone.py
++++ /dev/null
+@@ -1 +0,0 @@
+-x = 1
+"""
+
+
+class TestLineRanges:
+    """Tests for the `LineRanges` class."""
+
+    def test_merge(self):
+        """Test that overlapping and adjacent ranges are merged."""
+        ranges = LineRanges([(5, 6), (1, 2), (3, 3), (10, 12), (11, 11)])
+        assert list(ranges) == [(1, 3), (5, 6), (10, 12)]
+
+    def test_overlaps(self):
+        """Test whether ranges overlap a range."""
+        ranges = LineRanges([(3, 4), (10, 12)])
+        assert ranges.overlaps(1, 3)
+        assert ranges.overlaps(12, 20)
+        assert ranges.overlaps(5, 10)
+        assert not ranges.overlaps(1, 2)
+        assert not ranges.overlaps(5, 9)
+        assert not ranges.overlaps(13, 13)
+
+    def test_empty(self):
+        """Test that empty ranges overlap nothing."""
+        assert not LineRanges()
+        assert not LineRanges().overlaps(1, 100)
+
+
+class TestParseUnifiedDiff:
+    """Tests for the `parse_unified_diff` function."""
+
+    def test_parse(self):
+        """Test that changed lines are found and deleted files left out."""
+        changed = parse_unified_diff(DIFF)
+        assert changed == {"pkg/a.py": LineRanges([(3, 4), (12, 12), (21, 21)])}
+
+    def test_strip(self):
+        """Test stripping leading path components."""
+        changed = parse_unified_diff("+++ src/pkg/a.py\n@@ -1 +1 @@\n", strip=1)
+        assert changed == {"pkg/a.py": LineRanges([(1, 1)])}
+
+
+class TestGitDiff:
+    """Tests for the `git_diff` function."""
+
+    def test_errors(self, tmp_path: Path):
+        """Test that failures are reported and ranges are never taken for options."""
+        subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)  # nosec
+        with pytest.raises(DiffError, match="nonexistent..HEAD failed: "):
+            git_diff("nonexistent..HEAD", cwd=str(tmp_path))
+        output = tmp_path / "output.diff"
+        with pytest.raises(DiffError, match="--output"):
+            git_diff(f"--output={output}", cwd=str(tmp_path))
+        assert not output.exists()
@@ -0,0 +1,141 @@
+"""Tests for the fixer module."""
+# pylint: disable=no-self-use
+import os
+import stat
+from pathlib import Path
+
+import pytest
+
+from flake8_plus.checker import check
+from flake8_plus.config import Config
+from flake8_plus.fixer import FixResult, fix_file, fix_source, run
+
+CODE = """\
+\"\"\"Docstring.\"\"\"
+
+import os
+
+
+def func():
+    try:
+        x = os.sep
+
+    except ValueError:
+        pass
+    return x
+"""
+
+FIXED = """\
+\"\"\"Docstring.\"\"\"
+import os
+
+
+def func():
+    try:
+        x = os.sep
+    except ValueError:
+        pass
+    return x
+"""
+
+CASE_FILES = sorted((Path(__file__).parent / "case_files").rglob("*.py"))
+CONFIGS = [Config(0, 0, 0), Config(1, 1, 1), Config(2, 0, 3)]
+
+
+class TestFixSource:
+    """Tests for the `fix_source` function."""
+
+    def test_remove_blanks(self):
+        """Test that blank lines are removed."""
+        lines, fixed = fix_source(CODE.splitlines(True), Config())
+        assert "".join(lines) == FIXED
+        assert fixed == 2
+
+    def test_insert_blanks(self):
+        """Test that blank lines are inserted and existing ones kept."""
+        lines, fixed = fix_source(FIXED.splitlines(True), Config(1, 2, 1))
+        assert fixed == 3
+        assert not check(lines, Config(1, 2, 1))
+        assert "".join(lines).count("\n\n\n    return x") == 1
+
+    def test_selection_and_noqa(self):
+        """Test that only enabled rules are fixed, and noqa comments respected."""
+        lines, fixed = fix_source(CODE.splitlines(True), Config(), codes=["PLU001"])
+        assert fixed == 1
+        assert "".join(lines) == CODE.replace("\n\nimport", "\nimport")
+        noqa = CODE.replace("import os", "import os  # noqa").replace(
+            "except ValueError:", "except ValueError:  # noqa: PLU003"
+        )
+        assert fix_source(noqa.splitlines(True), Config()) == (noqa.splitlines(True), 0)
+        lines, fixed = fix_source(noqa.splitlines(True), Config(), noqa=False)
+        assert fixed == 2
+        ignored = ("# flake8: noqa\n" + CODE).splitlines(True)
+        assert fix_source(ignored, Config()) == (ignored, 0)
+
+    def test_line_endings(self):
+        """Test that inserted blank lines use the line ending of the file."""
+        lines, _ = fix_source(FIXED.replace("\n", "\r\n").splitlines(True), Config(1))
+        assert "".join(lines).startswith('"""Docstring."""\r\n\r\nimport os\r\n')
+
+    @pytest.mark.parametrize("path", CASE_FILES, ids=lambda path: path.name)
+    def test_idempotent(self, path: Path):
+        """Test that fixed code has no problems and is not changed by fixing again."""
+        original = path.read_text(encoding="utf-8").splitlines(True)
+        for config in CONFIGS:
+            lines, _ = fix_source(original, config)
+            assert not check(lines, config)
+            assert fix_source(lines, config) == (lines, 0)
+
+
+class TestFixFile:
+    """Tests for fixing files."""
+
+    def test_fix_file(self, tmp_path: Path):
+        """Test that a file is fixed in place and keeps its permissions."""
+        path = tmp_path / "a.py"
+        path.write_text(CODE, encoding="utf-8")
+        path.chmod(0o750)
+        assert fix_file(str(path), Config()) == FixResult(str(path), 2)
+        assert path.read_text(encoding="utf-8") == FIXED
+        assert stat.S_IMODE(path.stat().st_mode) == 0o750
+        assert os.listdir(tmp_path) == ["a.py"]
+
+    def test_unchanged_file_not_written(self, tmp_path: Path):
+        """Test that a file without problems is not written."""
+        path = tmp_path / "a.py"
+        path.write_text(FIXED, encoding="utf-8")
+        os.utime(path, (0, 0))
+        assert fix_file(str(path), Config()) == FixResult(str(path), 0)
+        assert path.stat().st_mtime == 0
+
+    def test_encoding(self, tmp_path: Path):
+        """Test that the declared encoding and byte order mark are kept."""
+        latin = tmp_path / "latin.py"
+        latin.write_bytes(b"# -*- coding: latin-1 -*-\n\nimport os\nx = '\xe9'\n")
+        bom = tmp_path / "bom.py"
+        bom.write_bytes(b"\xef\xbb\xbf\n\nimport os\n")
+        fix_file(str(latin), Config())
+        fix_file(str(bom), Config())
+        assert (
+            latin.read_bytes() == b"# -*- coding: latin-1 -*-\nimport os\nx = '\xe9'\n"
+        )
+        assert bom.read_bytes() == b"\xef\xbb\xbfimport os\n"
+
+    def test_syntax_error(self, tmp_path: Path):
+        """Test that files with syntax errors are reported and left alone."""
+        path = tmp_path / "a.py"
+        path.write_text("def func(:\n\n    return\n", encoding="utf-8")
+        result = fix_file(str(path), Config())
+        assert result.error is not None and result.error.startswith("E999")
+        assert path.read_text(encoding="utf-8") == "def func(:\n\n    return\n"
+
+    def test_run_parallel(self, tmp_path: Path):
+        """Test fixing files in parallel."""
+        paths = []
+        for i in range(4):
+            path = tmp_path / f"{i}.py"
+            path.write_text(CODE * (i + 1), encoding="utf-8")
+            paths.append(str(path))
+        results = sorted(run(paths, Config(), 2))
+        assert [result.fixed for result in results] == [2, 3, 4, 5]
+        assert all(not list(run([path], Config(), 1))[0].fixed for path in paths)
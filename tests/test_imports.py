@@ -0,0 +1,91 @@
+"""Tests for the modules imported by the plugin, and the time importing it takes."""
+# pylint: disable=no-self-use
+import subprocess  # nosec
+import sys
+
+import pytest
+
+# Budget for the number of modules importing the plugin module adds to those imported
+# at startup. Importing it adds about 30 modules; the budget leaves room for new
+# modules but catches heavy imports sneaking back in, without timing the import.
+MODULE_BUDGET = 45
+
+# Budget for importing the plugin module, including the modules it imports, in
+# microseconds. Importing it takes about 20 ms on a laptop; the budget leaves room
+# for slow machines but catches heavy imports sneaking back in.
+IMPORT_BUDGET = 60_000
+
+
+def _import_times(code: str) -> dict[str, int]:
+    completed = subprocess.run(  # nosec
+        [sys.executable, "-X", "importtime", "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def _loaded_modules(code: str) -> set[str]:
+    code = f"{code}\nimport sys\nprint('\\n'.join(sys.modules))"
+    completed = subprocess.run(  # nosec
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    )
+    return set(completed.stdout.splitlines())
+
+
+class TestImports:
+    """Tests for lazy importing."""
+
+    def test_package(self):
+        """Test that importing the package does not import the plugin."""
+        modules = _loaded_modules("import flake8_plus")
+        assert "flake8_plus.plugin" not in modules
+        assert "flake8_plus.checker" not in modules
+
+    def test_plugin(self):
+        """Test that the plugin only imports what checking files needs."""
+        modules = _loaded_modules("from flake8_plus import Plugin")
+        assert "flake8_plus.plugin" in modules
+        for name in (
+            "flake8.options.manager",
+            "flake8_plus.cache",
+            "flake8_plus.statistics",
+            "flake8_plus.diff",
+            "flake8_plus.selection",
+            "flake8_plus.visitors.plu001_visitor",
+            "concurrent.futures.thread",
+        ):
+            assert name not in modules
+
+    def test_plugin_budget(self):
+        """Test that importing the plugin stays within the budget of modules."""
+        modules = _loaded_modules("import flake8_plus.plugin") - _loaded_modules("")
+        assert len(modules) < MODULE_BUDGET
+        third_party = {
+            name
+            for name in modules
+            if name.partition(".")[0] not in sys.stdlib_module_names | {"flake8_plus"}
+        }
+        assert not third_party
+
+    @pytest.mark.slow
+    def test_plugin_import_time(self):
+        """Test that importing the plugin stays within the budget of time."""
+        times = _import_times("import flake8_plus.plugin")
+        assert times["flake8_plus.plugin"] < IMPORT_BUDGET
+
+    def test_load_visitors(self):
+        """Test that only the visitors of the requested rules are imported."""
+        modules = _loaded_modules(
+            "from flake8_plus.checker import load_visitors\nload_visitors(['PLU002'])"
+        )
+        assert "flake8_plus.visitors.plu002_visitor" in modules
+        assert "flake8_plus.visitors.plu001_visitor" not in modules
+        assert "flake8_plus.visitors.plu003_visitor" not in modules
@@ -0,0 +1,67 @@
+"""Tests for the line_index module."""
+# pylint: disable=no-self-use
+import io
+
+import pytest
+
+from flake8_plus.line_index import LineIndex
+
+LINES = [
+    '"""Docstring."""\n',
+    "\n",
+    "   \n",
+    "import ast\n",
+    "def func():\n",
+    "    x = 1\n",
+    "\t\n",
+    "    return x\n",
+]
+
+
+class TestLineIndex:
+    """Tests for the LineIndex class."""
+
+    def test_len(self):
+        """Test that the index has an entry per line."""
+        assert len(LineIndex(LINES)) == len(LINES)
+
+    @pytest.mark.parametrize(
+        ("line_number", "expected"),
+        [(1, 0), (2, 0), (3, 1), (4, 2), (5, 0), (6, 0), (7, 0), (8, 1)],
+    )
+    def test_blanks_before(self, line_number: int, expected: int):
+        """Test counting blank lines immediately preceding a line."""
+        assert LineIndex(LINES).blanks_before(line_number) == expected
+
+    @pytest.mark.parametrize(
+        ("line_number", "expected"), [(1, 0), (4, 0), (6, 4), (8, 4)]
+    )
+    def test_indent(self, line_number: int, expected: int):
+        """Test computing the indentation of a line."""
+        assert LineIndex(LINES).indent(line_number) == expected
+
+    def test_lines_without_line_breaks(self):
+        """Test that lines without trailing line breaks are handled."""
+        index = LineIndex(["import ast", "", "", "x = 1"])
+        assert index.blanks_before(4) == 2
+
+    @pytest.mark.parametrize(
+        "source",
+        [
+            "".join(LINES),
+            "".join(LINES).replace("\n", "\r\n"),
+            "x = 1\n\n  \n\f\ny = 2",
+            "\n\n",
+            "",
+        ],
+    )
+    def test_from_buffer(self, source: str):
+        """Test that an index built from bytes equals one built from lines."""
+        expected = LineIndex(io.StringIO(source, newline="").readlines())
+        actual = LineIndex.from_buffer(source.encode())
+        assert len(actual) == len(expected)
+        for line_number in range(1, len(expected) + 1):
+            assert actual.indent(line_number) == expected.indent(line_number)
+            assert actual.blanks_before(line_number) == expected.blanks_before(
+                line_number
+            )
@@ -0,0 +1,252 @@
+"""Tests for the lsp module."""
+# pylint: disable=no-self-use
+import io
+import json
+from typing import Any
+
+import pytest
+
+from flake8_plus.checker import RULES, check
+from flake8_plus.config import Config
+from flake8_plus.lsp import Document, LanguageServer
+from flake8_plus.selection import RuleSelection
+
+CODE = """\
+import os
+
+
+def read(path):
+    with open(path, encoding="utf-8") as file:
+        text = file.read()
+    return text
+
+
+def parse(text):
+    try:
+        value = int(text)
+    except ValueError:
+        value = None
+    return value
+"""
+
+URI = "file:///project/module.py"
+
+
+def _expected(text: str, config: Config) -> list[tuple[int, int, str]]:
+    lines = io.StringIO(text, newline="").readlines()
+    return sorted(
+        (p.line_number, p.col_offset, p.message_with_code) for p in check(lines, config)
+    )
+
+
+def _message(method: str, params: dict[str, Any], **kwargs: Any) -> dict[str, Any]:
+    return {"jsonrpc": "2.0", "method": method, "params": params, **kwargs}
+
+
+def _change(line: int, character: int, text: str, version: int = 2) -> dict[str, Any]:
+    position = {"line": line, "character": character}
+    change = {"range": {"start": position, "end": position}, "text": text}
+    params = {
+        "textDocument": {"uri": URI, "version": version},
+        "contentChanges": [change],
+    }
+    return _message("textDocument/didChange", params)
+
+
+def _open(text: str) -> dict[str, Any]:
+    document = {"uri": URI, "languageId": "python", "version": 1, "text": text}
+    return _message("textDocument/didOpen", {"textDocument": document})
+
+
+def _frame(message: dict[str, Any]) -> bytes:
+    body = json.dumps(message).encode()
+    return b"Content-Length: %d\r\n\r\n" % len(body) + body
+
+
+def _unframe(data: bytes) -> list[dict[str, Any]]:
+    messages = []
+    while data:
+        header, _, data = data.partition(b"\r\n\r\n")
+        length = int(header.split(b":")[1])
+        messages.append(json.loads(data[:length]))
+        data = data[length:]
+    return messages
+
+
+class TestDocument:
+    """Tests for the `Document` class."""
+
+    def test_problems(self):
+        """Test that a new document has the problems a complete check finds."""
+        assert Document(CODE, Config(1, 1, 1)).problems() == _expected(
+            CODE, Config(1, 1, 1)
+        )
+
+    def test_change_rechecks_edited_chunk(self):
+        """Test that only the edited definition is checked again."""
+        text = CODE + "".join(f"\n\ndef f{i}():\n    return {i}\n" for i in range(100))
+        document = Document(text, Config())
+        document.change((6, 0), (6, 0), "\n")
+        # The blank lines before the definition belong to its chunk.
+        assert document.rechecked_lines == 7
+        assert document.problems() == _expected(document.text, Config())
+        assert document.problems()[0][:2] == (8, 4)
+
+    def test_change_blank_lines_before_next_chunk(self):
+        """Test that blank lines added after a statement are counted for the next."""
+        document = Document("import os\nx = 1\n", Config())
+        document.change((0, 9), (0, 9), "\n")
+        assert document.problems() == _expected("import os\n\nx = 1\n", Config())
+
+    def test_change_previous_statement_type(self):
+        """Test that the statement after an edited statement is checked again."""
+        config = Config(blank_line_rules="PLU100:Assign:not_after_definition=1")
+        document = Document("x = 1\ny = 2\n", config)
+        assert [line for line, _, _ in document.problems()] == [1, 2]
+        document.change((0, 0), (1, 0), "def f(): pass\n")
+        assert document.problems() == _expected(document.text, config)
+        assert not document.problems()
+
+    def test_change_module_header(self):
+        """Test that PLU001 is found in the first chunk holding an import."""
+        document = Document("x = 1\n\nimport os\n", Config())
+        assert [message[:6] for _, _, message in document.problems()] == ["PLU001"]
+        document.change((1, 0), (2, 0), "")
+        assert not document.problems()
+        document.change((0, 0), (0, 0), "\nimport sys\n")
+        assert document.problems() == _expected(document.text, Config())
+        assert document.problems()[0][0] == 2
+
+    def test_syntax_error(self):
+        """Test that syntax errors are reported until they are fixed."""
+        document = Document(CODE, Config())
+        document.change((4, 9), (4, 9), "(")
+        assert [message[:4] for _, _, message in document.problems()] == ["E999"]
+        document.change((4, 9), (4, 10), "")
+        assert document.problems() == _expected(CODE, Config())
+
+    @pytest.mark.parametrize(
+        "text,expected",
+        [("x = 1", "x = 1\n\nimport os\n"), ("x = 1\n", "x = 1\n\n\nimport os\n")],
+    )
+    def test_change_past_end(self, text: str, expected: str):
+        """Test that positions past the last line refer to the end of the document."""
+        document = Document(text, Config())
+        document.change((5, 0), (5, 0), "\n\nimport os\n")
+        assert document.text == expected
+        assert document.problems() == _expected(document.text, Config())
+
+
+class TestLanguageServer:
+    """Tests for the `LanguageServer` class."""
+
+    def test_initialize(self):
+        """Test that incremental synchronization is announced."""
+        server = LanguageServer(Config())
+        (response,) = server.handle(_message("initialize", {}, id=1))
+        assert response["id"] == 1
+        assert response["result"]["capabilities"]["textDocumentSync"]["change"] == 2
+
+    def test_diagnostics(self):
+        """Test that diagnostics are published when documents open and change."""
+        server = LanguageServer(Config())
+        (notification,) = server.handle(_open("def f():\n    x = 1\n    return x\n"))
+        assert notification["params"] == {"uri": URI, "version": 1, "diagnostics": []}
+        (notification,) = server.handle(_change(1, 9, "\n"))
+        params = notification["params"]
+        assert params["version"] == 2
+        assert params["diagnostics"] == [
+            {
+                "range": {
+                    "start": {"line": 3, "character": 4},
+                    "end": {"line": 3, "character": 12},
+                },
+                "severity": 2,
+                "code": "PLU002",
+                "source": "flake8-plus",
+                "message": "expected 0 blank lines before return statement, found 1",
+            }
+        ]
+
+    def test_full_change(self):
+        """Test that changes without a range replace the complete document."""
+        server = LanguageServer(Config())
+        server.handle(_open(CODE))
+        params = {
+            "textDocument": {"uri": URI, "version": 2},
+            "contentChanges": [{"text": "\nimport os\n"}],
+        }
+        (notification,) = server.handle(_message("textDocument/didChange", params))
+        assert server.documents[URI].text == "\nimport os\n"
+        assert notification["params"]["diagnostics"][0]["code"] == "PLU001"
+
+    def test_utf16_positions(self):
+        """Test that columns are converted from and to UTF-16 code units."""
+        server = LanguageServer(Config())
+        server.handle(_open('def f():\n    x = "\U0001f600"\n    return x\n'))
+        # The emoji takes two UTF-16 code units, so the line ends at column 13.
+        server.handle(_change(1, 13, "\n"))
+        text = server.documents[URI].text
+        assert text == 'def f():\n    x = "\U0001f600"\n\n    return x\n'
+
+    def test_close(self):
+        """Test that closing a document clears its diagnostics."""
+        server = LanguageServer(Config())
+        server.handle(_open(CODE))
+        params = {"textDocument": {"uri": URI}}
+        (notification,) = server.handle(_message("textDocument/didClose", params))
+        assert notification["params"] == {"uri": URI, "diagnostics": []}
+        assert not server.documents
+
+    def test_selection_and_noqa(self):
+        """Test that rules are selected and noqa comments applied like in `check`."""
+        bad = "def f():\n    x = 1\n\n    return x\n"
+        server = LanguageServer(Config())
+        (notification,) = server.handle(
+            _open(bad.replace("x\n", "x  # noqa: PLU002\n"))
+        )
+        assert not notification["params"]["diagnostics"]
+        (notification,) = server.handle(_open("# flake8: noqa\n" + bad))
+        assert not notification["params"]["diagnostics"]
+        (notification,) = server.handle(_open(bad))
+        assert notification["params"]["diagnostics"][0]["code"] == "PLU002"
+        (notification,) = server.handle(_change(3, 12, "  # noqa"))
+        assert not notification["params"]["diagnostics"]
+        options = {"per_file_ignores": "/project/*.py:PLU002"}
+        server = LanguageServer(Config(), RuleSelection.from_config(options, RULES))
+        (notification,) = server.handle(_open(bad))
+        assert not notification["params"]["diagnostics"]
+        options = {"disable_noqa": "true"}
+        server = LanguageServer(Config(), RuleSelection.from_config(options, RULES))
+        (notification,) = server.handle(_open("# flake8: noqa\n" + bad))
+        assert notification["params"]["diagnostics"][0]["code"] == "PLU002"
+
+    def test_errors(self):
+        """Test that unknown methods and invalid parameters are reported."""
+        server = LanguageServer(Config())
+        (response,) = server.handle(_message("textDocument/hover", {}, id=1))
+        assert response["error"]["code"] == -32601
+        (response,) = server.handle(_message("textDocument/didOpen", {}, id=2))
+        assert response["error"]["code"] == -32602
+        assert not server.handle(_message("textDocument/didOpen", {}))
+
+    def test_serve(self):
+        """Test that messages are read from and written to streams until exit."""
+        messages = [
+            _message("initialize", {}, id=1),
+            _message("initialized", {}),
+            _open(CODE),
+            _message("shutdown", None, id=2),
+            _message("exit", None),
+            _open(CODE),
+        ]
+        reader = io.BytesIO(b"".join(_frame(message) for message in messages))
+        writer = io.BytesIO()
+        assert LanguageServer(Config()).serve(reader, writer) == 0
+        responses = _unframe(writer.getvalue())
+        assert [response.get("id") for response in responses] == [1, None, 2]
+
+    def test_serve_without_shutdown(self):
+        """Test that the exit code is 1 if the client did not shut the server down."""
+        reader = io.BytesIO(_frame(_message("exit", None)))
+        assert LanguageServer(Config()).serve(reader, io.BytesIO()) == 1
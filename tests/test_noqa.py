@@ -0,0 +1,67 @@
+"""Tests for the noqa module."""
+# pylint: disable=no-self-use
+import io
+
+import pytest
+
+from flake8_plus.checker import check
+from flake8_plus.config import Config
+from flake8_plus.noqa import filter_noqa, is_file_ignored
+
+CODE = """\
+def first():
+    x = 1
+
+    return x{}
+
+
+def second():
+    x = 1
+
+    return '''
+    {}
+    '''{}
+"""
+
+
+def _codes(source: str) -> list[tuple[int, str]]:
+    lines = io.StringIO(source).readlines()
+    from_lines = filter_noqa(check(lines, Config()), lines)
+    from_buffer = filter_noqa(check(lines, Config()), source.encode("utf-8"))
+    results = [(p.line_number, p.code) for p in from_lines]
+    assert [(p.line_number, p.code) for p in from_buffer] == results
+    return results
+
+
+class TestNoqa:
+    """Tests for applying noqa comments."""
+
+    @pytest.mark.parametrize(
+        "comment,suppressed",
+        [
+            ("  # noqa", True),
+            ("  # NOQA:PLU002", True),
+            ("  # noqa: E501,PLU002", True),
+            ("  # noqa: PLU", True),
+            ("  # noqa: PLU003", False),
+            ("  # noqa : PLU003", True),
+        ],
+    )
+    def test_inline(self, comment: str, suppressed: bool):
+        """Test that blanket comments and comments naming the code suppress."""
+        expected = [] if suppressed else [(4, "PLU002")]
+        assert _codes(CODE.format(comment, "", "")) == expected + [(10, "PLU002")]
+
+    def test_multi_line_string(self):
+        """Test that a comment after a multi-line string applies to all its lines."""
+        assert _codes(CODE.format("", "", "  # noqa")) == [(4, "PLU002")]
+        assert _codes(CODE.format("", "# noqa", "")) == [(4, "PLU002")]
+
+    def test_file(self):
+        """Test that files with a line starting with `# flake8: noqa` are ignored."""
+        for source in ["# flake8: noqa\n", "x = 1\n  # FLAKE8=noqa: E501\r"]:
+            assert is_file_ignored(io.StringIO(source, newline="").readlines())
+            assert is_file_ignored(source.encode("utf-8"))
+        for source in ["x = 1  # flake8: noqa\n", "# noqa\n"]:
+            assert not is_file_ignored(io.StringIO(source, newline="").readlines())
+            assert not is_file_ignored(source.encode("utf-8"))
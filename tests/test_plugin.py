@@ -1,9 +1,17 @@
 """Tests for the plugin module."""
 # pylint: disable=no-self-use,protected-access
 import ast
+from argparse import Namespace
+from pathlib import Path
+
+import pytest
 
 from flake8_plus import Plugin
+from flake8_plus import plugin as plugin_module
+from flake8_plus.cache import ResultCache
+from flake8_plus.checker import RULES
 from flake8_plus.config import Config
+from flake8_plus.selection import RuleSelection
 
 
 def _results(code: str, blanks_before_imports: int) -> set[str]:
@@ -38,3 +46,47 @@ class TestPlugin:
         """Test that no problem is detected for docstring, comment, import."""
         code = '"""Docstring."""\nimport ast'
         assert _results(code, 0) == set()
+
+    def test_cache_replays_results(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test that cached results are replayed without using the tree."""
+        monkeypatch.setattr(Plugin, "cache", ResultCache(tmp_path, 10))
+        code = '"""Docstring."""\n\nimport ast\n'
+        expected = _results(code, 0)
+        plugin = Plugin(None, code.split("\n"))  # type: ignore
+        actual = {f"{line}:{col+1} {msg}" for line, col, msg, _ in plugin.run()}
+        assert actual == expected
+
+    def test_cache_reuses_definitions(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test that the results of unchanged definitions of edited files are reused."""
+        monkeypatch.setattr(plugin_module, "DEFINITIONS_MIN_LINES", 0)
+        code = "def f():\n    x = 1\n\n    return x\n\n\ndef g():\n    return 1\n"
+        expected = _results(code, 0)
+        edited = code.replace("def g():\n", "def g():\n    y = 1\n\n")
+        expected_edited = _results(edited, 0)
+        monkeypatch.setattr(Plugin, "cache", ResultCache(tmp_path, 10))
+        assert _results(code, 0) == expected
+        assert _results(edited, 0) == expected_edited
+        # The file, and each definition of both versions of the file.
+        assert len(Plugin.cache) == 5  # type: ignore
+
+    def test_disabled_rules_not_checked(self, monkeypatch: pytest.MonkeyPatch):
+        """Test that the visitors of disabled rules are not run."""
+        options = Namespace(
+            select=None,
+            ignore=None,
+            extend_select=None,
+            extend_ignore=["PLU001"],
+            extended_default_select=["PLU"],
+            extended_default_ignore=[],
+            per_file_ignores="skipped.py:PLU",
+        )
+        monkeypatch.setattr(Plugin, "selection", RuleSelection(options, RULES))
+        code = '"""Docstring."""\n\nimport ast\n'
+        assert not _results(code, 0)
+        # The file would fail to parse if it was checked.
+        plugin = Plugin(None, ["def func(:\n"], "skipped.py")  # type: ignore
+        assert not list(plugin.run())
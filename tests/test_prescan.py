@@ -0,0 +1,70 @@
+"""Tests for the prescan module."""
+# pylint: disable=no-self-use
+import ast
+
+import pytest
+
+from flake8_plus.checker import check, check_buffer, load_visitors
+from flake8_plus.config import Config
+from flake8_plus.prescan import prescan
+from flake8_plus.statistics import FileStatistics
+from flake8_plus.visitors.plu001_visitor import PLU001Visitor
+from flake8_plus.visitors.plu002_visitor import PLU002Visitor
+from flake8_plus.visitors.plu003_visitor import PLU003Visitor
+
+CONSTANTS = '"""Constants."""\nX = 1\n\nY = 2\n'
+
+
+class TestPrescan:
+    """Tests for the `prescan` function."""
+
+    @pytest.mark.parametrize(
+        "source_code,expected",
+        [
+            (CONSTANTS, []),
+            ("import os\n", [PLU001Visitor]),
+            ("def f():\n\n    return 1\n", [PLU002Visitor]),
+            ("try:\n    pass\nexcept ValueError:\n    pass\n", [PLU003Visitor]),
+            # Keywords in comments, strings and names are found too.
+            ("# return\nreturned = 'except'\n", [PLU002Visitor, PLU003Visitor]),
+        ],
+    )
+    def test_prescan(self, source_code: str, expected: list):
+        """Test that only visitors whose keywords occur are run."""
+        visitors = load_visitors()
+        for source in [source_code.splitlines(True), source_code.encode()]:
+            run, skipped = prescan(source, visitors)
+            assert run == expected
+            assert skipped == [v for v in visitors if v not in expected]
+
+    def test_visitors_without_keywords(self):
+        """Test that visitors without keywords are always run."""
+        visitors = load_visitors(rules="PLU100:Assign=1")
+        run, skipped = prescan(CONSTANTS.splitlines(True), visitors)
+        assert run == visitors[-1:]
+        assert len(skipped) == 3
+
+    def test_results_unchanged(self):
+        """Test that skipping visitors does not change the problems found."""
+        source_code = "import os\nX = 1\ndef f():\n    return 1\n"
+        lines = source_code.splitlines(True)
+        for visitor in load_visitors():
+            instance = visitor(lines, Config())
+            instance.visit(ast.parse(source_code))
+            if instance.problems:
+                assert visitor in prescan(lines, [visitor])[0]
+
+    def test_statistics(self):
+        """Test that skipped visitors and walks are recorded in the statistics."""
+        statistics = FileStatistics("constants.py")
+        assert not check(CONSTANTS.splitlines(True), Config(), statistics=statistics)
+        record = statistics.to_dict()
+        assert record["walk_skipped"]
+        assert record["nodes"] == 0
+        assert {rule["skipped"] for rule in record["rules"].values()} == {1}
+        statistics = FileStatistics("module.py")
+        check_buffer(b"def f():\n    return 1\n", Config(), statistics=statistics)
+        record = statistics.to_dict()
+        assert not record["walk_skipped"]
+        assert record["rules"]["PLU002Visitor"]["skipped"] == 0
+        assert record["rules"]["PLU003Visitor"]["skipped"] == 1
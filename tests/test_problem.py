@@ -0,0 +1,32 @@
+"""Tests for the problem module."""
+# pylint: disable=no-self-use
+import pytest
+
+from flake8_plus.visitors.plu002_visitor import PLU002Problem
+from flake8_plus.visitors.plu003_visitor import PLU003Problem
+
+
+class TestProblem:
+    """Tests for the `Problem` class."""
+
+    def test_slots(self):
+        """Test that problems have no instance dictionary."""
+        problem = PLU002Problem(3, 4, 1, 0)
+        assert not hasattr(problem, "__dict__")
+        with pytest.raises(AttributeError):
+            problem.extra = 1  # pylint: disable=assigning-non-slot
+
+    def test_message(self):
+        """Test that messages are formatted with and without the code."""
+        problem = PLU003Problem(
+            line_number=3, col_offset=4, blanks_actual=2, blanks_expected=1
+        )
+        assert problem.message == "expected 1 blank lines before except, found 2"
+        assert problem.message_with_code == f"PLU003 {problem.message}"
+
+    def test_messages_shared(self):
+        """Test that problems with the same code and counts share their message."""
+        first = PLU002Problem(3, 4, 1, 0).message_with_code
+        second = PLU002Problem(30, 8, 1, 0).message_with_code
+        assert first is second
+        assert PLU003Problem(3, 4, 1, 0).message_with_code.startswith("PLU003")
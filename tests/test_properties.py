@@ -0,0 +1,224 @@
+"""Property based tests comparing the optimized engines with the reference visitor."""
+# pylint: disable=no-self-use,too-few-public-methods
+import ast
+import io
+import tempfile
+
+from hypothesis import HealthCheck, given, settings
+from hypothesis import strategies as st
+
+from flake8_plus.cache import ResultCache
+from flake8_plus.checker import check, check_buffer, load_visitors
+from flake8_plus.config import Config
+from flake8_plus.definitions import check_definitions
+from flake8_plus.diff import LineRanges
+from flake8_plus.fixer import fix_source
+from flake8_plus.line_index import LineIndex
+from flake8_plus.lsp import Document
+from flake8_plus.visitors.fused_visitor import FusedVisitor
+
+from .reference import Result, reference_results
+
+SETTINGS = settings(
+    max_examples=100, deadline=None, suppress_health_check=[HealthCheck.too_slow]
+)
+
+BLANKS = st.lists(st.sampled_from(["\n", "    \n", "\t\n"]), max_size=3).map("".join)
+RETURNED = st.sampled_from(["", " x", " f(\n)"])
+SIMPLE = st.sampled_from(
+    ["pass", "x = 1", "print(x)", "# Comment.\npass", "y = [\n1,\n]"]
+)
+
+
+@st.composite
+def _block(draw: st.DrawFn, indent: int, depth: int) -> str:
+    parts = []
+    for _ in range(draw(st.integers(1, 4))):
+        parts.append(draw(BLANKS))
+        parts.append(draw(_statement(indent, depth)))
+    return "".join(parts)
+
+
+@st.composite
+def _statement(  # pylint: disable=too-many-branches,too-many-return-statements
+    draw: st.DrawFn, indent: int, depth: int
+) -> str:
+    pad = " " * indent
+    kinds = ["simple", "return", "inline_return", "import"]
+    if depth > 0:
+        kinds += ["def", "async_def", "one_line_def", "class", "try", "if", "for"]
+    kind = draw(st.sampled_from(kinds))
+    if kind == "simple":
+        return "".join(f"{pad}{line}\n" for line in draw(SIMPLE).split("\n"))
+    if kind == "return":
+        return f"{pad}return{draw(RETURNED)}\n"
+    if kind == "inline_return":
+        return f"{pad}x = 1; return x\n"
+    if kind == "import":
+        return f"{pad}{draw(st.sampled_from(['import os', 'from os import sep']))}\n"
+    if kind == "one_line_def":
+        return f"{pad}def f(): return 1\n"
+    body = draw(_block(indent + 4, depth - 1))
+    if kind in ("def", "async_def"):
+        prefix = "async def" if kind == "async_def" else "def"
+        decorator = draw(st.sampled_from(["", f"{pad}@decorator\n"]))
+        return f"{decorator}{pad}{prefix} f():\n{body}"
+    if kind == "class":
+        return f"{pad}class C:\n{body}"
+    if kind == "try":
+        parts = [f"{pad}try:\n{body}"]
+        for _ in range(draw(st.integers(1, 3))):
+            parts.append(draw(BLANKS))
+            parts.append(f"{pad}except ValueError:\n")
+            parts.append(draw(_block(indent + 4, depth - 1)))
+        for clause in ("else", "finally"):
+            if draw(st.booleans()):
+                parts.append(draw(BLANKS))
+                parts.append(f"{pad}{clause}:\n")
+                parts.append(draw(_block(indent + 4, depth - 1)))
+        return "".join(parts)
+    if kind == "if":
+        return f"{pad}if x:\n{body}"
+    return f"{pad}for x in y:\n{body}"
+
+
+@st.composite
+def modules(draw: st.DrawFn) -> str:
+    """
+    Generate the source code of a random, valid module.
+
+    Args:
+        draw (st.DrawFn): The function drawing values from other strategies.
+
+    Returns:
+        str: The source code.
+    """
+    parts = [draw(st.sampled_from(["", '"""Docstring."""\n', "#!/bin/python\n"]))]
+    for _ in range(draw(st.integers(0, 5))):
+        parts.append(draw(BLANKS))
+        parts.append(draw(_statement(0, 2)))
+    parts.append(draw(BLANKS))
+    return "".join(parts)
+
+
+EDITS = st.lists(
+    st.tuples(
+        st.integers(0, 40),
+        st.sampled_from(
+            ["", "\n", "x = 1\n", "import os\n", "def f():\n    return 1\n"]
+        ),
+        st.booleans(),
+    ),
+    max_size=5,
+)
+
+CONFIGS = st.builds(
+    Config,
+    blanks_before_imports=st.integers(0, 2),
+    blanks_before_return=st.integers(0, 2),
+    blanks_before_except=st.integers(0, 2),
+)
+
+
+def _results(problems: list) -> set[Result]:
+    return {(p.line_number, p.col_offset, p.message_with_code) for p in problems}
+
+
+def _lines(source_code: str) -> list[str]:
+    return io.StringIO(source_code).readlines()
+
+
+class TestEquivalence:
+    """Tests comparing the optimized engines with the reference visitor."""
+
+    @SETTINGS
+    @given(source_code=modules(), config=CONFIGS)
+    def test_check(self, source_code: str, config: Config):
+        """Test that the fused visitor finds the same problems as the reference."""
+        expected = reference_results(source_code, config)
+        assert _results(check(_lines(source_code), config)) == expected
+
+    @SETTINGS
+    @given(source_code=modules(), config=CONFIGS)
+    def test_visitors_alone(self, source_code: str, config: Config):
+        """Test that each visitor walking the tree alone finds the same problems."""
+        lines = _lines(source_code)
+        tree = ast.parse(source_code)
+        problems = []
+        for cls in load_visitors():
+            visitor = cls(lines, config)
+            visitor.visit(tree)
+            problems.extend(visitor.problems)
+        assert _results(problems) == reference_results(source_code, config)
+
+    @SETTINGS
+    @given(source_code=modules(), config=CONFIGS)
+    def test_full_walk(self, source_code: str, config: Config):
+        """Test that walking expressions too does not change the problems found."""
+        lines = _lines(source_code)
+        line_index = LineIndex(lines)
+        visitors = [cls(lines, config, line_index) for cls in load_visitors()]
+        fused = FusedVisitor(visitors, statements_only=False)
+        fused.visit(ast.parse(source_code))
+        assert _results(fused.problems) == reference_results(source_code, config)
+
+    @SETTINGS
+    @given(source_code=modules(), config=CONFIGS)
+    def test_check_buffer(self, source_code: str, config: Config):
+        """Test that checking the encoded source code finds the same problems."""
+        problems = check_buffer(source_code.encode(), config)
+        assert _results(problems) == reference_results(source_code, config)
+
+    @SETTINGS
+    @given(source_code=modules(), config=CONFIGS)
+    def test_all_lines_changed(self, source_code: str, config: Config):
+        """Test that checking all lines as changed finds the same problems."""
+        lines = _lines(source_code)
+        changed = LineRanges([(1, len(lines))])
+        problems = check(lines, config, changed=changed)
+        assert _results(problems) == reference_results(source_code, config)
+
+    @SETTINGS
+    @given(source_code=modules(), config=CONFIGS, edits=EDITS)
+    def test_document_edits(
+        self, source_code: str, config: Config, edits: list[tuple[int, str, bool]]
+    ):
+        """Test that documents checked incrementally find the same problems."""
+        document = Document(source_code, config)
+        for line, text, delete in edits:
+            document.change((line, 0), (line + delete, 0), text)
+            if document.syntax_error is None:
+                expected = reference_results(document.text, config)
+                assert set(document.problems()) == expected
+
+    @SETTINGS
+    @given(source_code=modules(), config=CONFIGS, edits=EDITS)
+    def test_cached_definitions(
+        self, source_code: str, config: Config, edits: list[tuple[int, str, bool]]
+    ):
+        """Test that reusing the problems of cached definitions finds the same."""
+        lines = _lines(source_code)
+        visitors = load_visitors()
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ResultCache(directory, 1000)
+            for line, text, delete in [(0, "", False)] + edits:
+                lines[line : line + delete] = _lines(text)
+                try:
+                    tree = ast.parse("".join(lines))
+                except SyntaxError:
+                    continue
+                problems = check_definitions(lines, config, tree, visitors, cache)
+                assert set(problems) == _results(check(lines, config, tree))
+
+
+class TestFixer:
+    """Tests of properties of the fixer."""
+
+    @SETTINGS
+    @given(source_code=modules(), config=CONFIGS)
+    def test_fixed(self, source_code: str, config: Config):
+        """Test that fixed source code has no problems and is fixed idempotently."""
+        fixed_lines, _ = fix_source(_lines(source_code), config)
+        fixed = "".join(fixed_lines)
+        assert not reference_results(fixed, config)
+        assert fix_source(_lines(fixed), config) == (_lines(fixed), 0)
@@ -0,0 +1,95 @@
+"""Tests for the rules module."""
+# pylint: disable=no-self-use
+import ast
+
+import pytest
+
+from flake8_plus.checker import check, load_visitors, rule_codes
+from flake8_plus.config import Config
+from flake8_plus.exceptions import RuleError
+from flake8_plus.rules import compile_rules, parse_rules
+
+CODE = """\
+def func(x):
+    if x:
+        raise ValueError(x)
+    with open(x):
+        pass
+
+    raise TypeError(x)
+"""
+
+RULES = "PLU100:Raise=1,\nPLU101:With|AsyncWith:nested=1"
+
+
+class TestParseRules:
+    """Tests for the `parse_rules` function."""
+
+    def test_parse(self):
+        """Test parsing rules separated by commas and newlines."""
+        rules = parse_rules(RULES)
+        assert len(rules) == 2
+        first, second = rules[0], rules[1]
+        assert first.problem.code == "PLU100"
+        assert first.node_types == (ast.Raise,)
+        assert first.expected == 1
+        assert not first.predicates
+        assert second.problem.code == "PLU101"
+        assert second.node_types == (ast.With, ast.AsyncWith)
+        assert second.predicates == ("nested",)
+
+    def test_empty(self):
+        """Test that no rules are configured by default."""
+        assert not parse_rules("")
+        assert not parse_rules(" ,\n")
+
+    @pytest.mark.parametrize(
+        ("text", "message"),
+        [
+            ("PLU100=1", "invalid blank line rule"),
+            ("PLU100:Raise", "invalid blank line rule"),
+            ("PLU001:Raise=1", "invalid code"),
+            ("E100:Raise=1", "invalid code"),
+            ("PLU100:Raise=1,PLU100:With=0", "duplicate blank line rule"),
+            ("PLU100:Raises=1", "invalid node type"),
+            ("PLU100:arguments=1", "invalid node type"),
+            ("PLU100:Raise:first=1", "unknown predicate"),
+        ],
+    )
+    def test_invalid(self, text: str, message: str):
+        """Test that invalid rules are reported."""
+        with pytest.raises(RuleError, match=message):
+            parse_rules(text)
+
+
+class TestConfiguredRules:
+    """Tests for checking configured rules."""
+
+    def test_check(self):
+        """Test that configured rules are checked along with the builtin rules."""
+        problems = check(CODE.splitlines(True), Config(blank_line_rules=RULES))
+        messages = sorted((p.line_number, p.message_with_code) for p in problems)
+        assert messages == [
+            (3, "PLU100 expected 1 blank lines before Raise, found 0"),
+            (4, "PLU101 expected 1 blank lines before With or AsyncWith, found 0"),
+        ]
+
+    def test_single_visitor(self):
+        """Test that all configured rules are checked by a single visitor."""
+        visitors = load_visitors(rules=RULES)
+        assert visitors[:-1] == load_visitors()
+        assert visitors[-1] is compile_rules(parse_rules(RULES))
+        assert set(visitors[-1].handlers) == {ast.Raise, ast.With, ast.AsyncWith}
+
+    def test_selected_codes(self):
+        """Test that only the visitors of the selected rules are loaded."""
+        visitors = load_visitors(["PLU002", "PLU101"], RULES)
+        names = [visitor.__name__ for visitor in visitors]
+        assert names == ["PLU002Visitor", "ConfiguredRulesVisitor"]
+        assert [r.problem.code for r in visitors[-1].rules] == ["PLU101"]
+        assert load_visitors(["PLU002"], RULES) == load_visitors(["PLU002"])
+
+    def test_rule_codes(self):
+        """Test that the codes of the configured rules are included."""
+        codes = rule_codes(Config(blank_line_rules=RULES))
+        assert codes == {"PLU001", "PLU002", "PLU003", "PLU100", "PLU101"}
@@ -0,0 +1,169 @@
+"""Tests for the runner module."""
+# pylint: disable=no-self-use
+import json
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from flake8_plus.config import Config
+from flake8_plus.diff import LineRanges
+from flake8_plus.runner import (
+    FileResult,
+    check_file,
+    discover_files,
+    format_ndjson,
+    format_report,
+    format_text,
+    make_chunks,
+    run,
+    run_sources,
+)
+
+CASE_FILES = sorted((Path(__file__).parent / "case_files").rglob("*.py"))
+PADDING = "x" * 200
+BAD_CODE = '"""Docstring."""\n\nimport os\n\n\ndef func():\n\n    return os\n'
+
+
+def _write_tree(root: Path) -> list[str]:
+    files = {
+        "a.py": BAD_CODE,
+        "pkg/b.py": BAD_CODE * 3,
+        "pkg/c.txt": "not python",
+        ".git/d.py": BAD_CODE,
+        "pkg/__pycache__/e.py": BAD_CODE,
+    }
+    for name, content in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+    return [str(root / "a.py"), str(root / "pkg" / "b.py")]
+
+
+class TestRunner:
+    """Tests for the standalone runner."""
+
+    def test_discover_files(self, tmp_path: Path):
+        """Test that Python files are found and excluded folders skipped."""
+        expected = _write_tree(tmp_path)
+        assert discover_files([str(tmp_path)]) == expected
+
+    def test_discover_files_exclude(self, tmp_path: Path):
+        """Test that exclude patterns match names and absolute paths."""
+        _write_tree(tmp_path)
+        files = discover_files([str(tmp_path)], [str(tmp_path / "pkg"), ".git"])
+        assert files == [str(tmp_path / "a.py")]
+
+    def test_check_file(self, tmp_path: Path):
+        """Test checking a file."""
+        path = tmp_path / "a.py"
+        path.write_text(BAD_CODE, encoding="utf-8")
+        result = check_file(str(path), Config())
+        assert [(line, col) for line, col, _ in result.problems] == [(3, 0), (8, 4)]
+
+    def test_check_file_max_problems(self, tmp_path: Path):
+        """Test that checking stops once the maximum number of problems is found."""
+        path = tmp_path / "a.py"
+        path.write_text(BAD_CODE, encoding="utf-8")
+        result = check_file(str(path), Config(), max_problems=1)
+        assert [(line, col) for line, col, _ in result.problems] == [(3, 0)]
+        result = check_file(str(path), Config(), mmap_threshold=1, max_problems=1)
+        assert [(line, col) for line, col, _ in result.problems] == [(3, 0)]
+
+    def test_check_file_syntax_error(self, tmp_path: Path):
+        """Test that syntax errors are reported like flake8 does."""
+        path = tmp_path / "a.py"
+        path.write_text("def func(:\n    pass\n", encoding="utf-8")
+        result = check_file(str(path), Config())
+        assert result.problems[0][2].startswith("E999 SyntaxError")
+
+    def test_make_chunks(self, tmp_path: Path):
+        """Test that files are chunked by size, largest first."""
+        paths = []
+        for i, size in enumerate([1000, 10, 10, 10, 500]):
+            path = tmp_path / f"{i}.py"
+            path.write_text("#" * size)
+            paths.append(str(path))
+        chunks = make_chunks(paths, 1)
+        assert chunks[0] == [paths[0]]
+        assert sorted(p for chunk in chunks for p in chunk) == sorted(paths)
+
+    def test_run_parallel(self, tmp_path: Path):
+        """Test that checking in parallel gives the same results as serially."""
+        paths = _write_tree(tmp_path)
+        serial = sorted(run(paths, Config(), 1))
+        parallel = sorted(run(paths, Config(), 2))
+        assert parallel == serial
+
+    def test_run_sources(self, tmp_path: Path):
+        """Test that the contents given are checked, not those of the files."""
+        paths = _write_tree(tmp_path)
+        expected = sorted(run(paths, Config(), 1))
+        sources = {path: Path(path).read_bytes() for path in paths}
+        for path in paths:
+            Path(path).write_text("x = 1\n", encoding="utf-8")
+        assert sorted(run_sources(sources, Config(), 1)) == expected
+        assert sorted(run_sources(sources, Config(), 2)) == expected
+
+    def test_formats(self, tmp_path: Path):
+        """Test the text and NDJSON output formats."""
+        path = tmp_path / "a.py"
+        path.write_text(BAD_CODE, encoding="utf-8")
+        result = check_file(str(path), Config())
+        text = list(format_text(result))
+        assert text[0] == (
+            f"{path}:3:1: PLU001 expected 0 blank lines before first import, found 1"
+        )
+        record = json.loads(next(format_ndjson(result)))
+        assert record["code"] == "PLU001"
+        assert record["line"] == 3
+        assert record["column"] == 1
+
+    def test_run_timed(self, tmp_path: Path):
+        """Test that timed runs report the time spent on each file."""
+        paths = _write_tree(tmp_path)
+        assert all(result.seconds == 0 for result in run(paths, Config(), 1))
+        for jobs in [1, 2]:
+            results = sorted(run(paths, Config(), jobs, timed=True))
+            assert all(result.seconds > 0 for result in results)
+            records = [json.loads(line) for line in format_report(results[0])]
+            assert records[-1] == {
+                "file": results[0].path,
+                "problems": 2,
+                "seconds": results[0].seconds,
+            }
+            assert [record["line"] for record in records[:-1]] == [3, 8]
+
+    def test_run_changed(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        """Test that only files and lines in the changed lines are checked."""
+        monkeypatch.chdir(tmp_path)
+        _write_tree(tmp_path)
+        changed = {"pkg/b.py": LineRanges([(14, 16)])}
+        message = "PLU002 expected 0 blank lines before return statement, found 1"
+        for jobs in (1, 2):
+            results = list(run(["a.py", "pkg/b.py"], Config(), jobs, changed))
+            assert results == [FileResult("pkg/b.py", [(16, 4, message)])]
+
+    def test_check_file_mapped(self, tmp_path: Path):
+        """Test that memory-mapped files give the same results as read files."""
+        for case_file in CASE_FILES:
+            expected = check_file(str(case_file), Config(), mmap_threshold=0)
+            actual = check_file(str(case_file), Config(), mmap_threshold=1)
+            assert actual == expected
+        path = tmp_path / "a.py"
+        path.write_bytes(BAD_CODE.replace("\n", "\r").encode())
+        expected = check_file(str(path), Config(), mmap_threshold=0)
+        assert check_file(str(path), Config(), mmap_threshold=1) == expected
+
+    def test_check_file_mapped_memory(self, tmp_path: Path):
+        """Test that memory-mapping a file does not materialize its lines."""
+        path = tmp_path / "generated.py"
+        rows = "".join(f"    'row {i:08d} {PADDING}',\n" for i in range(5000))
+        path.write_text(f"ROWS = [\n{rows}]\n", encoding="utf-8")
+        peaks = []
+        for mmap_threshold in [0, 1]:
+            tracemalloc.start()
+            check_file(str(path), Config(), mmap_threshold=mmap_threshold)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        assert peaks[0] - peaks[1] > path.stat().st_size
@@ -0,0 +1,94 @@
+"""Tests guarding against checking time growing super-linearly with file size."""
+# pylint: disable=no-self-use
+import ast
+import io
+import math
+import time
+
+import pytest
+
+from benchmarks.corpus import CORPORA
+from flake8_plus.checker import check
+from flake8_plus.config import Config
+from flake8_plus.statistics import FileStatistics
+
+# The slope of log time against log lines: 1 is linear and 2 is quadratic. Timings of
+# small files are dominated by constant overhead, so a linear check has a slope < 1.
+MAX_SLOPE = 1.5
+REPEAT = 5
+
+# The work done per line of a larger file may only differ from that of a small file by
+# the rounding of the corpus to whole units.
+MAX_WORK_GROWTH = 1.05
+
+# Corpora with many blank lines or cheap trees are scaled further than the others.
+LARGE_CORPORA = ["blank_runs", "many_returns", "many_handlers"]
+
+
+def _source(name: str, target_lines: int) -> str:
+    unit = CORPORA[name](1.0).count("\n")
+    return CORPORA[name](target_lines / unit)
+
+
+def _time_check(name: str, target_lines: int) -> tuple[int, float]:
+    source_code = _source(name, target_lines)
+    lines = io.StringIO(source_code).readlines()
+    tree = ast.parse(source_code)
+    config = Config()
+    best = math.inf
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        check(lines, config, tree=tree)
+        best = min(best, time.perf_counter() - start)
+    return len(lines), best
+
+
+def _work_per_line(name: str, target_lines: int) -> tuple[float, float]:
+    source_code = _source(name, target_lines)
+    lines = io.StringIO(source_code).readlines()
+    statistics = FileStatistics(name)
+    check(lines, Config(), tree=ast.parse(source_code), statistics=statistics)
+    queries = sum(rule.blank_queries for rule in statistics.rules.values())
+    return statistics.nodes / len(lines), queries / len(lines)
+
+
+def _slope(timings: list[tuple[int, float]]) -> float:
+    points = [(math.log(lines), math.log(seconds)) for lines, seconds in timings]
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    return covariance / sum((x - mean_x) ** 2 for x, _ in points)
+
+
+def _assert_linear(name: str, sizes: list[int]):
+    timings = [_time_check(name, size) for size in sizes]
+    slope = _slope(timings)
+    assert slope < MAX_SLOPE, f"{name} scales with slope {slope:.2f}: {timings}"
+
+
+class TestScaling:
+    """Tests of the growth of checking time with file size."""
+
+    @pytest.mark.parametrize("name", sorted(CORPORA))
+    def test_linear(self, name: str):
+        """Test that the nodes walked and blank line queries grow linearly."""
+        nodes, queries = _work_per_line(name, 1_000)
+        for size in [3_000, 10_000]:
+            larger_nodes, larger_queries = _work_per_line(name, size)
+            assert larger_nodes <= nodes * MAX_WORK_GROWTH
+            assert larger_queries <= queries * MAX_WORK_GROWTH
+
+    @pytest.mark.slow
+    @pytest.mark.parametrize("name", sorted(CORPORA))
+    def test_linear_time(self, name: str):
+        """Test that checking time grows linearly up to 10^4 lines."""
+        _assert_linear(name, [1_000, 3_000, 10_000])
+
+    @pytest.mark.slow
+    @pytest.mark.parametrize("name", sorted(CORPORA))
+    def test_linear_large(self, name: str):
+        """Test that checking time grows linearly up to 10^5 or 10^6 lines."""
+        sizes = [1_000, 10_000, 100_000]
+        if name in LARGE_CORPORA:
+            sizes.append(1_000_000)
+        _assert_linear(name, sizes)
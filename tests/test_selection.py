@@ -0,0 +1,86 @@
+"""Tests for the selection module."""
+# pylint: disable=no-self-use
+import os
+from argparse import Namespace
+from typing import Any
+
+from flake8_plus.checker import RULES
+from flake8_plus.selection import RuleSelection
+
+
+def _options(**kwargs: Any) -> Namespace:
+    options = Namespace(
+        select=None,
+        ignore=None,
+        extend_select=None,
+        extend_ignore=None,
+        extended_default_select=["C90", "F", "E", "W", "PLU"],
+        extended_default_ignore=[],
+        per_file_ignores="",
+    )
+    for name, value in kwargs.items():
+        setattr(options, name, value)
+    return options
+
+
+class TestRuleSelection:
+    """Tests for the `RuleSelection` class."""
+
+    def test_default(self):
+        """Test that all rules are enabled by default."""
+        assert RuleSelection(_options(), RULES).enabled == set(RULES)
+
+    def test_select(self):
+        """Test that only selected rules are enabled."""
+        selection = RuleSelection(_options(select=["E", "PLU00"]), RULES)
+        assert selection.enabled == set(RULES)
+        selection = RuleSelection(_options(select=["E", "W"]), RULES)
+        assert not selection.enabled
+        selection = RuleSelection(_options(extend_select=["PLU001"]), RULES)
+        assert selection.enabled == set(RULES)
+
+    def test_ignore(self):
+        """Test that ignored rules are disabled."""
+        selection = RuleSelection(_options(extend_ignore=["PLU002"]), RULES)
+        assert selection.enabled == {"PLU001", "PLU003"}
+        selection = RuleSelection(_options(ignore=["PLU"]), RULES)
+        assert not selection.enabled
+
+    def test_select_overrides_ignore(self):
+        """Test that a more specific select overrides an ignore, like in flake8."""
+        options = _options(extend_ignore=["PLU"], extend_select=["PLU003"])
+        assert RuleSelection(options, RULES).enabled == {"PLU003"}
+
+    def test_per_file_ignores(self):
+        """Test that per-file ignores apply to matching files only."""
+        options = _options(
+            per_file_ignores="tests/*.py:PLU002,PLU003 tests/special.py:PLU001 "
+            "__init__.py:PLU"
+        )
+        selection = RuleSelection(options, RULES)
+        assert selection.enabled_for("src/module.py") == set(RULES)
+        assert selection.enabled_for("tests/test_a.py") == {"PLU001"}
+        assert selection.enabled_for(os.path.abspath("tests/special.py")) == {
+            "PLU002",
+            "PLU003",
+        }
+        assert not selection.enabled_for("src/__init__.py")
+
+    def test_from_config(self):
+        """Test that the options of configuration files are read like flake8 does."""
+        options = {"select": "E,W", "extend_select": "PLU00"}
+        assert RuleSelection.from_config(options, RULES).enabled == set(RULES)
+        options = {"extend_ignore": "PLU002,\nPLU003", "per_file_ignores": "b.py:PLU"}
+        selection = RuleSelection.from_config(options, RULES)
+        assert selection.enabled == {"PLU001"}
+        assert not selection.enabled_for("b.py")
+        assert not selection.disable_noqa
+        assert RuleSelection.from_config({"disable_noqa": "True"}, RULES).disable_noqa
+        assert not RuleSelection.from_config({"select": "E"}, RULES).enabled
+
+    def test_cwd(self):
+        """Test that per-file ignores can be relative to another folder."""
+        options = {"per_file_ignores": "sub/*.py:PLU002"}
+        selection = RuleSelection.from_config(options, RULES, "/project")
+        assert selection.enabled_for("/project/sub/b.py") == {"PLU001", "PLU003"}
+        assert selection.enabled_for(os.path.abspath("sub/b.py")) == set(RULES)
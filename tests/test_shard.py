@@ -0,0 +1,135 @@
+"""Tests for the shard module."""
+# pylint: disable=no-self-use
+import json
+from pathlib import Path
+
+import pytest
+
+from flake8_plus.exceptions import ShardError
+from flake8_plus.runner import FileResult
+from flake8_plus.shard import (
+    Report,
+    Shard,
+    format_summary,
+    merge_reports,
+    parse_shard,
+    read_report,
+    read_timings,
+    split_files,
+)
+
+
+def _write_files(root: Path, sizes: dict[str, int]) -> list[str]:
+    for name, size in sizes.items():
+        (root / name).write_text("x" * size, encoding="utf-8")
+    return [str(root / name) for name in sorted(sizes)]
+
+
+def _write_report(path: Path, lines: list[str]) -> str:
+    path.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+    return str(path)
+
+
+class TestShard:
+    """Tests for splitting files into shards and merging their reports."""
+
+    @pytest.mark.parametrize("value,expected", [("1/1", (1, 1)), ("2/4", (2, 4))])
+    def test_parse_shard(self, value: str, expected: tuple[int, int]):
+        """Test parsing valid shards."""
+        shard = parse_shard(value)
+        assert (shard.number, shard.total) == expected
+
+    @pytest.mark.parametrize("value", ["", "2", "a/b", "0/2", "3/2"])
+    def test_parse_shard_invalid(self, value: str):
+        """Test that invalid shards are rejected."""
+        with pytest.raises(ShardError):
+            parse_shard(value)
+
+    def test_split_files_by_size(self, tmp_path: Path):
+        """Test that files are split into shards of roughly equal size."""
+        sizes = {"a.py": 60, "b.py": 50, "c.py": 40, "d.py": 30, "e.py": 20}
+        paths = _write_files(tmp_path, sizes)
+        shards = split_files(paths, 2)
+        assert sorted(path for shard in shards for path in shard) == paths
+        names = [[Path(path).name for path in shard] for shard in shards]
+        assert names == [["a.py", "d.py", "e.py"], ["b.py", "c.py"]]
+
+    def test_split_files_by_timings(self, tmp_path: Path):
+        """Test that timings override sizes, and are extrapolated to new files."""
+        paths = _write_files(tmp_path, {"a.py": 100, "b.py": 100, "c.py": 100})
+        timings = {paths[0]: 3.0, paths[1]: 1.0}
+        # c.py is estimated to take as long as the average of a.py and b.py.
+        assert split_files(paths, 2, timings) == [[paths[0]], [paths[1], paths[2]]]
+
+    def test_split_files_more_shards_than_files(self, tmp_path: Path):
+        """Test that shards without files are empty."""
+        paths = _write_files(tmp_path, {"a.py": 10})
+        assert split_files(paths, 3) == [paths, [], []]
+
+    def test_read_report(self, tmp_path: Path):
+        """Test that problems and timings are read by file."""
+        problem = {"path": "a.py", "line": 4, "column": 5, "code": "PLU002"}
+        path = _write_report(
+            tmp_path / "shard.ndjson",
+            [
+                json.dumps({**problem, "message": "found 1"}),
+                json.dumps({"file": "a.py", "problems": 1, "seconds": 0.5}),
+                json.dumps({"file": "b.py", "problems": 0, "seconds": 0.25}),
+                format_summary(Shard(2, 3), 2, 1),
+            ],
+        )
+        assert read_report(path) == Report(
+            Shard(2, 3),
+            [
+                FileResult("a.py", [(4, 4, "PLU002 found 1")], 0.5),
+                FileResult("b.py", [], 0.25),
+            ],
+        )
+        assert read_timings([path]) == {"a.py": 0.5, "b.py": 0.25}
+
+    def test_read_report_incomplete(self, tmp_path: Path):
+        """Test that reports without a matching summary are rejected."""
+        record = json.dumps({"file": "a.py", "problems": 0, "seconds": 0.5})
+        path = _write_report(tmp_path / "shard.ndjson", [record])
+        with pytest.raises(ShardError, match="incomplete"):
+            read_report(path)
+        path = _write_report(
+            tmp_path / "shard.ndjson", [record, format_summary(Shard(1, 2), 2, 0)]
+        )
+        with pytest.raises(ShardError, match="does not match"):
+            read_report(path)
+        with pytest.raises(ShardError, match="cannot read"):
+            read_report(str(tmp_path / "missing.ndjson"))
+
+    def test_merge_reports(self):
+        """Test that the results of all shards are merged in path order."""
+        reports = [
+            Report(Shard(2, 2), [FileResult("b.py", [(1, 0, "PLU001 x")], 1.0)]),
+            Report(Shard(1, 2), [FileResult("a.py", []), FileResult("c.py", [])]),
+        ]
+        merged = merge_reports(reports)
+        assert merged.shard == Shard(1, 1)
+        assert [result.path for result in merged.results] == ["a.py", "b.py", "c.py"]
+
+    @pytest.mark.parametrize(
+        "shards,message",
+        [
+            ([(1, 2)], "missing the reports of shards \\[2\\]"),
+            ([(1, 2), (2, 3)], "split into \\[2, 3\\] shards"),
+            ([(1, 2), (2, 2), (2, 2)], "several reports"),
+        ],
+    )
+    def test_merge_reports_invalid(self, shards: list[tuple[int, int]], message: str):
+        """Test that missing, duplicated and mismatched reports are rejected."""
+        reports = [Report(Shard(*shard), []) for shard in shards]
+        with pytest.raises(ShardError, match=message):
+            merge_reports(reports)
+
+    def test_merge_reports_overlapping(self):
+        """Test that files checked in several shards are rejected."""
+        reports = [
+            Report(Shard(1, 2), [FileResult("a.py", [])]),
+            Report(Shard(2, 2), [FileResult("a.py", [])]),
+        ]
+        with pytest.raises(ShardError, match="more than one shard"):
+            merge_reports(reports)
@@ -0,0 +1,105 @@
+"""Tests for the slow_files module."""
+# pylint: disable=no-self-use
+import ast
+import io
+import json
+import pstats
+from pathlib import Path
+
+import pytest
+
+from flake8_plus import Plugin
+from flake8_plus.checker import load_visitors
+from flake8_plus.config import Config
+from flake8_plus.slow_files import (
+    ENVIRONMENT_VARIABLE,
+    SlowFileDetector,
+    format_offenders,
+)
+
+CODE = "def func():\n    x = 1\n\n    return x\n"
+
+
+class TestSlowFileDetector:
+    """Tests for the SlowFileDetector class."""
+
+    def test_setup_reuses_inherited_run(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test that processes inheriting the run report to it."""
+        monkeypatch.setenv(ENVIRONMENT_VARIABLE, "run")
+        assert SlowFileDetector.setup(1.0, str(tmp_path)).run == "run"
+
+    def test_profile(self, tmp_path: Path):
+        """Test that slow files are profiled and reported."""
+        detector = SlowFileDetector(0.5, tmp_path / "slow", "run")
+        lines = io.StringIO(CODE).readlines()
+        report = detector.profile("pkg/a.py", lines, Config(), None, load_visitors(), 2)
+        assert report["size"] == len(CODE)
+        assert report["nodes"] > 0
+        assert report["rules"]["PLU002Visitor"]["problems"] == 1
+        stats = pstats.Stats(report["profile"])
+        assert any(function == "check" for _, _, function in stats.stats)  # type: ignore
+        (path,) = (tmp_path / "slow").glob("pkg_a.py-*.json")
+        assert json.loads(path.read_text(encoding="utf-8")) == report
+
+    def test_report(self, tmp_path: Path):
+        """Test that the slowest files of the run are listed, slowest first."""
+        detector = SlowFileDetector(0.5, tmp_path, "run")
+        lines = io.StringIO(CODE).readlines()
+        for filename, seconds in [("a.py", 1.0), ("b.py", 3.0)]:
+            detector.profile(filename, lines, Config(), None, load_visitors(), seconds)
+        SlowFileDetector(0.5, tmp_path, "other").profile(
+            "c.py", lines, Config(), None, load_visitors(), 5.0
+        )
+        assert [report["filename"] for report in detector.load()] == ["b.py", "a.py"]
+        stream = io.StringIO()
+        detector.report(stream)
+        output = stream.getvalue().splitlines()
+        assert output[0].startswith("flake8-plus: 2 files took more than 0.5 seconds")
+        assert output[2].endswith(" b.py")
+        assert output[-1] == f"Profiles and reports are in {tmp_path}"
+
+    def test_report_nothing_slow(self, tmp_path: Path):
+        """Test that nothing is printed if no file was slow."""
+        stream = io.StringIO()
+        SlowFileDetector(0.5, tmp_path / "missing", "run").report(stream)
+        assert not stream.getvalue()
+
+    def test_format_offenders(self):
+        """Test that only the top offenders are listed, with their slowest visitor."""
+        reports = [
+            {"filename": f"{i}.py", "seconds": 9.0 - i, "size": 10, "nodes": 5}
+            for i in range(3)
+        ]
+        for report in reports:
+            report["rules"] = {
+                "PLU002Visitor": {"seconds": 0.25},
+                "PLU003Visitor": {"seconds": 0.5},
+            }
+        lines = format_offenders(reports, 1.0, top=2).splitlines()
+        assert len(lines) == 4
+        assert lines[2].split() == [
+            "9.000",
+            "10",
+            "5",
+            "PLU003Visitor",
+            "(0.500)",
+            "0.py",
+        ]
+
+    def test_plugin_profiles_slow_files(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test that the plugin profiles the files taking longer than the threshold."""
+        monkeypatch.setattr(Plugin, "config", Config(), raising=False)
+        monkeypatch.setattr(Plugin, "slow_files", SlowFileDetector(60, tmp_path, "r"))
+        problems = list(Plugin(ast.parse(CODE), CODE.split("\n"), "fast.py").run())
+        assert len(problems) == 1
+        monkeypatch.setattr(Plugin, "slow_files", SlowFileDetector(0, tmp_path, "r"))
+        assert list(Plugin(ast.parse(CODE), CODE.split("\n"), "slow.py").run()) == (
+            problems
+        )
+        assert [report["filename"] for report in Plugin.slow_files.load()] == [
+            "slow.py"
+        ]
@@ -0,0 +1,100 @@
+"""Tests for the statistics module."""
+# pylint: disable=no-self-use
+import ast
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from flake8_plus import Plugin
+from flake8_plus.config import Config
+from flake8_plus.statistics import (
+    ENVIRONMENT_VARIABLE,
+    FileStatistics,
+    StatisticsCollector,
+    summarize,
+)
+from flake8_plus.visitors.fused_visitor import FusedVisitor
+from flake8_plus.visitors.plu002_visitor import PLU002Visitor
+from flake8_plus.visitors.plu003_visitor import PLU003Visitor
+
+CODE = (
+    "def func():\n"
+    "    try:\n"
+    "        x = 1\n"
+    "\n"
+    "    except ValueError:\n"
+    "        return None\n"
+    "\n"
+    "    return x\n"
+)
+
+
+class TestFileStatistics:
+    """Tests for the FileStatistics class."""
+
+    def test_instrument(self):
+        """Test that instrumented visitors record their work."""
+        lines = CODE.split("\n")
+        visitors = [PLU002Visitor(lines, Config()), PLU003Visitor(lines, Config())]
+        statistics = FileStatistics("file.py")
+        for visitor in visitors:
+            statistics.instrument(visitor)
+        fused = FusedVisitor(visitors)
+        fused.visit(ast.parse(CODE))
+        statistics.finish(visitors, fused.nodes_visited)
+        record = statistics.to_dict()
+        assert record["nodes"] == fused.nodes_visited
+        assert record["rules"]["PLU002Visitor"]["nodes"] == 2
+        assert record["rules"]["PLU002Visitor"]["blank_queries"] == 2
+        assert record["rules"]["PLU002Visitor"]["problems"] == 1
+        assert record["rules"]["PLU003Visitor"]["nodes"] == 1
+        assert record["rules"]["PLU003Visitor"]["problems"] == 1
+
+    def test_instrument_does_not_affect_other_visitors(self):
+        """Test that instrumenting a visitor leaves its class untouched."""
+        visitor = PLU002Visitor([], Config())
+        FileStatistics("file.py").instrument(visitor)
+        assert PLU002Visitor.handlers != visitor.handlers
+
+
+class TestStatisticsCollector:
+    """Tests for the StatisticsCollector class."""
+
+    def test_setup_reuses_inherited_folder(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test that processes inheriting the spool folder use it."""
+        monkeypatch.setenv(ENVIRONMENT_VARIABLE, str(tmp_path))
+        assert StatisticsCollector.setup(True, None).directory == tmp_path
+
+    def test_report(self, tmp_path: Path):
+        """Test that spooled statistics are aggregated and reported."""
+        spool = tmp_path / "spool"
+        spool.mkdir()
+        collector = StatisticsCollector(spool)
+        for filename in ["a.py", "b.py"]:
+            statistics = FileStatistics(filename)
+            statistics.nodes = 10
+            collector.record(statistics)
+        output = tmp_path / "statistics.json"
+        stream = io.StringIO()
+        collector.report(True, str(output), stream)
+        data = json.loads(output.read_text(encoding="utf-8"))
+        assert data["summary"]["files"] == 2
+        assert data["summary"]["nodes"] == 20
+        assert "2 files" in stream.getvalue()
+        assert not spool.exists()
+
+    def test_plugin_records_statistics(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test that the plugin records statistics for each file it checks."""
+        collector = StatisticsCollector(tmp_path)
+        monkeypatch.setattr(Plugin, "statistics", collector)
+        monkeypatch.setattr(Plugin, "config", Config(), raising=False)
+        list(Plugin(ast.parse(CODE), CODE.split("\n"), "file.py").run())
+        summary = summarize(collector.load())
+        assert summary["files"] == 1
+        assert summary["rules"]["PLU002Visitor"]["problems"] == 1
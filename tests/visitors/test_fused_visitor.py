@@ -0,0 +1,137 @@
+"""Tests for the `fused_visitor` module."""
+# pylint: disable=no-self-use,too-few-public-methods
+import ast
+from pathlib import Path
+
+import pytest
+
+from flake8_plus.config import Config
+from flake8_plus.visitors.fused_visitor import FusedVisitor
+from flake8_plus.visitors.plu001_visitor import PLU001Visitor
+from flake8_plus.visitors.plu002_visitor import PLU002Visitor
+from flake8_plus.visitors.plu003_visitor import PLU003Visitor
+
+from .util import generate_fused_results, generate_results
+
+VISITORS = [PLU001Visitor, PLU002Visitor, PLU003Visitor]
+CASE_FILES = sorted((Path(__file__).parent.parent / "case_files").glob("*/*.py"))
+EXTRA_CASES = {
+    "return after def in try": (
+        "def outer():\n"
+        "    def inner():\n"
+        "        pass\n"
+        "    try:\n"
+        "        return inner\n"
+        "    except ValueError:\n"
+        "\n"
+        "        return None\n"
+    ),
+    "return first in function": "def a():\n    pass\ndef b():\n\n    return 1\n",
+    "nested import before toplevel import": (
+        '"""Docstring."""\ndef f():\n    import os\n\nimport sys\n'
+    ),
+    "return first in class body": "def a():\n    pass\nclass B:\n    return 1\n",
+    "return first in handler": (
+        "def f():\n"
+        "    try:\n"
+        "        def g():\n"
+        "            pass\n"
+        "    except:\n"
+        "        return g\n"
+        "    except ValueError:\n"
+        "        return None\n"
+    ),
+    "return in match case": (
+        "def f(x):\n"
+        "    match x:\n"
+        "        case [1, 2]:\n"
+        "\n"
+        "            return 1\n"
+        "        case _ if x:\n"
+        "            return 2\n"
+    ),
+}
+
+
+class TestFusedVisitor:
+    """Tests for the `FusedVisitor` class."""
+
+    @pytest.mark.parametrize("statements_only", [False, True])
+    @pytest.mark.parametrize("blanks_expected", [0, 1, 2])
+    @pytest.mark.parametrize(
+        "filename", CASE_FILES, ids=[f"{f.parent.name}/{f.stem}" for f in CASE_FILES]
+    )
+    def test_case_files(
+        self, filename: Path, blanks_expected: int, statements_only: bool
+    ):
+        """Test that the fused visitor matches the individual visitors."""
+        source_code = filename.read_text(encoding="utf-8")
+        _assert_equivalent(source_code, blanks_expected, statements_only)
+
+    @pytest.mark.parametrize("statements_only", [False, True])
+    @pytest.mark.parametrize("blanks_expected", [0, 1])
+    @pytest.mark.parametrize(
+        "source_code", EXTRA_CASES.values(), ids=list(EXTRA_CASES.keys())
+    )
+    def test_extra_cases(
+        self, source_code: str, blanks_expected: int, statements_only: bool
+    ):
+        """Test that the fused visitor matches the individual visitors."""
+        _assert_equivalent(source_code, blanks_expected, statements_only)
+
+    def test_statements_only_by_default(self):
+        """Test that statement level rule visitors only get statements walked."""
+        assert FusedVisitor(cls([], Config()) for cls in VISITORS).statements_only
+
+    def test_statements_only_skips_expressions(self):
+        """Test that expressions are not visited when walking statements only."""
+        source_code = "TABLE = [\n" + "    (1, 'a', {'b': 2.0}),\n" * 100 + "]\n"
+        tree = ast.parse(source_code)
+        visitors = [cls(source_code.split("\n"), Config()) for cls in VISITORS]
+        full = FusedVisitor(visitors, statements_only=False)
+        full.visit(tree)
+        statements_only = FusedVisitor(visitors, statements_only=True)
+        statements_only.visit(tree)
+        assert statements_only.nodes_visited == 2
+        assert full.nodes_visited > 100 * statements_only.nodes_visited
+
+    def test_iter_problems_line_order(self):
+        """Test that problems of all rules are yielded in line order."""
+        source_code = (
+            "def f():\n"
+            "    try:\n"
+            "        pass\n\n"
+            "    except ValueError:\n\n"
+            "        return 1\n\n"
+            "import os\n"
+        )
+        lines = source_code.splitlines(True)
+        fused = FusedVisitor(cls(lines, Config()) for cls in VISITORS)
+        problems = list(fused.iter_problems(ast.parse(source_code)))
+        assert [(p.line_number, p.code) for p in problems] == [
+            (5, "PLU003"),
+            (7, "PLU002"),
+            (9, "PLU001"),
+        ]
+        assert not fused.problems
+        assert [visitor.problem_count for visitor in fused.visitors] == [1, 1, 1]
+
+    def test_iter_problems_lazy(self):
+        """Test that problems are yielded before the rest of the module is walked."""
+        source_code = "def f():\n\n    return 1\n" * 1000
+        lines = source_code.splitlines(True)
+        fused = FusedVisitor(cls(lines, Config()) for cls in VISITORS)
+        problems = fused.iter_problems(ast.parse(source_code))
+        assert next(problems).line_number == 3
+        visited = fused.nodes_visited
+        assert len(list(problems)) == 999
+        assert fused.nodes_visited > 5 * visited
+
+
+def _assert_equivalent(source_code: str, blanks_expected: int, statements_only: bool):
+    config = Config(blanks_expected, blanks_expected, blanks_expected)
+    expected = set()
+    for visitor_cls in VISITORS:
+        expected |= generate_results(visitor_cls, config, source_code)
+    actual = generate_fused_results(VISITORS, config, source_code, statements_only)
+    assert actual == expected
@@ -0,0 +1,83 @@
+"""Tests for the `rule_visitor` module."""
+# pylint: disable=no-self-use,too-few-public-methods
+import ast
+
+from flake8_plus.config import Config
+from flake8_plus.problem import Problem
+from flake8_plus.statistics import FileStatistics
+from flake8_plus.visitors.rule_visitor import RuleSpec, RuleVisitor
+
+from .util import generate_results
+
+
+class _ExactProblem(Problem):
+    __slots__ = ()
+
+    code = "PLU900"
+    format_ = "expected {} blank lines before assignment, found {}"
+
+
+class _NestedProblem(Problem):
+    __slots__ = ()
+
+    code = "PLU901"
+    format_ = "expected {} blank lines before nested assignment, found {}"
+
+
+class _Visitor(RuleVisitor):
+    rules = (
+        RuleSpec(_ExactProblem, (ast.Assign, ast.AugAssign), "blanks_before_return"),
+        RuleSpec(_NestedProblem, (ast.Assign,), 1, ("nested",)),
+    )
+
+
+CODE = """\
+x = 1
+
+y = 2
+def func():
+    z = 3; z += 1
+    return z
+"""
+
+
+class TestRuleVisitor:
+    """Tests for the `RuleVisitor` class."""
+
+    def test_compiled_handlers(self):
+        """Test that the rules are compiled into one handler per node type."""
+        assert set(_Visitor.handlers) == {ast.Assign, ast.AugAssign}
+        assert _Visitor.statements_only
+
+    def test_rules(self):
+        """Test that all rules for a node type are checked, using the config."""
+        actual = generate_results(_Visitor, Config(), CODE)
+        assert actual == {
+            (3, 0, "PLU900 expected 0 blank lines before assignment, found 1"),
+            (5, 4, "PLU901 expected 1 blank lines before nested assignment, found 0"),
+        }
+        actual = generate_results(_Visitor, Config(blanks_before_return=1), CODE)
+        assert {(line, code[:6]) for line, _, code in actual} == {
+            (1, "PLU900"),
+            (5, "PLU900"),
+            (5, "PLU901"),
+        }
+
+    def test_blanks_counted_once(self):
+        """Test that the blank lines before a node are counted once for all rules."""
+        lines = CODE.splitlines(True)
+        visitor = _Visitor(lines, Config())
+        statistics = FileStatistics("test.py")
+        statistics.instrument(visitor)
+        visitor.visit(ast.parse(CODE))
+        # One query per assignment, and one for the augmented assignment on line 5.
+        assert statistics.rules["_Visitor"].blank_queries == 4
+
+    def test_keywords(self):
+        """Test that only visitors of keyword node types have keywords."""
+        assert _Visitor.keywords is None
+
+        class _KeywordVisitor(RuleVisitor):
+            rules = (RuleSpec(_ExactProblem, (ast.Raise, ast.With, ast.AsyncWith), 0),)
+
+        assert _KeywordVisitor.keywords == {"raise", "with"}
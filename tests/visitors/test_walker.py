@@ -0,0 +1,73 @@
+"""Tests for the `walker` module."""
+# pylint: disable=no-self-use,too-few-public-methods
+import ast
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from flake8_plus.visitors.walker import Walker
+
+CASE_FILES = sorted((Path(__file__).parent.parent / "case_files").glob("*/*.py"))
+SOURCE_CODE = "\n".join(f.read_text(encoding="utf-8") for f in CASE_FILES)
+
+
+class _Recorder:
+    """Records the nodes visited and the previous node at the time of each visit."""
+
+    def __init__(self):
+        self.visits: list[tuple[ast.AST, Optional[ast.AST]]] = []
+        self._previous_node: Optional[ast.AST] = None
+
+    def record(self, node: ast.AST):
+        self.visits.append((node, self._previous_node))
+
+
+class _RecursiveRecorder(ast.NodeVisitor):
+    """Recursive reference walk with the semantics of the original visitors."""
+
+    def __init__(self):
+        self.visits: list[tuple[ast.AST, Optional[ast.AST]]] = []
+        self._previous_node: Optional[ast.AST] = None
+
+    def visit(self, node: ast.AST):
+        self.visits.append((node, self._previous_node))
+        self.generic_visit(node)
+        self._previous_node = node
+
+
+def _dispatch_all(recorder: _Recorder) -> dict:
+    node_types = {type(node) for node in ast.walk(ast.parse(SOURCE_CODE))}
+    return {t: ((recorder, _Recorder.record),) for t in node_types}
+
+
+class TestWalker:
+    """Tests for the `Walker` class."""
+
+    def test_matches_recursive_walk(self):
+        """Test that nodes and previous nodes match those of a recursive walk."""
+        tree = ast.parse(SOURCE_CODE)
+        expected = _RecursiveRecorder()
+        expected.visit(tree)
+        recorder = _Recorder()
+        walker = Walker(_dispatch_all(recorder))  # type: ignore[arg-type]
+        walker.walk(tree)
+        assert recorder.visits == expected.visits
+        assert walker.nodes_visited == len(expected.visits)
+
+    @pytest.mark.parametrize("statements_only", [False, True])
+    def test_deep_tree(self, statements_only: bool):
+        """Test that deeply nested trees do not exhaust the Python stack."""
+        depth = 20_000
+        expression: ast.expr = ast.Constant(1)
+        for _ in range(depth):
+            expression = ast.BinOp(expression, ast.Add(), ast.Constant(1))
+        tree = ast.Module(body=[ast.Return(expression)], type_ignores=[])
+        recorder = _Recorder()
+        walker = Walker(
+            {ast.Return: ((recorder, _Recorder.record),)},  # type: ignore[dict-item]
+            statements_only=statements_only,
+        )
+        walker.walk(tree)
+        assert len(recorder.visits) == 1
+        assert walker.nodes_visited == (2 if statements_only else 3 * depth + 3)
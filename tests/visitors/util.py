@@ -10,6 +10,7 @@ from _pytest.mark.structures import ParameterSet
 from flake8_plus.config import Config
 from flake8_plus.problem import Problem
 from flake8_plus.visitors.base_visitor import BaseVisitor
+from flake8_plus.visitors.fused_visitor import FusedVisitor
 
 
 def generate_bulk_cases(problem_cls: type[Problem]) -> list[ParameterSet]:
@@ -65,6 +66,35 @@ def generate_results(
     return messages
 
 
+def generate_fused_results(
+    visitor_classes: list[type[BaseVisitor]],
+    config: Config,
+    source_code: str,
+    statements_only: bool = False,
+) -> set[tuple[int, int, str]]:
+    """
+    Generate results for several `BaseVisitor` subclasses using a `FusedVisitor`.
+
+    Args:
+        visitor_classes (list[type[BaseVisitor]]): The visitors to use for generating
+            results.
+        config (Config): The configuration to use.
+        source_code (str): The source code to check.
+        statements_only (bool): Whether to only walk statement bodies.
+
+    Returns:
+        set[tuple[int, int, str]]: A set of problems as tuples.
+    """
+    lines = source_code.split("\n")
+    visitor = FusedVisitor(
+        (cls(lines, config) for cls in visitor_classes), statements_only
+    )
+    tree = ast.parse(source_code)
+    visitor.visit(tree)
+    messages = set(_problem_to_tuple(p) for p in visitor.problems)
+    return messages
+
+
 def _problem_to_tuple(problem: Problem) -> tuple[int, int, str]:
     return (
         problem.line_number,